@@ -257,6 +257,7 @@ async fn main() -> Result<()> {
                 .send_request(IpcRequest::GetEvents {
                     since: None,
                     limit: Some(limit),
+                    filter: Default::default(),
                 })
                 .await?;
             println!("{}", serde_json::to_string_pretty(&response)?);
@@ -6,11 +6,14 @@ use ed25519_dalek::SigningKey;
 use parking_lot::Mutex;
 use serde::{Deserialize, Serialize};
 use sha2::{Digest, Sha256};
+use std::borrow::Cow;
 use std::fs::{self, File, OpenOptions};
 use std::io::{BufRead, BufReader, Write};
 use std::path::{Path, PathBuf};
 
 const MAX_ROTATIONS: usize = 5;
+/// Distinct `read_matching` queries whose results are kept between calls.
+const READ_CACHE_SIZE: usize = 4;
 
 #[derive(Debug, Clone, Serialize, Deserialize, PartialEq, Eq)]
 #[serde(rename_all = "SCREAMING_SNAKE_CASE")]
@@ -33,11 +36,144 @@ pub struct EventEntry {
     pub signature: String,
 }
 
+/// Narrows what `read_matching` returns. Empty fields match everything. An
+/// entry must have a listed severity or a listed type (when either list is
+/// set). It must also contain `search` in its type or data, ignoring case.
+/// `path` keeps only events about that file, meaning their data's `path`
+/// field equals it. `before_seq` pages backwards through the log. Pass the
+/// lowest sequence number already held to get the next older page.
+#[derive(Debug, Clone, Default, PartialEq, Eq, Serialize, Deserialize)]
+pub struct EventFilter {
+    #[serde(default)]
+    pub severities: Vec<EventSeverity>,
+    #[serde(default)]
+    pub event_types: Vec<String>,
+    #[serde(default)]
+    pub search: Option<String>,
+    #[serde(default)]
+    pub path: Option<String>,
+    #[serde(default)]
+    pub before_seq: Option<u64>,
+}
+
+impl EventFilter {
+    fn admits_kind(&self, severity: &EventSeverity, event_type: &str) -> bool {
+        (self.severities.is_empty() && self.event_types.is_empty())
+            || self.severities.contains(severity)
+            || self.event_types.iter().any(|t| t == event_type)
+    }
+}
+
+/// Search text, lower-cased once per read. An ASCII needle is compared
+/// against the haystack in place. Any other needle lower-cases the
+/// haystack first.
+struct Needle {
+    lower: String,
+}
+
+impl Needle {
+    fn new(text: &str) -> Option<Self> {
+        (!text.is_empty()).then(|| Self {
+            lower: text.to_lowercase(),
+        })
+    }
+
+    fn found_in(&self, haystack: &str) -> bool {
+        if self.lower.is_ascii() {
+            let needle = self.lower.as_bytes();
+            haystack
+                .as_bytes()
+                .windows(needle.len())
+                .any(|w| w.eq_ignore_ascii_case(needle))
+        } else {
+            haystack.to_lowercase().contains(&self.lower)
+        }
+    }
+
+    /// Whether `data` holds the needle in the detail line the desktop shows
+    /// for it or in any of its string values, taken unescaped, so a Windows
+    /// path is found with single backslashes.
+    fn found_in_data(&self, data: &serde_json::Value) -> bool {
+        fn any_string(value: &serde_json::Value, needle: &Needle) -> bool {
+            match value {
+                serde_json::Value::String(s) => needle.found_in(s),
+                serde_json::Value::Array(items) => items.iter().any(|v| any_string(v, needle)),
+                serde_json::Value::Object(fields) => fields.values().any(|v| any_string(v, needle)),
+                _ => false,
+            }
+        }
+        self.found_in(&event_detail(data)) || any_string(data, self)
+    }
+}
+
+/// One-line summary of an event's data, as the desktop lists it. It lives
+/// here so a search in the service matches the text the user sees.
+pub fn event_detail(data: &serde_json::Value) -> String {
+    let Some(obj) = data.as_object() else {
+        return String::new();
+    };
+    let mut parts = Vec::new();
+    if let Some(path) = obj.get("path").and_then(|v| v.as_str()) {
+        parts.push(format!("Path: {}", path));
+    }
+    if let Some(kind) = obj.get("kind").and_then(|v| v.as_str()) {
+        parts.push(format!("Type: {}", kind));
+    }
+    if let Some(files) = obj.get("files").and_then(|v| v.as_u64()) {
+        parts.push(format!("{} files", files));
+    }
+    if let Some(expected) = obj.get("expected_hash").and_then(|v| v.as_str()) {
+        parts.push(format!("Expected: {}…", &expected[..12.min(expected.len())]));
+    }
+    if let Some(actual) = obj.get("actual_hash").and_then(|v| v.as_str()) {
+        parts.push(format!("Actual: {}…", &actual[..12.min(actual.len())]));
+    }
+    if parts.is_empty() {
+        data.to_string()
+    } else {
+        parts.join(" | ")
+    }
+}
+
+/// The serialized `data` object inside a log line. This is the same text
+/// `entry.data.to_string()` would produce. A JSON string cannot hold an
+/// unescaped quote, so the first `"data":` is the field itself. `data` is
+/// written just before `prev_hash`, so the last `,"prev_hash":` ends it.
+fn data_json(line: &str) -> Option<&str> {
+    const KEY: &str = "\"data\":";
+    let start = line.find(KEY)? + KEY.len();
+    let end = line.rfind(",\"prev_hash\":")?;
+    line.get(start..end)
+}
+
+/// The fields a read narrows on, borrowed from the log line. This lets an
+/// entry that fails them be skipped without building its data or copying
+/// its hash and signature.
+#[derive(Deserialize)]
+struct EntryHead<'a> {
+    seq: u64,
+    timestamp: DateTime<Utc>,
+    #[serde(borrow)]
+    event_type: Cow<'a, str>,
+    severity: EventSeverity,
+}
+
 pub struct EventLog {
     path: PathBuf,
     signer: SigningKey,
     inner: Mutex<LogState>,
     max_bytes: u64,
+    /// Recent query results, most recently used first. Each is valid while
+    /// the log's last sequence number is unchanged.
+    read_cache: Mutex<Vec<CachedRead>>,
+}
+
+struct CachedRead {
+    filter: EventFilter,
+    since: Option<DateTime<Utc>>,
+    limit: Option<usize>,
+    last_seq: u64,
+    entries: Vec<EventEntry>,
 }
 
 #[derive(Debug, Clone, Serialize, Deserialize, PartialEq, Eq)]
@@ -50,20 +186,28 @@ pub struct LogAnchor {
 struct LogState {
     last_seq: u64,
     last_hash: String,
+    /// Append handle for the live log, opened lazily and kept across appends.
+    file: Option<File>,
+    /// Size of the live log, tracked so appends never have to stat it.
+    size: u64,
 }
 
 impl EventLog {
     pub fn new<P: AsRef<Path>>(path: P, signer: SigningKey, max_bytes: u64) -> Result<Self> {
         let path = path.as_ref().to_path_buf();
         let (last_seq, last_hash) = Self::load_state(&path)?;
+        let size = fs::metadata(&path).map(|m| m.len()).unwrap_or(0);
         Ok(Self {
             path,
             signer,
             inner: Mutex::new(LogState {
                 last_seq,
                 last_hash,
+                file: None,
+                size,
             }),
             max_bytes,
+            read_cache: Mutex::new(Vec::new()),
         })
     }
 
@@ -87,9 +231,11 @@ impl EventLog {
         Ok((last_seq, last_hash))
     }
 
+    /// SHA-256 of the compact JSON form of `entry_without_sig`, serialized
+    /// straight into the hasher rather than through a temporary string.
     fn compute_hash(entry_without_sig: &serde_json::Value) -> Result<String> {
         let mut hasher = Sha256::new();
-        hasher.update(entry_without_sig.to_string().as_bytes());
+        serde_json::to_writer(&mut hasher, entry_without_sig)?;
         Ok(hex::encode(hasher.finalize()))
     }
 
@@ -99,50 +245,123 @@ impl EventLog {
         severity: EventSeverity,
         data: serde_json::Value,
     ) -> Result<EventEntry> {
-        self.rotate_if_needed()?;
         let mut state = self.inner.lock();
-        let seq = state.last_seq + 1;
-        let prev_hash = state.last_hash.clone();
-        let mut entry_value = serde_json::json!({
-            "seq": seq,
-            "timestamp": Utc::now(),
-            "event_type": event_type,
-            "severity": severity,
-            "data": data,
-            "prev_hash": prev_hash,
-        });
+        self.rotate_if_needed(&mut state)?;
+        let entry = self.sign_entry(
+            state.last_seq + 1,
+            state.last_hash.clone(),
+            Utc::now(),
+            event_type,
+            severity,
+            data,
+        )?;
+        let mut line = serde_json::to_vec(&entry)?;
+        line.push(b'\n');
+        self.write_locked(&mut state, &line)?;
+        state.last_seq = entry.seq;
+        state.last_hash = entry.hash.clone();
+        Ok(entry)
+    }
+
+    /// Append several events as one group: the chain is extended under a
+    /// single lock acquisition and all lines reach the file in one write.
+    /// Each entry is hashed and signed exactly as `append` would, with the
+    /// timestamp the caller recorded for it rather than the commit time.
+    pub fn append_batch<'a, I>(&self, events: I) -> Result<Vec<EventEntry>>
+    where
+        I: IntoIterator<Item = (DateTime<Utc>, &'a str, EventSeverity, serde_json::Value)>,
+    {
+        let mut state = self.inner.lock();
+        self.rotate_if_needed(&mut state)?;
+        let mut seq = state.last_seq;
+        let mut prev_hash = state.last_hash.clone();
+        let mut buf = Vec::new();
+        let mut entries = Vec::new();
+        for (timestamp, event_type, severity, data) in events {
+            let entry = self.sign_entry(seq + 1, prev_hash, timestamp, event_type, severity, data)?;
+            serde_json::to_writer(&mut buf, &entry)?;
+            buf.push(b'\n');
+            seq = entry.seq;
+            prev_hash = entry.hash.clone();
+            entries.push(entry);
+        }
+        if entries.is_empty() {
+            return Ok(entries);
+        }
+        self.write_locked(&mut state, &buf)?;
+        state.last_seq = seq;
+        state.last_hash = prev_hash;
+        Ok(entries)
+    }
+
+    fn sign_entry(
+        &self,
+        seq: u64,
+        prev_hash: String,
+        timestamp: DateTime<Utc>,
+        event_type: &str,
+        severity: EventSeverity,
+        data: serde_json::Value,
+    ) -> Result<EventEntry> {
+        // The timestamp is reused for the entry itself, so it is never
+        // re-parsed from its RFC 3339 form. `data` is moved into the hashed
+        // object and taken back afterwards instead of being deep-copied (as
+        // `json!` would); the object's keys are sorted, so the hashed and
+        // signed bytes are the same either way.
+        let mut fields = serde_json::Map::new();
+        fields.insert("seq".into(), seq.into());
+        fields.insert("timestamp".into(), serde_json::to_value(timestamp)?);
+        fields.insert("event_type".into(), event_type.into());
+        fields.insert("severity".into(), serde_json::to_value(&severity)?);
+        fields.insert("data".into(), data);
+        fields.insert("prev_hash".into(), prev_hash.as_str().into());
+        let mut entry_value = serde_json::Value::Object(fields);
         let hash = Self::compute_hash(&entry_value)?;
         entry_value["hash"] = serde_json::Value::String(hash.clone());
-        let sig = sign_bytes(&self.signer, entry_value.to_string().as_bytes());
+        let sig = sign_bytes(&self.signer, &serde_json::to_vec(&entry_value)?);
         let signature = general_purpose::STANDARD.encode(sig.to_bytes());
-        entry_value["signature"] = serde_json::Value::String(signature.clone());
+        let data = match entry_value {
+            serde_json::Value::Object(mut fields) => fields.remove("data").unwrap_or_default(),
+            _ => unreachable!("entry is built as an object"),
+        };
 
-        let entry: EventEntry = serde_json::from_value(entry_value.clone())?;
-        self.write_entry(&entry)?;
-        state.last_seq = seq;
-        state.last_hash = hash;
-        Ok(entry)
+        Ok(EventEntry {
+            seq,
+            timestamp,
+            event_type: event_type.to_string(),
+            severity,
+            data,
+            prev_hash,
+            hash,
+            signature,
+        })
     }
 
-    fn write_entry(&self, entry: &EventEntry) -> Result<()> {
-        let mut file = OpenOptions::new()
-            .create(true)
-            .append(true)
-            .open(&self.path)?;
-        let line = serde_json::to_string(entry)?;
-        writeln!(file, "{}", line)?;
-        file.flush()?;
+    fn write_locked(&self, state: &mut LogState, bytes: &[u8]) -> Result<()> {
+        if state.file.is_none() {
+            state.file = Some(
+                OpenOptions::new()
+                    .create(true)
+                    .append(true)
+                    .open(&self.path)?,
+            );
+        }
+        let file = state.file.as_mut().expect("log file opened above");
+        if let Err(e) = file.write_all(bytes) {
+            // Reopen on the next append rather than reuse a broken handle.
+            state.file = None;
+            return Err(e.into());
+        }
+        state.size += bytes.len() as u64;
         Ok(())
     }
 
-    fn rotate_if_needed(&self) -> Result<()> {
-        let mut state = self.inner.lock();
-        if let Ok(metadata) = fs::metadata(&self.path) {
-            if metadata.len() < self.max_bytes {
-                drop(state);
-                return Ok(());
-            }
+    fn rotate_if_needed(&self, state: &mut LogState) -> Result<()> {
+        if state.size < self.max_bytes {
+            return Ok(());
         }
+        // Close the live handle before renaming the file out from under it.
+        state.file = None;
         // rotate existing files
         for i in (1..=MAX_ROTATIONS).rev() {
             let rotated = self.path_with_suffix(i);
@@ -160,6 +379,7 @@ impl EventLog {
         }
         // reset chain on new file
         state.last_hash = "CHAIN_START".to_string();
+        state.size = 0;
         // keep sequence monotonic across rotations
         Ok(())
     }
@@ -188,24 +408,120 @@ impl EventLog {
         &self,
         since: Option<DateTime<Utc>>,
         limit: Option<usize>,
+    ) -> Result<Vec<EventEntry>> {
+        self.read_matching(&EventFilter::default(), since, limit)
+    }
+
+    /// Like `read_recent`, but only returns entries that pass `filter`. The
+    /// filter is applied while the log is read, and the limit counts only
+    /// matching entries. A query repeated before anything new is logged
+    /// (a poller whose cursor has not moved, say) is answered from cache.
+    pub fn read_matching(
+        &self,
+        filter: &EventFilter,
+        since: Option<DateTime<Utc>>,
+        limit: Option<usize>,
+    ) -> Result<Vec<EventEntry>> {
+        // Taken before reading, so an append that races the read leaves the
+        // result tagged stale rather than current.
+        let last_seq = self.inner.lock().last_seq;
+        {
+            let mut cache = self.read_cache.lock();
+            let hit = cache.iter().position(|c| {
+                c.last_seq == last_seq && c.since == since && c.limit == limit && c.filter == *filter
+            });
+            if let Some(i) = hit {
+                let cached = cache.remove(i);
+                let entries = cached.entries.clone();
+                cache.insert(0, cached);
+                return Ok(entries);
+            }
+        }
+        let entries = self.scan_matching(filter, since, limit)?;
+        let mut cache = self.read_cache.lock();
+        cache.retain(|c| c.last_seq == last_seq);
+        cache.truncate(READ_CACHE_SIZE - 1);
+        cache.insert(
+            0,
+            CachedRead {
+                filter: filter.clone(),
+                since,
+                limit,
+                last_seq,
+                entries: entries.clone(),
+            },
+        );
+        Ok(entries)
+    }
+
+    fn scan_matching(
+        &self,
+        filter: &EventFilter,
+        since: Option<DateTime<Utc>>,
+        limit: Option<usize>,
     ) -> Result<Vec<EventEntry>> {
         if !self.path.exists() {
             return Ok(vec![]);
         }
         let file = File::open(&self.path)?;
         let reader = BufReader::new(file);
+        let needle = filter.search.as_deref().and_then(Needle::new);
+        // How the path field is written in a matching line. Lines without it
+        // are skipped unparsed. Lines with it are confirmed on the parsed
+        // entry, since the text could also belong to a nested object.
+        let path_field = match &filter.path {
+            Some(path) => Some(format!("\"path\":{}", serde_json::to_string(path)?)),
+            None => None,
+        };
         let mut entries = Vec::new();
         for line in reader.lines() {
             let line = line?;
             if line.trim().is_empty() {
                 continue;
             }
-            let entry: EventEntry = serde_json::from_str(&line)?;
+            let head: EntryHead = serde_json::from_str(&line)?;
+            // Entries are appended in sequence order, so nothing after this
+            // one can be on the requested page.
+            if filter.before_seq.is_some_and(|before| head.seq >= before) {
+                break;
+            }
             if let Some(since_ts) = &since {
-                if entry.timestamp < *since_ts {
+                if head.timestamp < *since_ts {
+                    continue;
+                }
+            }
+            if !filter.admits_kind(&head.severity, &head.event_type) {
+                continue;
+            }
+            // A hit in the raw serialized data costs no parse. A miss there
+            // can still be a hit in the detail line or in an escaped string
+            // value, so only then is the data parsed.
+            if let Some(needle) = &needle {
+                let raw = data_json(&line);
+                let found = needle.found_in(&head.event_type)
+                    || raw.is_some_and(|data| needle.found_in(data))
+                    || match raw {
+                        Some(data) => needle.found_in_data(&serde_json::from_str(data)?),
+                        None => {
+                            let entry: EventEntry = serde_json::from_str(&line)?;
+                            needle.found_in_data(&entry.data)
+                        }
+                    };
+                if !found {
                     continue;
                 }
             }
+            if let Some(field) = &path_field {
+                if !line.contains(field.as_str()) {
+                    continue;
+                }
+            }
+            let entry: EventEntry = serde_json::from_str(&line)?;
+            if filter.path.is_some()
+                && entry.data.get("path").and_then(|p| p.as_str()) != filter.path.as_deref()
+            {
+                continue;
+            }
             entries.push(entry);
         }
         // Return most recent first
@@ -248,6 +564,195 @@ mod tests {
         assert!(rotated.exists());
     }
 
+    #[test]
+    fn test_append_batch_extends_chain() {
+        let dir = tempdir().unwrap();
+        let path = dir.path().join("events.log");
+        let signer = SigningKey::generate(&mut rand::rngs::OsRng);
+        let log = EventLog::new(path.clone(), signer.clone(), 1 << 20).unwrap();
+        let first = log
+            .append("TEST", EventSeverity::Info, serde_json::json!({"i": 0}))
+            .unwrap();
+        let recorded = Utc::now() - chrono::Duration::seconds(5);
+        let batch = log
+            .append_batch(
+                (1..4).map(|i| (recorded, "TEST", EventSeverity::Warn, serde_json::json!({"i": i}))),
+            )
+            .unwrap();
+        assert_eq!(batch.len(), 3);
+        assert_eq!(batch[0].prev_hash, first.hash);
+        assert_eq!(batch[2].seq, 4);
+        // Entries keep the time they were recorded at, not the commit time.
+        assert!(batch.iter().all(|e| e.timestamp == recorded));
+
+        // A reopened log continues from the last batched entry.
+        let reopened = EventLog::new(path, signer, 1 << 20).unwrap();
+        let next = reopened
+            .append("TEST", EventSeverity::Info, serde_json::json!({}))
+            .unwrap();
+        assert_eq!(next.seq, 5);
+        assert_eq!(next.prev_hash, batch[2].hash);
+    }
+
+    #[test]
+    fn test_entry_hash_covers_canonical_json() {
+        let dir = tempdir().unwrap();
+        let signer = SigningKey::generate(&mut rand::rngs::OsRng);
+        let log = EventLog::new(dir.path().join("events.log"), signer, 1 << 20).unwrap();
+        let e = log
+            .append("TEST", EventSeverity::Warn, serde_json::json!({"path": "/x", "n": [1, 2]}))
+            .unwrap();
+        assert_eq!(e.data, serde_json::json!({"path": "/x", "n": [1, 2]}));
+
+        let canonical = serde_json::json!({
+            "seq": e.seq,
+            "timestamp": e.timestamp,
+            "event_type": e.event_type,
+            "severity": e.severity,
+            "data": e.data,
+            "prev_hash": e.prev_hash,
+        });
+        let expected = hex::encode(Sha256::digest(canonical.to_string().as_bytes()));
+        assert_eq!(e.hash, expected);
+    }
+
+    #[test]
+    fn test_read_matching_filters_before_limit() {
+        let dir = tempdir().unwrap();
+        let path = dir.path().join("events.log");
+        let signer = SigningKey::generate(&mut rand::rngs::OsRng);
+        let log = EventLog::new(path, signer, 1 << 20).unwrap();
+        log.append("TAMPER_DETECTED", EventSeverity::Warn, serde_json::json!({"path": "/etc/Hosts"}))
+            .unwrap();
+        for i in 0..5 {
+            log.append("SCAN", EventSeverity::Info, serde_json::json!({"i": i}))
+                .unwrap();
+        }
+        log.append("RESTORE_FAILURE", EventSeverity::Error, serde_json::json!({"path": "/etc/passwd"}))
+            .unwrap();
+
+        let critical = EventFilter {
+            severities: vec![EventSeverity::Critical, EventSeverity::Error],
+            event_types: vec!["TAMPER_DETECTED".into()],
+            ..EventFilter::default()
+        };
+        let found = log.read_matching(&critical, None, Some(2)).unwrap();
+        let types: Vec<_> = found.iter().map(|e| e.event_type.as_str()).collect();
+        assert_eq!(types, ["RESTORE_FAILURE", "TAMPER_DETECTED"]);
+
+        let search = EventFilter {
+            search: Some("hosts".into()),
+            ..EventFilter::default()
+        };
+        let found = log.read_matching(&search, None, None).unwrap();
+        assert_eq!(found.len(), 1);
+        assert_eq!(found[0].event_type, "TAMPER_DETECTED");
+
+        assert_eq!(log.read_recent(None, None).unwrap().len(), 7);
+    }
+
+    #[test]
+    fn test_search_matches_unescaped_values_and_detail() {
+        let dir = tempdir().unwrap();
+        let signer = SigningKey::generate(&mut rand::rngs::OsRng);
+        let log = EventLog::new(dir.path().join("events.log"), signer, 1 << 20).unwrap();
+        log.append(
+            "TAMPER_DETECTED",
+            EventSeverity::Critical,
+            serde_json::json!({"path": r"C:\Users\x\app.dll", "kind": "modified"}),
+        )
+        .unwrap();
+        log.append("SCAN", EventSeverity::Info, serde_json::json!({"path": "/etc/hosts"}))
+            .unwrap();
+
+        for text in [r"C:\Users\x", r"Users\X\APP", r"Path: C:\Users", "Type: modified"] {
+            let search = EventFilter {
+                search: Some(text.into()),
+                ..EventFilter::default()
+            };
+            let found = log.read_matching(&search, None, None).unwrap();
+            let types: Vec<_> = found.iter().map(|e| e.event_type.as_str()).collect();
+            assert_eq!(types, ["TAMPER_DETECTED"], "search {text:?}");
+        }
+    }
+
+    #[test]
+    fn test_read_matching_pages_by_seq() {
+        let dir = tempdir().unwrap();
+        let path = dir.path().join("events.log");
+        let signer = SigningKey::generate(&mut rand::rngs::OsRng);
+        let log = EventLog::new(path, signer, 1 << 20).unwrap();
+        for i in 0..10 {
+            log.append("TEST", EventSeverity::Info, serde_json::json!({"i": i}))
+                .unwrap();
+        }
+        let mut filter = EventFilter::default();
+        let head = log.read_matching(&filter, None, Some(4)).unwrap();
+        let seqs: Vec<u64> = head.iter().map(|e| e.seq).collect();
+        assert_eq!(seqs, [10, 9, 8, 7]);
+
+        filter.before_seq = Some(7);
+        let page = log.read_matching(&filter, None, Some(4)).unwrap();
+        let seqs: Vec<u64> = page.iter().map(|e| e.seq).collect();
+        assert_eq!(seqs, [6, 5, 4, 3]);
+
+        filter.before_seq = Some(3);
+        let last = log.read_matching(&filter, None, Some(4)).unwrap();
+        assert_eq!(last.len(), 2);
+    }
+
+    #[test]
+    fn test_read_matching_by_path() {
+        let dir = tempdir().unwrap();
+        let path = dir.path().join("events.log");
+        let signer = SigningKey::generate(&mut rand::rngs::OsRng);
+        let log = EventLog::new(path, signer, 1 << 20).unwrap();
+        log.append("TAMPER_DETECTED", EventSeverity::Warn, serde_json::json!({"path": "/etc/hosts"}))
+            .unwrap();
+        log.append("TAMPER_DETECTED", EventSeverity::Warn, serde_json::json!({"path": "/etc/hosts.bak"}))
+            .unwrap();
+        log.append("X", EventSeverity::Info, serde_json::json!({"nested": {"path": "/etc/hosts"}}))
+            .unwrap();
+
+        let filter = EventFilter {
+            path: Some("/etc/hosts".into()),
+            ..EventFilter::default()
+        };
+        let found = log.read_matching(&filter, None, None).unwrap();
+        assert_eq!(found.len(), 1);
+        assert_eq!(found[0].seq, 1);
+    }
+
+    #[test]
+    fn test_data_json_matches_serialized_data() {
+        let dir = tempdir().unwrap();
+        let path = dir.path().join("events.log");
+        let signer = SigningKey::generate(&mut rand::rngs::OsRng);
+        let log = EventLog::new(path.clone(), signer, 1 << 20).unwrap();
+        let data = serde_json::json!({"a": "\"data\":", "prev_hash": "x", "z": [1, 2]});
+        log.append("TEST", EventSeverity::Info, data.clone()).unwrap();
+        let line = fs::read_to_string(&path).unwrap();
+        assert_eq!(data_json(line.trim()), Some(data.to_string().as_str()));
+    }
+
+    #[test]
+    fn test_read_cache_invalidated_by_append() {
+        let dir = tempdir().unwrap();
+        let path = dir.path().join("events.log");
+        let signer = SigningKey::generate(&mut rand::rngs::OsRng);
+        let log = EventLog::new(path, signer, 1 << 20).unwrap();
+        log.append("A", EventSeverity::Info, serde_json::json!({}))
+            .unwrap();
+        assert_eq!(log.read_recent(None, Some(10)).unwrap().len(), 1);
+        assert_eq!(log.read_recent(None, Some(10)).unwrap().len(), 1);
+
+        log.append("B", EventSeverity::Info, serde_json::json!({}))
+            .unwrap();
+        let entries = log.read_recent(None, Some(10)).unwrap();
+        assert_eq!(entries.len(), 2);
+        assert_eq!(entries[0].event_type, "B");
+    }
+
     #[test]
     fn anchor_file_written() {
         let dir = tempdir().unwrap();
@@ -1,4 +1,5 @@
 use anyhow::{anyhow, Result};
+use crate::event_log::EventFilter;
 use crate::settings::GuardSettings;
 use hmac::{Hmac, Mac};
 use rand::RngCore;
@@ -8,6 +9,7 @@ use std::collections::HashMap;
 use std::sync::Arc;
 use tokio::io::{AsyncBufReadExt, AsyncWriteExt, BufReader};
 use tokio::sync::Mutex;
+use tracing::warn;
 
 pub const IPC_PROTOCOL_VERSION: u32 = 1;
 
@@ -92,6 +94,8 @@ pub enum IpcRequest {
     GetEvents {
         since: Option<String>,  // ISO 8601 timestamp
         limit: Option<usize>,
+        #[serde(default)]
+        filter: EventFilter,
     },
     TriggerScan,
     // ── New commands per architecture spec ───────────────────────────────
@@ -235,7 +239,7 @@ impl IpcServer {
             let handler = handler.clone();
             tokio::spawn(async move {
                 if let Err(e) = handle_connection(stream, auth, handler).await {
-                    eprintln!("ipc connection error: {e}");
+                    warn!(error = %e, "ipc connection error");
                 }
             });
         }
@@ -253,7 +257,7 @@ impl IpcServer {
             let handler = handler.clone();
             tokio::spawn(async move {
                 if let Err(e) = handle_connection(server, auth, handler).await {
-                    eprintln!("ipc connection error: {e}");
+                    warn!(error = %e, "ipc connection error");
                 }
             });
         }
@@ -20,6 +20,22 @@ pub struct ProtectionSettings {
     pub protected_paths: Vec<String>,
     #[serde(default)]
     pub quarantine_enabled: bool,
+    /// Watch every protected path by polling instead of native OS events.
+    /// Network and non-NTFS volumes are polled regardless, since native
+    /// notifications on them can silently drop events.
+    #[serde(default)]
+    pub force_polling: bool,
+    /// File-name patterns (`*.swp`, `.#*` or an exact name) whose changes
+    /// inside protected directories are ignored, e.g. editor temp files.
+    /// Explicitly protected files and files in the baseline are never
+    /// ignored.
+    #[serde(default)]
+    pub ignore_patterns: Vec<String>,
+    /// Re-hash every protected file on every periodic audit. By default an
+    /// audit skips files whose size and modification time are unchanged
+    /// since they were last hashed, with a full re-hash every few passes.
+    #[serde(default)]
+    pub always_rehash: bool,
 }
 
 #[derive(Debug, Clone, Serialize, Deserialize)]
@@ -53,6 +69,9 @@ impl Default for GuardSettings {
                 baseline_locked: true,
                 protected_paths: vec![],
                 quarantine_enabled: true,
+                force_polling: false,
+                ignore_patterns: vec![],
+                always_rehash: false,
             },
             performance: PerformanceLimits {
                 max_cpu_percent: 30,
@@ -240,11 +240,7 @@ impl Vault {
         let new_nonce = generate_nonce();
         self.header.nonce = new_nonce;
         let ciphertext = encrypt(&key, &self.header.nonce, &plaintext)?;
-        let mut file = File::create(&self.path)?;
-        file.write_all(&VaultHeader::to_bytes(&self.header)?)?;
-        file.write_all(&ciphertext)?;
-        file.flush()?;
-        Ok(())
+        self.write_sealed(&ciphertext)
     }
 
     pub fn save_with_key(&mut self) -> Result<()> {
@@ -257,10 +253,31 @@ impl Vault {
         let new_nonce = generate_nonce();
         self.header.nonce = new_nonce;
         let ciphertext = encrypt(&self.key, &self.header.nonce, &plaintext)?;
-        let mut file = File::create(&self.path)?;
-        file.write_all(&VaultHeader::to_bytes(&self.header)?)?;
-        file.write_all(&ciphertext)?;
-        file.flush()?;
+        self.write_sealed(&ciphertext)
+    }
+
+    /// Replace the vault file with header + `ciphertext` in one write to a
+    /// sibling staging file, synced and renamed into place. A crash leaves
+    /// either the old vault or the new one, never a truncated mix.
+    fn write_sealed(&self, ciphertext: &[u8]) -> Result<()> {
+        let header = VaultHeader::to_bytes(&self.header)?;
+        let mut sealed = Vec::with_capacity(header.len() + ciphertext.len());
+        sealed.extend_from_slice(&header);
+        sealed.extend_from_slice(ciphertext);
+
+        let mut staging = self.path.clone().into_os_string();
+        staging.push(".staging");
+        let staging = PathBuf::from(staging);
+        {
+            let mut file = File::create(&staging)?;
+            file.write_all(&sealed)?;
+            file.sync_all()?;
+        }
+        std::fs::rename(&staging, &self.path)?;
+        #[cfg(unix)]
+        if let Some(dir) = self.path.parent().filter(|d| !d.as_os_str().is_empty()) {
+            File::open(dir)?.sync_all()?;
+        }
         Ok(())
     }
 
@@ -16,13 +16,20 @@ pub struct QuarantineZone {
 
 impl QuarantineZone {
     pub fn new(root: PathBuf) -> Result<Self> {
-        fs::create_dir_all(&root).with_context(|| format!("create quarantine dir {}", root.display()))?;
+        let zone = Self { root };
+        zone.ensure_root()?;
+        Ok(zone)
+    }
+
+    fn ensure_root(&self) -> Result<()> {
+        fs::create_dir_all(&self.root)
+            .with_context(|| format!("create quarantine dir {}", self.root.display()))?;
         #[cfg(unix)]
         {
             use std::os::unix::fs::PermissionsExt;
-            let _ = fs::set_permissions(&root, fs::Permissions::from_mode(0o700));
+            let _ = fs::set_permissions(&self.root, fs::Permissions::from_mode(0o700));
         }
-        Ok(Self { root })
+        Ok(())
     }
 
     /// Move a tampered file into quarantine. Returns the quarantine destination
@@ -42,7 +49,16 @@ impl QuarantineZone {
         let dest_name = format!("{}_{}", ts, filename);
         let dest = self.root.join(&dest_name);
 
-        match fs::rename(source, &dest) {
+        let mut moved = fs::rename(source, &dest);
+        if moved.is_err() && !self.root.exists() {
+            // The zone was removed after startup. Recreate it rather than
+            // falling through to the copy, which would fail the same way.
+            warn!(root = %self.root.display(), "quarantine dir missing, recreating");
+            self.ensure_root()?;
+            moved = fs::rename(source, &dest);
+        }
+
+        match moved {
             Ok(()) => {
                 info!(
                     from = %source.display(),
@@ -71,7 +87,6 @@ impl QuarantineZone {
         }
     }
 
-    #[allow(dead_code)]
     pub fn root(&self) -> &Path {
         &self.root
     }
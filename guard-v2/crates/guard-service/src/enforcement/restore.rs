@@ -16,25 +16,25 @@
 //! paths undergoing restore.
 
 use anyhow::{anyhow, Context, Result};
-use blake3::Hasher;
 use guard_core::backup_store::BackupStore;
 use parking_lot::Mutex;
-use std::collections::{HashMap, HashSet};
-use std::fs::{self, File, OpenOptions};
-use std::io::{Read, Write};
+use std::collections::hash_map::DefaultHasher;
+use std::collections::HashSet;
+use std::hash::{Hash, Hasher as _};
+use std::fs::{self, OpenOptions};
 use std::path::{Path, PathBuf};
 use std::sync::Arc;
 use std::time::Duration;
 use tracing::{error, info, warn};
 
 use crate::enforcement::quarantine::QuarantineZone;
-use crate::integrity::scanner::BaselineEntry;
+use crate::integrity::scanner::{hash_file_hex, BaselineEntry};
 
 /// Minimum free space required before writing a restored file (bytes).
 const MIN_FREE_SPACE_BYTES: u64 = 10 * 1024 * 1024; // 10 MiB
 
 /// Staging file prefix used so we can clean up orphans on startup.
-const STAGING_PREFIX: &str = ".darklock_restore_";
+pub(crate) const STAGING_PREFIX: &str = ".darklock_restore_";
 
 /// Result of a single restore attempt.
 #[derive(Debug, Clone)]
@@ -47,10 +47,15 @@ pub enum RestoreOutcome {
     Failed { error: String },
 }
 
+/// Number of shards the in-flight restore set is split across.
+const LOCK_SHARDS: usize = 16;
+
 /// The restore engine.
 pub struct RestoreEngine {
-    /// Per-path locks to prevent concurrent restores of the same file.
-    locks: Mutex<HashMap<String, Arc<Mutex<()>>>>,
+    /// Paths with a restore in flight, sharded by path hash so restores of
+    /// unrelated files never contend on one lock. Entries are removed when
+    /// the restore finishes, so the set stays bounded.
+    locks: [Mutex<HashSet<String>>; LOCK_SHARDS],
     /// Paths currently undergoing atomic restore — the watcher must skip these.
     pub restoring: Arc<Mutex<HashSet<PathBuf>>>,
     quarantine: QuarantineZone,
@@ -62,7 +67,7 @@ const RETRY_DELAYS_MS: [u64; MAX_RETRIES] = [100, 500, 2000];
 impl RestoreEngine {
     pub fn new(quarantine: QuarantineZone) -> Self {
         Self {
-            locks: Mutex::new(HashMap::new()),
+            locks: std::array::from_fn(|_| Mutex::new(HashSet::new())),
             restoring: Arc::new(Mutex::new(HashSet::new())),
             quarantine,
         }
@@ -80,17 +85,13 @@ impl RestoreEngine {
     ) -> RestoreOutcome {
         // ── Step 1: per-path lock ───────────────────────────────────────
         let path_key = path.display().to_string();
-        let lock = {
-            let mut locks = self.locks.lock();
-            locks
-                .entry(path_key.clone())
-                .or_insert_with(|| Arc::new(Mutex::new(())))
-                .clone()
-        };
-
-        let guard = match lock.try_lock() {
-            Some(g) => g,
-            None => return RestoreOutcome::AlreadyRestoring,
+        let shard = &self.locks[shard_of(&path_key)];
+        if !shard.lock().insert(path_key.clone()) {
+            return RestoreOutcome::AlreadyRestoring;
+        }
+        let guard = InFlight {
+            shard,
+            key: path_key,
         };
 
         // Mark as restoring so the watcher suppresses events for this path.
@@ -112,7 +113,6 @@ impl RestoreEngine {
     }
 
     /// Borrow the quarantine zone (e.g. for logging its root).
-    #[allow(dead_code)]
     pub fn quarantine(&self) -> &QuarantineZone {
         &self.quarantine
     }
@@ -121,15 +121,14 @@ impl RestoreEngine {
     /// Call on service startup to ensure crash safety.
     pub fn cleanup_staging(protected_paths: &[PathBuf]) {
         for root in protected_paths {
-            let dir = if root.is_file() {
-                root.parent().map(|p| p.to_path_buf())
-            } else if root.is_dir() {
-                Some(root.clone())
-            } else {
-                None
+            // One stat decides both cases.
+            let dir = match fs::metadata(root) {
+                Ok(meta) if meta.is_file() => root.parent(),
+                Ok(meta) if meta.is_dir() => Some(root.as_path()),
+                _ => None,
             };
             if let Some(dir) = dir {
-                Self::cleanup_staging_in_dir(&dir);
+                Self::cleanup_staging_in_dir(dir);
             }
         }
     }
@@ -209,17 +208,12 @@ impl RestoreEngine {
         // Ensure the target path doesn't resolve outside its parent via symlinks.
         validate_no_symlink_escape(target_path)?;
 
-        // ── Step 2: validate backup integrity ───────────────────────────
-        let blob_data = store
-            .read_blob_verified(&entry.path, &entry.hash)
-            .context("backup blob verification failed")?;
-
         // ── Step 2b: disk space preflight ───────────────────────────────
         let parent = target_path
             .parent()
             .ok_or_else(|| anyhow!("no parent dir for {}", target_path.display()))?;
         fs::create_dir_all(parent)?;
-        check_disk_space(parent, blob_data.len() as u64)?;
+        check_disk_space(parent, entry.size)?;
 
         // ── Step 3: staging file in same directory ──────────────────────
         let staging_name = format!(
@@ -228,14 +222,23 @@ impl RestoreEngine {
             rand::random::<u32>()
         );
         let staging_path = parent.join(&staging_name);
+        // The watcher drops staging-named files only while they are in the
+        // restoring set, so a planted look-alike is still checked.
+        self.restoring.lock().insert(staging_path.clone());
+        let _staging = Restoring {
+            set: &self.restoring,
+            path: staging_path.clone(),
+        };
 
+        // ── Steps 2 + 4: verified, streamed copy of the backup (fsynced) ─
+        // The blob is checked against the baseline hash while it is copied,
+        // so the file is never held in memory as a whole.
+        if let Err(e) = store
+            .restore_blob_to(&entry.path, &entry.hash, &staging_path)
+            .context("backup blob verification failed")
         {
-            let mut file = File::create(&staging_path)
-                .with_context(|| format!("create staging {}", staging_path.display()))?;
-            file.write_all(&blob_data)?;
-
-            // ── Step 4: fsync ───────────────────────────────────────────
-            file.sync_all()?;
+            let _ = fs::remove_file(&staging_path);
+            return Err(e);
         }
 
         #[cfg(unix)]
@@ -254,7 +257,7 @@ impl RestoreEngine {
         restore_permissions(target_path, entry.permissions)?;
 
         // ── Step 7: verify final hash ───────────────────────────────────
-        let final_hash = hash_file(target_path)?;
+        let final_hash = hash_file_hex(target_path)?;
         if final_hash != entry.hash {
             return Err(anyhow!(
                 "post-restore verification failed: expected {}, got {}",
@@ -272,6 +275,39 @@ impl RestoreEngine {
     }
 }
 
+// ── Per-path locking ────────────────────────────────────────────────────────
+
+fn shard_of(key: &str) -> usize {
+    let mut hasher = DefaultHasher::new();
+    key.hash(&mut hasher);
+    (hasher.finish() as usize) % LOCK_SHARDS
+}
+
+/// Releases a path's in-flight marker when the restore finishes or unwinds.
+struct InFlight<'a> {
+    shard: &'a Mutex<HashSet<String>>,
+    key: String,
+}
+
+impl Drop for InFlight<'_> {
+    fn drop(&mut self) {
+        self.shard.lock().remove(&self.key);
+    }
+}
+
+/// Takes a staging file back out of the restoring set once its restore
+/// attempt is over, whichever way it ended.
+struct Restoring<'a> {
+    set: &'a Mutex<HashSet<PathBuf>>,
+    path: PathBuf,
+}
+
+impl Drop for Restoring<'_> {
+    fn drop(&mut self) {
+        self.set.lock().remove(&self.path);
+    }
+}
+
 // ── Platform helpers ────────────────────────────────────────────────────────
 
 fn atomic_rename(from: &Path, to: &Path) -> Result<()> {
@@ -316,20 +352,6 @@ fn restore_permissions(path: &Path, mode: u32) -> Result<()> {
     Ok(())
 }
 
-fn hash_file(path: &Path) -> Result<String> {
-    let mut f = File::open(path)?;
-    let mut hasher = Hasher::new();
-    let mut buf = vec![0u8; 64 * 1024];
-    loop {
-        let n = f.read(&mut buf)?;
-        if n == 0 {
-            break;
-        }
-        hasher.update(&buf[..n]);
-    }
-    Ok(hasher.finalize().to_hex().to_string())
-}
-
 // ── Symlink attack protection ───────────────────────────────────────────────
 
 /// Ensure the target path doesn't escape its parent directory via symlinks.
@@ -21,6 +21,7 @@ use parking_lot::{Mutex, RwLock};
 use serde::{Deserialize, Serialize};
 use std::collections::VecDeque;
 use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicU8, Ordering};
 use std::sync::Arc;
 use std::time::Duration;
 use tokio::sync::{broadcast, watch};
@@ -53,6 +54,21 @@ impl Default for EngineMode {
     }
 }
 
+/// `EngineMode` discriminants, mirrored in `Engine::mode_tag`.
+const MODE_ACTIVE: u8 = 0;
+const MODE_MAINTENANCE: u8 = 1;
+const MODE_SAFE: u8 = 2;
+
+impl EngineMode {
+    fn tag(&self) -> u8 {
+        match self {
+            Self::Active => MODE_ACTIVE,
+            Self::Maintenance { .. } => MODE_MAINTENANCE,
+            Self::SafeMode => MODE_SAFE,
+        }
+    }
+}
+
 /// Broadcast message for engine state transitions.
 #[derive(Debug, Clone)]
 #[allow(dead_code)]
@@ -90,6 +106,16 @@ fn validate_settings(settings: &GuardSettings) -> Result<()> {
 
 const MAX_BASELINE_ARCHIVES: usize = 10;
 
+/// One event-log record (time, type, severity, data), collected during
+/// enforcement and committed with `EventLog::append_batch`.
+type LogRecord = (DateTime<Utc>, &'static str, EventSeverity, serde_json::Value);
+
+/// Stamp a record when it is made, so a later commit does not move the time
+/// an event is logged at.
+fn log_record(event_type: &'static str, severity: EventSeverity, data: serde_json::Value) -> LogRecord {
+    (Utc::now(), event_type, severity, data)
+}
+
 fn baselines_dir(data_dir: &Path) -> PathBuf {
     data_dir.join("baselines")
 }
@@ -128,6 +154,9 @@ fn archive_baseline(data_dir: &Path, current_path: &Path) -> Result<()> {
 pub struct Engine {
     settings: Arc<RwLock<GuardSettings>>,
     mode: Arc<RwLock<EngineMode>>,
+    /// Discriminant of `mode`, so mode checks never wait on the lock (which
+    /// tamper enforcement holds for a whole batch).
+    mode_tag: AtomicU8,
     queued_events: Arc<Mutex<VecDeque<TamperEvent>>>,
     event_tx: broadcast::Sender<EngineEvent>,
     last_daily_anchor: Arc<Mutex<DateTime<Utc>>>,
@@ -141,6 +170,7 @@ impl Engine {
         Ok(Self {
             settings: Arc::new(RwLock::new(settings)),
             mode: Arc::new(RwLock::new(EngineMode::Active)),
+            mode_tag: AtomicU8::new(MODE_ACTIVE),
             queued_events: Arc::new(Mutex::new(VecDeque::new())),
             event_tx,
             last_daily_anchor: Arc::new(Mutex::new(Utc::now())),
@@ -171,11 +201,18 @@ impl Engine {
     }
 
     pub fn is_active(&self) -> bool {
-        matches!(*self.mode.read(), EngineMode::Active)
+        self.mode_tag.load(Ordering::Acquire) == MODE_ACTIVE
     }
 
     pub fn is_maintenance(&self) -> bool {
-        matches!(*self.mode.read(), EngineMode::Maintenance { .. })
+        self.mode_tag.load(Ordering::Acquire) == MODE_MAINTENANCE
+    }
+
+    /// Replace the mode, keeping `mode_tag` in step with it.
+    fn set_mode(&self, mode: EngineMode) {
+        let mut current = self.mode.write();
+        self.mode_tag.store(mode.tag(), Ordering::Release);
+        *current = mode;
     }
 
     #[allow(dead_code)]
@@ -202,7 +239,7 @@ impl Engine {
             timeout_at,
             queued_events: 0,
         };
-        *self.mode.write() = mode.clone();
+        self.set_mode(mode.clone());
         self.queued_events.lock().clear();
 
         event_log.append(
@@ -241,22 +278,10 @@ impl Engine {
                 if baseline_path.exists() {
                     archive_baseline(data_dir, baseline_path)?;
                 }
-                let baseline = scanner.generate_baseline(signing_key)?;
+                // Hash and back up every file from a single read.
+                let baseline = scanner.generate_baseline_with_backups(signing_key, backup_store)?;
                 IntegrityScanner::save_baseline(&baseline, baseline_path)?;
 
-                // Update backup store for all files in new baseline.
-                for (_key, entry) in &baseline.entries {
-                    let p = PathBuf::from(&entry.path);
-                    if p.exists() {
-                        let perms = entry.permissions;
-                        if let Err(e) =
-                            backup_store.ensure_from_disk(&p, &entry.hash, perms, None)
-                        {
-                            warn!(path = %entry.path, error = %e, "backup update failed during rebaseline");
-                        }
-                    }
-                }
-
                 event_log.append(
                     "BASELINE_UPDATED",
                     EventSeverity::Info,
@@ -276,7 +301,7 @@ impl Engine {
             None
         };
 
-        *self.mode.write() = EngineMode::Active;
+        self.set_mode(EngineMode::Active);
         event_log.append(
             "MAINTENANCE_EXIT",
             EventSeverity::Info,
@@ -298,7 +323,7 @@ impl Engine {
             return Ok(());
         }
         self.queued_events.lock().clear();
-        *self.mode.write() = EngineMode::Active;
+        self.set_mode(EngineMode::Active);
         event_log.append(
             "MAINTENANCE_TIMEOUT",
             EventSeverity::Warn,
@@ -313,7 +338,7 @@ impl Engine {
 
     /// Enter safe mode.
     pub fn enter_safe_mode(&self) {
-        *self.mode.write() = EngineMode::SafeMode;
+        self.set_mode(EngineMode::SafeMode);
         let _ = self
             .event_tx
             .send(EngineEvent::ModeChanged(EngineMode::SafeMode));
@@ -321,7 +346,7 @@ impl Engine {
 
     /// Exit safe mode → Active.
     pub fn exit_safe_mode(&self) {
-        *self.mode.write() = EngineMode::Active;
+        self.set_mode(EngineMode::Active);
         let _ = self
             .event_tx
             .send(EngineEvent::ModeChanged(EngineMode::Active));
@@ -329,27 +354,43 @@ impl Engine {
 
     // ── Event routing ───────────────────────────────────────────────────
 
-    /// Process a `TamperEvent` from the watcher pipeline.
+    /// Process a batch of `TamperEvent`s from the watcher pipeline.
     /// In Active mode → enforce immediately.
     /// In Maintenance mode → queue (don't enforce).
     /// In SafeMode → drop.
-    pub fn handle_tamper_event(
+    ///
+    /// The mode is checked per event and its lock is not held while a file
+    /// is enforced. Each detection is logged before anything is touched, and
+    /// the outcomes are committed as soon as that event is enforced, so a
+    /// crash mid-batch never leaves a restored or moved file unrecorded.
+    pub fn handle_tamper_events(
         &self,
-        event: &TamperEvent,
+        events: &[TamperEvent],
         restore_engine: &RestoreEngine,
         backup_store: &BackupStore,
         baseline: &Baseline,
         event_log: &EventLog,
     ) {
-        match *self.mode.read() {
-            EngineMode::Active => {
-                self.enforce_tamper(event, restore_engine, backup_store, baseline, event_log);
+        for (i, event) in events.iter().enumerate() {
+            match *self.mode.read() {
+                EngineMode::Active => {}
+                EngineMode::Maintenance { .. } => {
+                    self.queued_events.lock().extend(events[i..].iter().cloned());
+                    return;
+                }
+                EngineMode::SafeMode => {
+                    // Drop silently — safe mode means enforcement is paused.
+                    return;
+                }
             }
-            EngineMode::Maintenance { .. } => {
-                self.queued_events.lock().push_back(event.clone());
+
+            if let Err(e) = event_log.append_batch([Self::detection_record(event)]) {
+                error!(error = %e, "failed to log tamper detection");
             }
-            EngineMode::SafeMode => {
-                // Drop silently — safe mode means enforcement is paused.
+            let mut records = Vec::new();
+            self.enforce_tamper(event, restore_engine, backup_store, baseline, &mut records);
+            if let Err(e) = event_log.append_batch(records) {
+                error!(error = %e, "failed to log tamper enforcement");
             }
         }
     }
@@ -369,8 +410,10 @@ impl Engine {
 
         let violations = result.modified.len() + result.removed.len();
         if violations > 0 {
-            // Log scan event
-            let _ = event_log.append(
+            // The violation is on disk before any file is restored, and each
+            // outcome is committed as soon as its restore returns, so a crash
+            // mid-scan loses no record of a restore that already happened.
+            if let Err(e) = event_log.append_batch([log_record(
                 "INTEGRITY_VIOLATION",
                 EventSeverity::Critical,
                 serde_json::json!({
@@ -379,21 +422,20 @@ impl Engine {
                     "removed": result.removed.len(),
                     "added": result.added.len(),
                 }),
-            );
-
-            // Enforce each violation
-            for mf in &result.modified {
-                let path = PathBuf::from(&mf.path);
-                if let Some(entry) = baseline.entries.get(&mf.path) {
-                    let outcome = restore_engine.restore_file(&path, entry, backup_store);
-                    self.log_restore(&mf.path, &outcome, event_log);
-                }
+            )]) {
+                error!(error = %e, "failed to log integrity violation");
             }
-            for removed_path in &result.removed {
-                if let Some(entry) = baseline.entries.get(removed_path) {
-                    let path = PathBuf::from(removed_path);
-                    let outcome = restore_engine.restore_file(&path, entry, backup_store);
-                    self.log_restore(removed_path, &outcome, event_log);
+            let restores = result
+                .modified
+                .iter()
+                .map(|mf| &mf.path)
+                .chain(&result.removed);
+            for path in restores {
+                if let Some(entry) = baseline.entries.get(path) {
+                    let outcome = restore_engine.restore_file(Path::new(path), entry, backup_store);
+                    if let Err(e) = event_log.append_batch(self.restore_record(path, &outcome)) {
+                        error!(error = %e, "failed to log restore outcome");
+                    }
                 }
             }
         }
@@ -431,174 +473,193 @@ impl Engine {
 
     /// Check if maintenance has timed out.
     pub fn check_maintenance_timeout(&self, event_log: &EventLog) {
-        if let EngineMode::Maintenance { timeout_at, .. } = &*self.mode.read() {
-            if Utc::now() >= *timeout_at {
-                let _ = self.maintenance_timeout(event_log);
-            }
+        if !self.is_maintenance() {
+            return;
+        }
+        // Copy the deadline out: the timeout takes the write lock.
+        let timeout_at = match &*self.mode.read() {
+            EngineMode::Maintenance { timeout_at, .. } => *timeout_at,
+            _ => return,
+        };
+        if Utc::now() >= timeout_at {
+            let _ = self.maintenance_timeout(event_log);
         }
     }
 
     // ── Private enforcement ─────────────────────────────────────────────
 
-    fn enforce_tamper(
-        &self,
-        event: &TamperEvent,
-        restore_engine: &RestoreEngine,
-        backup_store: &BackupStore,
-        baseline: &Baseline,
-        event_log: &EventLog,
-    ) {
+    /// The record that reports `event` itself, logged before it is enforced.
+    fn detection_record(event: &TamperEvent) -> LogRecord {
         match event {
             TamperEvent::Modified {
                 path,
                 expected_hash,
                 actual_hash,
+            } => log_record(
+                "TAMPER_DETECTED",
+                EventSeverity::Critical,
+                serde_json::json!({
+                    "path": path.display().to_string(),
+                    "kind": "modified",
+                    "expected_hash": expected_hash,
+                    "actual_hash": actual_hash,
+                }),
+            ),
+            TamperEvent::Deleted {
+                path,
+                expected_hash,
+            } => log_record(
+                "TAMPER_DETECTED",
+                EventSeverity::Critical,
+                serde_json::json!({
+                    "path": path.display().to_string(),
+                    "kind": "deleted",
+                    "expected_hash": expected_hash,
+                }),
+            ),
+            TamperEvent::PermissionChanged {
+                path,
+                expected_perms,
+                actual_perms,
+            } => log_record(
+                "TAMPER_DETECTED",
+                EventSeverity::Warn,
+                serde_json::json!({
+                    "path": path.display().to_string(),
+                    "kind": "permission_changed",
+                    "expected": expected_perms,
+                    "actual": actual_perms,
+                }),
+            ),
+            TamperEvent::Renamed { from, to } => log_record(
+                "TAMPER_DETECTED",
+                EventSeverity::Critical,
+                serde_json::json!({
+                    "path": from.display().to_string(),
+                    "kind": "renamed",
+                    "new_path": to.display().to_string(),
+                }),
+            ),
+            TamperEvent::UnauthorizedFile {
+                path,
+                file_hash,
+                file_size,
+                suspicious_reasons,
             } => {
-                let _ = event_log.append(
-                    "TAMPER_DETECTED",
-                    EventSeverity::Critical,
+                let is_suspicious = !suspicious_reasons.is_empty();
+                let severity = if is_suspicious {
+                    EventSeverity::Critical
+                } else {
+                    EventSeverity::Warn
+                };
+                log_record(
+                    "UNAUTHORIZED_FILE",
+                    severity,
                     serde_json::json!({
                         "path": path.display().to_string(),
-                        "kind": "modified",
-                        "expected_hash": expected_hash,
-                        "actual_hash": actual_hash,
+                        "kind": "unauthorized_new_file",
+                        "file_hash": file_hash,
+                        "file_size": file_size,
+                        "suspicious": is_suspicious,
+                        "reasons": suspicious_reasons,
                     }),
-                );
+                )
+            }
+        }
+    }
+
+    /// Enforce one tamper event, appending the outcome records to log to
+    /// `records` in the order they happened.
+    fn enforce_tamper(
+        &self,
+        event: &TamperEvent,
+        restore_engine: &RestoreEngine,
+        backup_store: &BackupStore,
+        baseline: &Baseline,
+        records: &mut Vec<LogRecord>,
+    ) {
+        match event {
+            TamperEvent::Modified { path, .. } => {
                 let key = path.display().to_string();
                 if let Some(entry) = baseline.entries.get(&key) {
                     let outcome = restore_engine.restore_file(path, entry, backup_store);
-                    self.log_restore(&key, &outcome, event_log);
+                    records.extend(self.restore_record(&key, &outcome));
                 }
             }
-            TamperEvent::Deleted {
-                path,
-                expected_hash,
-            } => {
-                let _ = event_log.append(
-                    "TAMPER_DETECTED",
-                    EventSeverity::Critical,
-                    serde_json::json!({
-                        "path": path.display().to_string(),
-                        "kind": "deleted",
-                        "expected_hash": expected_hash,
-                    }),
-                );
+            TamperEvent::Deleted { path, .. } => {
                 let key = path.display().to_string();
                 if let Some(entry) = baseline.entries.get(&key) {
                     let outcome = restore_engine.restore_file(path, entry, backup_store);
-                    self.log_restore(&key, &outcome, event_log);
+                    records.extend(self.restore_record(&key, &outcome));
                 }
             }
             TamperEvent::PermissionChanged {
                 path,
                 expected_perms,
-                actual_perms,
+                ..
             } => {
-                let _ = event_log.append(
-                    "TAMPER_DETECTED",
-                    EventSeverity::Warn,
-                    serde_json::json!({
-                        "path": path.display().to_string(),
-                        "kind": "permission_changed",
-                        "expected": expected_perms,
-                        "actual": actual_perms,
-                    }),
-                );
                 // Restore permissions directly
                 #[cfg(unix)]
                 {
                     use std::os::unix::fs::PermissionsExt;
+                    let key = path.display().to_string();
                     if let Err(e) = std::fs::set_permissions(
                         path,
                         std::fs::Permissions::from_mode(*expected_perms),
                     ) {
                         error!(path = %path.display(), error = %e, "failed to restore permissions");
                     } else {
-                        let _ = event_log.append(
+                        records.push(log_record(
                             "PERMISSIONS_RESTORED",
                             EventSeverity::Warn,
                             serde_json::json!({
-                                "path": path.display().to_string(),
+                                "path": key,
                                 "restored_perms": expected_perms,
                             }),
-                        );
+                        ));
                     }
                 }
+                #[cfg(not(unix))]
+                let _ = (path, expected_perms);
             }
             TamperEvent::Renamed { from, to } => {
-                let _ = event_log.append(
-                    "TAMPER_DETECTED",
-                    EventSeverity::Critical,
-                    serde_json::json!({
-                        "path": from.display().to_string(),
-                        "kind": "renamed",
-                        "new_path": to.display().to_string(),
-                    }),
-                );
+                let key = from.display().to_string();
+                let new_path = to.display().to_string();
                 // Try to reverse the rename.
                 if to.exists() && !from.exists() {
                     if std::fs::rename(to, from).is_ok() {
-                        let _ = event_log.append(
+                        records.push(log_record(
                             "RENAME_REVERSED",
                             EventSeverity::Warn,
                             serde_json::json!({
-                                "from": to.display().to_string(),
-                                "to": from.display().to_string(),
+                                "from": new_path,
+                                "to": key,
                             }),
-                        );
+                        ));
                     } else {
                         // Fall back to restoring from backup.
-                        let key = from.display().to_string();
                         if let Some(entry) = baseline.entries.get(&key) {
                             let outcome = restore_engine.restore_file(from, entry, backup_store);
-                            self.log_restore(&key, &outcome, event_log);
+                            records.extend(self.restore_record(&key, &outcome));
                         }
                     }
                 }
             }
             TamperEvent::UnauthorizedFile {
                 path,
-                file_hash,
-                file_size,
                 suspicious_reasons,
+                ..
             } => {
                 let is_suspicious = !suspicious_reasons.is_empty();
-                let severity = if is_suspicious {
-                    EventSeverity::Critical
-                } else {
-                    EventSeverity::Warn
-                };
-                
-                let _ = event_log.append(
-                    "UNAUTHORIZED_FILE",
-                    severity,
-                    serde_json::json!({
-                        "path": path.display().to_string(),
-                        "kind": "unauthorized_new_file",
-                        "file_hash": file_hash,
-                        "file_size": file_size,
-                        "suspicious": is_suspicious,
-                        "reasons": suspicious_reasons,
-                    }),
-                );
-                
+
                 // Quarantine suspicious files automatically
                 if is_suspicious && path.exists() {
-                    let quarantine_dir = backup_store.root().join("../quarantine");
-                    let _ = std::fs::create_dir_all(&quarantine_dir);
-                    
-                    let quarantine_name = format!(
-                        "{}_{}",
-                        chrono::Utc::now().format("%Y%m%d_%H%M%S"),
-                        path.file_name()
-                            .map(|n| n.to_string_lossy().to_string())
-                            .unwrap_or_else(|| "unknown".to_string())
-                    );
-                    let quarantine_path = quarantine_dir.join(&quarantine_name);
-                    
-                    match std::fs::rename(path, &quarantine_path) {
-                        Ok(_) => {
-                            let _ = event_log.append(
+                    // The restore engine's zone recreates its directory if it
+                    // went missing, so a move is only given up on when the
+                    // file really cannot be moved.
+                    match restore_engine.quarantine().quarantine_file(path) {
+                        Ok(Some(quarantine_path)) => {
+                            records.push(log_record(
                                 "FILE_QUARANTINED",
                                 EventSeverity::Warn,
                                 serde_json::json!({
@@ -606,17 +667,18 @@ impl Engine {
                                     "quarantine_path": quarantine_path.display().to_string(),
                                     "reasons": suspicious_reasons,
                                 }),
-                            );
+                            ));
                             info!(
                                 path = %path.display(),
                                 quarantine = %quarantine_path.display(),
                                 "suspicious file quarantined"
                             );
                         }
+                        Ok(None) => {}
                         Err(e) => {
                             // Try delete as fallback
                             if std::fs::remove_file(path).is_ok() {
-                                let _ = event_log.append(
+                                records.push(log_record(
                                     "FILE_REMOVED",
                                     EventSeverity::Warn,
                                     serde_json::json!({
@@ -624,16 +686,16 @@ impl Engine {
                                         "reason": "quarantine failed, file removed",
                                         "error": e.to_string(),
                                     }),
-                                );
+                                ));
                             } else {
-                                let _ = event_log.append(
+                                records.push(log_record(
                                     "QUARANTINE_FAILED",
                                     EventSeverity::Critical,
                                     serde_json::json!({
                                         "path": path.display().to_string(),
                                         "error": e.to_string(),
                                     }),
-                                );
+                                ));
                             }
                         }
                     }
@@ -648,46 +710,47 @@ impl Engine {
         }
     }
 
-    fn log_restore(&self, path: &str, outcome: &RestoreOutcome, event_log: &EventLog) {
+    /// Event-log record for a restore outcome, or `None` for outcomes that
+    /// are not logged. Successful restores are also broadcast to subscribers.
+    fn restore_record(
+        &self,
+        path: &str,
+        outcome: &RestoreOutcome,
+    ) -> Option<LogRecord> {
         match outcome {
             RestoreOutcome::Restored => {
-                let _ = event_log.append(
-                    "RESTORE_SUCCESS",
-                    EventSeverity::Warn,
-                    serde_json::json!({"path": path}),
-                );
                 let _ = self.event_tx.send(EngineEvent::RestoreAttempt {
                     path: path.to_string(),
                     outcome: "restored".into(),
                 });
+                Some(log_record(
+                    "RESTORE_SUCCESS",
+                    EventSeverity::Warn,
+                    serde_json::json!({"path": path}),
+                ))
             }
             RestoreOutcome::AlreadyRestoring => {
                 // silently skip
+                None
             }
-            RestoreOutcome::BackupCorrupted { path: p } => {
-                let _ = event_log.append(
-                    "BACKUP_STORE_CORRUPTION",
-                    EventSeverity::Critical,
-                    serde_json::json!({"path": p}),
-                );
-            }
-            RestoreOutcome::Quarantined { quarantine_path } => {
-                let _ = event_log.append(
-                    "RESTORE_FAILURE",
-                    EventSeverity::Critical,
-                    serde_json::json!({
-                        "path": path,
-                        "quarantined": quarantine_path.as_ref().map(|p| p.display().to_string()),
-                    }),
-                );
-            }
-            RestoreOutcome::Failed { error } => {
-                let _ = event_log.append(
-                    "RESTORE_FAILURE",
-                    EventSeverity::Critical,
-                    serde_json::json!({"path": path, "error": error}),
-                );
-            }
+            RestoreOutcome::BackupCorrupted { path: p } => Some(log_record(
+                "BACKUP_STORE_CORRUPTION",
+                EventSeverity::Critical,
+                serde_json::json!({"path": p}),
+            )),
+            RestoreOutcome::Quarantined { quarantine_path } => Some(log_record(
+                "RESTORE_FAILURE",
+                EventSeverity::Critical,
+                serde_json::json!({
+                    "path": path,
+                    "quarantined": quarantine_path.as_ref().map(|p| p.display().to_string()),
+                }),
+            )),
+            RestoreOutcome::Failed { error } => Some(log_record(
+                "RESTORE_FAILURE",
+                EventSeverity::Critical,
+                serde_json::json!({"path": path, "error": error}),
+            )),
         }
     }
 }
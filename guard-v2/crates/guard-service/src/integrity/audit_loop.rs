@@ -4,12 +4,27 @@
 //! configurable interval (default 5 minutes). This is the "belt" to the
 //! watcher's "suspenders" – it catches anything the watcher missed (restarts,
 //! NFS, event overflow, etc.).
+//!
+//! Passes are scheduled on fixed deadlines, so a long scan does not push every
+//! later pass back by its own duration. A deadline missed while a scan was
+//! still running is skipped rather than fired in a burst, and an early wake
+//! restarts the period.
+//!
+//! Between full passes the loop only re-hashes files whose stat stamp moved
+//! since the scanner last hashed them; every `FULL_SCAN_EVERY`th pass (and the
+//! first one) re-hashes everything. With `always_rehash` every pass is full.
+//! Off Unix the stamp lacks the inode change time, so the scanner re-hashes
+//! every file on changed-only passes too.
 
-use crate::integrity::scanner::{Baseline, IntegrityScanner, ScanResult};
+use crate::integrity::scanner::{Baseline, IntegrityScanner, ScanMode, ScanResult};
 use std::sync::Arc;
 use std::time::Duration;
 use tokio::sync::{watch, Notify};
-use tracing::{debug, info};
+use tokio::time::{Instant, MissedTickBehavior};
+use tracing::{debug, info, warn};
+
+/// Every Nth periodic scan ignores the stamp cache and re-hashes all files.
+const FULL_SCAN_EVERY: u64 = 12;
 
 /// Handle returned to the caller so it can request an immediate scan or shut
 /// the loop down.
@@ -24,11 +39,15 @@ pub struct AuditLoopHandle {
 /// `AuditLoopHandle` for control.
 ///
 /// `on_result` is called after every scan with the `ScanResult`. The caller
-/// (the orchestrator) decides what to enforce.
+/// (the orchestrator) decides what to enforce. `baseline_fn` hands out the
+/// current in-memory baseline rather than reading it from disk. It, the scan
+/// and `on_result` all run on the blocking pool so a long scan never stalls the
+/// async runtime; the scanner itself hashes files in parallel.
 pub fn spawn_audit_loop<F>(
     scanner: Arc<IntegrityScanner>,
     interval: Duration,
-    baseline_fn: Arc<dyn Fn() -> Option<Baseline> + Send + Sync>,
+    always_rehash: bool,
+    baseline_fn: Arc<dyn Fn() -> Option<Arc<Baseline>> + Send + Sync>,
     on_result: F,
 ) -> (tokio::task::JoinHandle<()>, AuditLoopHandle)
 where
@@ -38,8 +57,12 @@ where
     let (shutdown_tx, mut shutdown_rx) = watch::channel(false);
 
     let wake_clone = wake.clone();
+    let on_result = Arc::new(on_result);
 
     let handle = tokio::spawn(async move {
+        let mut scans: u64 = 0;
+        let mut ticks = tokio::time::interval_at(Instant::now() + interval, interval);
+        ticks.set_missed_tick_behavior(MissedTickBehavior::Skip);
         info!(
             interval_secs = interval.as_secs(),
             "audit loop started"
@@ -47,9 +70,10 @@ where
 
         loop {
             tokio::select! {
-                _ = tokio::time::sleep(interval) => {}
+                _ = ticks.tick() => {}
                 _ = wake_clone.notified() => {
                     debug!("audit loop woken early");
+                    ticks.reset();
                 }
                 _ = shutdown_rx.changed() => {
                     if *shutdown_rx.borrow() {
@@ -64,21 +88,37 @@ where
                 return;
             }
 
-            let baseline = match (baseline_fn)() {
-                Some(b) => b,
-                None => {
-                    debug!("audit loop: no baseline available, skipping scan");
-                    continue;
-                }
+            let mode = if always_rehash || scans % FULL_SCAN_EVERY == 0 {
+                ScanMode::Full
+            } else {
+                ScanMode::Changed
             };
+            scans += 1;
 
-            info!(
-                entries = baseline.entries.len(),
-                "audit loop: running periodic scan"
-            );
+            let scanner = scanner.clone();
+            let baseline_fn = baseline_fn.clone();
+            let on_result = on_result.clone();
+            let scan = tokio::task::spawn_blocking(move || {
+                let baseline = match (baseline_fn)() {
+                    Some(b) => b,
+                    None => {
+                        debug!("audit loop: no baseline available, skipping scan");
+                        return;
+                    }
+                };
 
-            let result = scanner.scan_against_baseline(&baseline);
-            on_result(result);
+                info!(
+                    entries = baseline.entries.len(),
+                    ?mode,
+                    "audit loop: running periodic scan"
+                );
+
+                let result = scanner.scan_against_baseline_with(&baseline, mode);
+                on_result(result);
+            });
+            if let Err(e) = scan.await {
+                warn!(error = %e, "audit loop: scan task failed");
+            }
         }
     });
 
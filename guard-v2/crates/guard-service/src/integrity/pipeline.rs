@@ -1,8 +1,10 @@
 //! Debounced watcher pipeline.
 //!
-//! Receives raw `FileChange` events from the `FileWatcher` broadcast channel,
-//! deduplicates them over a 100ms window, then emits `TamperEvent`s after
-//! verifying each changed file against the baseline.
+//! Receives raw `FileChange` events from the `FileWatcher` queue,
+//! deduplicates them over a 50ms window, then emits `TamperEvent`s after
+//! verifying each changed file against the baseline. Pending paths sit in a
+//! deadline heap, so the task sleeps until the next one is due instead of
+//! polling.
 //!
 //! **Advanced detection**:
 //! - Modified/deleted files checked against BLAKE3 baseline
@@ -14,16 +16,19 @@
 //! **Restore-loop suppression**: Events for paths currently in the
 //! `RestoreEngine::restoring` set are silently discarded.
 
-use crate::integrity::scanner::Baseline;
+use crate::enforcement::restore::STAGING_PREFIX;
+use crate::integrity::scanner::{Baseline, BaselineEntry, IntegrityScanner};
 use crate::integrity::watcher::FileChange;
 use blake3::Hasher;
-use std::collections::HashMap;
+use std::cmp::Reverse;
+use std::collections::{BinaryHeap, HashMap};
 use std::fs;
-use std::io::Read;
+use std::io::{self, Read};
 use std::path::{Path, PathBuf};
 use std::sync::Arc;
-use std::time::{Duration, Instant};
-use tokio::sync::broadcast;
+use std::time::Duration;
+use tokio::sync::{broadcast, mpsc};
+use tokio::time::Instant;
 use tracing::{debug, trace, warn, info};
 
 // ── TamperEvent ─────────────────────────────────────────────────────────────
@@ -76,6 +81,10 @@ const SUSPICIOUS_NAMES: &[&str] = &[
     ".htaccess", ".env", "wp-login", "eval", "base64_decode",
 ];
 
+/// Head of a new file kept for `analyze_file_suspicion`, which never looks
+/// past the first 64 KiB of content.
+const SUSPICION_SAMPLE: u64 = 64 * 1024;
+
 /// Calculate Shannon entropy of file data (0.0 = uniform, 8.0 = max random)
 fn calculate_entropy(data: &[u8]) -> f64 {
     if data.is_empty() {
@@ -96,6 +105,20 @@ fn calculate_entropy(data: &[u8]) -> f64 {
     entropy
 }
 
+/// Read the head of a new file for analysis and hash all of it in the same
+/// streaming pass, so a large file is never held in memory whole. Returns the
+/// head, the BLAKE3 hex digest and the number of bytes read.
+fn sample_and_hash(path: &Path) -> io::Result<(Vec<u8>, String, u64)> {
+    let mut file = fs::File::open(path)?;
+    let mut head = Vec::new();
+    (&mut file).take(SUSPICION_SAMPLE).read_to_end(&mut head)?;
+    let mut hasher = Hasher::new();
+    hasher.update(&head);
+    let rest = io::copy(&mut file, &mut hasher)?;
+    let size = head.len() as u64 + rest;
+    Ok((head, hasher.finalize().to_hex().to_string(), size))
+}
+
 /// Check if a file has suspicious characteristics
 fn analyze_file_suspicion(path: &Path, data: &[u8]) -> Vec<String> {
     let mut reasons = Vec::new();
@@ -181,9 +204,14 @@ fn analyze_file_suspicion(path: &Path, data: &[u8]) -> Vec<String> {
 
 /// Spawn the debounced watcher pipeline.  Returns a `JoinHandle` and a
 /// `broadcast::Receiver<TamperEvent>` the orchestrator subscribes to.
+///
+/// Every path the watcher reports is dropped from `scanner`'s stamp cache,
+/// so the next changed-only audit pass re-hashes it even if its stamp was
+/// put back.
 pub fn spawn_watcher_pipeline(
-    mut raw_rx: broadcast::Receiver<FileChange>,
-    baseline_fn: Arc<dyn Fn() -> Option<Baseline> + Send + Sync>,
+    mut raw_rx: mpsc::Receiver<FileChange>,
+    baseline_fn: Arc<dyn Fn() -> Option<Arc<Baseline>> + Send + Sync>,
+    scanner: Arc<IntegrityScanner>,
     restoring: Arc<parking_lot::Mutex<std::collections::HashSet<PathBuf>>>,
     shutdown: tokio::sync::watch::Receiver<bool>,
 ) -> (
@@ -195,59 +223,93 @@ pub fn spawn_watcher_pipeline(
     let mut shutdown = shutdown;
 
     let handle = tokio::spawn(async move {
-        let debounce_window = Duration::from_millis(100);
-        let mut pending: HashMap<PathBuf, (FileChange, Instant)> = HashMap::new();
+        let debounce_window = Duration::from_millis(50);
+        // Latest change per path and the instant it becomes due.
+        let mut pending: HashMap<PathBuf, (Pending, Instant)> = HashMap::new();
+        // Min-heap of due instants. A path re-armed by a newer event leaves
+        // its old heap entry behind; that entry no longer matches `pending`
+        // when popped and is skipped.
+        let mut deadlines: BinaryHeap<Reverse<(Instant, PathBuf)>> = BinaryHeap::new();
 
         loop {
+            let next_due = deadlines.peek().map(|Reverse((due, _))| *due);
+
             tokio::select! {
                 result = raw_rx.recv() => {
                     match result {
-                        Ok(change) => {
+                        Some(change) => {
                             let path = change_path(&change);
-                            pending.insert(path, (change, Instant::now()));
+                            let due = Instant::now() + debounce_window;
+                            let change = match pending.remove(&path) {
+                                Some((prev, _)) => coalesce(prev, change),
+                                None => Pending::from(change),
+                            };
+                            pending.insert(path.clone(), (change, due));
+                            deadlines.push(Reverse((due, path)));
                         }
-                        Err(broadcast::error::RecvError::Lagged(n)) => {
-                            warn!(missed = n, "watcher pipeline lagged; audit loop will catch up");
-                        }
-                        Err(broadcast::error::RecvError::Closed) => {
+                        None => {
                             debug!("watcher channel closed, pipeline exiting");
                             return;
                         }
                     }
                 }
-                _ = tokio::time::sleep(Duration::from_millis(50)) => {
-                    // Flush debounce window
+                _ = tokio::time::sleep_until(next_due.unwrap_or_else(Instant::now)), if next_due.is_some() => {
+                    // Earliest debounce window elapsed
                 }
                 _ = shutdown.changed() => {
                     if *shutdown.borrow() { return; }
                 }
             }
 
-            // Process entries whose debounce window has elapsed.
+            // Drain every entry whose debounce window has elapsed, then
+            // check them as one batch: one pass over the restoring set and
+            // one baseline snapshot however many paths a burst touched.
             let now = Instant::now();
-            let ready: Vec<(PathBuf, FileChange)> = pending
-                .iter()
-                .filter(|(_, (_, ts))| now.duration_since(*ts) >= debounce_window)
-                .map(|(p, (c, _))| (p.clone(), c.clone()))
-                .collect();
-
-            for (path, change) in ready {
-                pending.remove(&path);
-
-                // Restore-loop suppression
-                if restoring.lock().contains(&path) {
-                    trace!(path = %path.display(), "suppressed event – path being restored");
-                    continue;
+            let mut ready = Vec::new();
+            while let Some(Reverse((due, _))) = deadlines.peek() {
+                if *due > now {
+                    break;
+                }
+                let Some(Reverse((due, path))) = deadlines.pop() else { break };
+                if !matches!(pending.get(&path), Some((_, current)) if *current == due) {
+                    continue; // superseded by a later event for this path
                 }
+                let Some((change, _)) = pending.remove(&path) else { continue };
+                // Content changes go through the stamp cache when they are
+                // classified; anything else drops the stamp so the next
+                // audit re-hashes the path.
+                if !matches!(change.change, FileChange::Modified(_) | FileChange::Created(_)) {
+                    scanner.forget(&path);
+                }
+                if let FileChange::Renamed { to, .. } = &change.change {
+                    scanner.forget(to);
+                }
+                if let Some(to) = &change.renamed_to {
+                    scanner.forget(to);
+                }
+                ready.push((path, change));
+            }
+            if ready.is_empty() {
+                continue;
+            }
 
-                let baseline = match (baseline_fn)() {
-                    Some(b) => b,
-                    None => continue,
-                };
+            // Restore-loop suppression
+            {
+                let restoring = restoring.lock();
+                ready.retain(|(path, _)| {
+                    let restored = restoring.contains(path);
+                    if restored {
+                        trace!(path = %path.display(), "suppressed event – path being restored");
+                    }
+                    !restored
+                });
+            }
 
-                if let Some(event) = classify_change(&change, &baseline) {
+            let Some(baseline) = (baseline_fn)() else { continue };
+            for (path, change) in ready {
+                classify_pending(&path, &change, &baseline, &scanner, |event| {
                     let _ = tx.send(event);
-                }
+                });
             }
         }
     });
@@ -257,6 +319,106 @@ pub fn spawn_watcher_pipeline(
 
 // ── helpers ─────────────────────────────────────────────────────────────────
 
+/// The change waiting out a path's debounce window, plus what earlier
+/// changes in the window it absorbed that its own check would not see.
+#[derive(Debug)]
+struct Pending {
+    change: FileChange,
+    /// A chmod was folded into a content change. Content checks compare
+    /// hashes only, so the permissions are compared as well.
+    perms_changed: bool,
+    /// The path was renamed away and something then landed at it: where the
+    /// original went, so the rename is still reported.
+    renamed_to: Option<PathBuf>,
+}
+
+impl From<FileChange> for Pending {
+    fn from(change: FileChange) -> Self {
+        Self {
+            change,
+            perms_changed: false,
+            renamed_to: None,
+        }
+    }
+}
+
+/// Fold a new change for a path into the one already pending for it, so a
+/// burst collapses to the single check that covers all of it. A file created
+/// and removed inside the window collapses to `Removed`, which classifies to
+/// nothing unless the path is in the baseline. What the surviving change
+/// cannot express (a chmod under a write, a rename under a recreation) is
+/// carried alongside it.
+fn coalesce(prev: Pending, next: FileChange) -> Pending {
+    let Pending {
+        change: prev,
+        mut perms_changed,
+        mut renamed_to,
+    } = prev;
+    let change = match (prev, next) {
+        // Deleted then recreated: compare the new contents to the baseline.
+        (FileChange::Removed(_), FileChange::Created(path)) => FileChange::Modified(path),
+        // Content checks dominate, and the chmod rides along with them.
+        (prev @ (FileChange::Created(_) | FileChange::Modified(_)), FileChange::PermissionChanged(_)) => {
+            perms_changed = true;
+            prev
+        }
+        (FileChange::PermissionChanged(_), next @ (FileChange::Created(_) | FileChange::Modified(_))) => {
+            perms_changed = true;
+            next
+        }
+        // Writes to a file created in this window keep it a creation.
+        (FileChange::Created(_), FileChange::Modified(path)) => FileChange::Created(path),
+        // Renamed away, then something put in its place: check the newcomer
+        // and keep the rename.
+        (FileChange::Renamed { to, .. }, next @ (FileChange::Created(_) | FileChange::Modified(_))) => {
+            renamed_to = Some(to);
+            next
+        }
+        (_, next) => next,
+    };
+    Pending {
+        change,
+        perms_changed,
+        renamed_to,
+    }
+}
+
+/// Classify a change that has come due, with whatever it absorbed.
+fn classify_pending(
+    path: &Path,
+    pending: &Pending,
+    baseline: &Baseline,
+    scanner: &IntegrityScanner,
+    mut emit: impl FnMut(TamperEvent),
+) {
+    let key = path.display().to_string();
+    if let Some(to) = &pending.renamed_to {
+        if baseline.entries.contains_key(&key) {
+            emit(TamperEvent::Renamed {
+                from: path.to_path_buf(),
+                to: to.clone(),
+            });
+        }
+    }
+    match classify_change(&pending.change, baseline, scanner) {
+        Some(event) => emit(event),
+        // Contents match; a folded chmod still has to be checked. (When they
+        // differ, the restore puts the baseline permissions back too.)
+        None if pending.perms_changed => {
+            if let Some(event) = baseline.entries.get(&key).and_then(|entry| permission_change(path, entry)) {
+                emit(event);
+            }
+        }
+        None => {}
+    }
+}
+
+fn is_staging_name(path: &Path) -> bool {
+    path.file_name()
+        .and_then(|n| n.to_str())
+        .is_some_and(|n| n.starts_with(STAGING_PREFIX))
+}
+
 fn change_path(change: &FileChange) -> PathBuf {
     match change {
         FileChange::Modified(p)
@@ -267,7 +429,14 @@ fn change_path(change: &FileChange) -> PathBuf {
     }
 }
 
-fn classify_change(change: &FileChange, baseline: &Baseline) -> Option<TamperEvent> {
+/// Event paths arrive canonical: the watcher resolves every watch path once,
+/// and the backends report events beneath it, so they are looked up in the
+/// baseline as they are.
+fn classify_change(
+    change: &FileChange,
+    baseline: &Baseline,
+    scanner: &IntegrityScanner,
+) -> Option<TamperEvent> {
     match change {
         FileChange::Modified(path) | FileChange::Created(path) => {
             // Skip directories
@@ -275,13 +444,14 @@ fn classify_change(change: &FileChange, baseline: &Baseline) -> Option<TamperEve
                 return None;
             }
             
-            let canonical = path.canonicalize().ok().unwrap_or_else(|| path.clone());
+            let canonical = path.clone();
             let key = canonical.display().to_string();
             
             // Check if file is in baseline
             if let Some(entry) = baseline.entries.get(&key) {
-                // Known file — check for modification
-                match hash_file_quick(&canonical) {
+                // Known file — check for modification. A report whose stamp
+                // has not moved is answered from the cache without a read.
+                match scanner.current_hash(&canonical) {
                     Ok(actual_hash) => {
                         if actual_hash != entry.hash {
                             Some(TamperEvent::Modified {
@@ -300,16 +470,10 @@ fn classify_change(change: &FileChange, baseline: &Baseline) -> Option<TamperEve
                 }
             } else {
                 // NEW FILE — not in baseline! This is an unauthorized file.
-                // Read file data for analysis
-                match fs::read(&canonical) {
-                    Ok(data) => {
-                        let suspicious_reasons = analyze_file_suspicion(&canonical, &data);
-                        let file_hash = {
-                            let mut hasher = Hasher::new();
-                            hasher.update(&data);
-                            hasher.finalize().to_hex().to_string()
-                        };
-                        let file_size = data.len() as u64;
+                // Sample its head for analysis while hashing it.
+                match sample_and_hash(&canonical) {
+                    Ok((head, file_hash, file_size)) => {
+                        let suspicious_reasons = analyze_file_suspicion(&canonical, &head);
                         
                         info!(
                             path = %canonical.display(),
@@ -325,6 +489,13 @@ fn classify_change(change: &FileChange, baseline: &Baseline) -> Option<TamperEve
                             suspicious_reasons,
                         })
                     }
+                    // A restore's staging file is renamed into place as soon
+                    // as it is written; one already gone when its event comes
+                    // due is that, not a file left behind to report.
+                    Err(e) if e.kind() == io::ErrorKind::NotFound && is_staging_name(&canonical) => {
+                        trace!(path = %canonical.display(), "staging file already renamed away");
+                        None
+                    }
                     Err(e) => {
                         warn!(path = %canonical.display(), error = %e, "cannot read unauthorized file");
                         // Still report it even if we can't read it
@@ -340,36 +511,16 @@ fn classify_change(change: &FileChange, baseline: &Baseline) -> Option<TamperEve
         }
         FileChange::Removed(path) => {
             let key = path.display().to_string();
-            // Also try canonical form if path itself is in baseline
-            let entry = baseline.entries.get(&key).or_else(|| {
-                // Path is gone so we can't canonicalize; try as-is
-                baseline.entries.get(&key)
-            })?;
+            let entry = baseline.entries.get(&key)?;
             Some(TamperEvent::Deleted {
                 path: path.clone(),
                 expected_hash: entry.hash.clone(),
             })
         }
         FileChange::PermissionChanged(path) => {
-            let canonical = path.canonicalize().ok()?;
-            let key = canonical.display().to_string();
+            let key = path.display().to_string();
             let entry = baseline.entries.get(&key)?;
-
-            #[cfg(unix)]
-            {
-                use std::os::unix::fs::PermissionsExt;
-                if let Ok(meta) = fs::metadata(&canonical) {
-                    let actual = meta.permissions().mode();
-                    if actual != entry.permissions {
-                        return Some(TamperEvent::PermissionChanged {
-                            path: canonical,
-                            expected_perms: entry.permissions,
-                            actual_perms: actual,
-                        });
-                    }
-                }
-            }
-            None
+            permission_change(path, entry)
         }
         FileChange::Renamed { from, to } => {
             let from_key = from.display().to_string();
@@ -385,16 +536,81 @@ fn classify_change(change: &FileChange, baseline: &Baseline) -> Option<TamperEve
     }
 }
 
-fn hash_file_quick(path: &Path) -> anyhow::Result<String> {
-    let mut f = fs::File::open(path)?;
-    let mut hasher = Hasher::new();
-    let mut buf = vec![0u8; 64 * 1024];
-    loop {
-        let n = f.read(&mut buf)?;
-        if n == 0 {
-            break;
+/// A `PermissionChanged` event when `path`'s mode no longer matches its
+/// baseline entry. Only Unix modes are compared.
+fn permission_change(path: &Path, entry: &BaselineEntry) -> Option<TamperEvent> {
+    #[cfg(unix)]
+    {
+        use std::os::unix::fs::PermissionsExt;
+        if let Ok(meta) = fs::metadata(path) {
+            let actual = meta.permissions().mode();
+            if actual != entry.permissions {
+                return Some(TamperEvent::PermissionChanged {
+                    path: path.to_path_buf(),
+                    expected_perms: entry.permissions,
+                    actual_perms: actual,
+                });
+            }
         }
-        hasher.update(&buf[..n]);
     }
-    Ok(hasher.finalize().to_hex().to_string())
+    #[cfg(not(unix))]
+    let _ = (path, entry);
+    None
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_coalesce_bursts() {
+        let p = || PathBuf::from("/srv/protected/a.txt");
+        let fold = |prev: FileChange, next: FileChange| coalesce(Pending::from(prev), next);
+
+        let c = fold(FileChange::Removed(p()), FileChange::Created(p()));
+        assert!(matches!(c.change, FileChange::Modified(_)));
+
+        let c = fold(FileChange::Modified(p()), FileChange::PermissionChanged(p()));
+        assert!(matches!(c.change, FileChange::Modified(_)) && c.perms_changed);
+
+        let c = fold(FileChange::Created(p()), FileChange::Modified(p()));
+        assert!(matches!(c.change, FileChange::Created(_)));
+
+        let c = fold(FileChange::Created(p()), FileChange::Removed(p()));
+        assert!(matches!(c.change, FileChange::Removed(_)));
+    }
+
+    #[test]
+    fn test_coalesce_keeps_what_the_last_change_hides() {
+        let p = || PathBuf::from("/srv/protected/a.txt");
+        let moved = PathBuf::from("/srv/protected/a.bak");
+
+        // chmod, then a write: the write is checked and the chmod kept.
+        let c = coalesce(Pending::from(FileChange::PermissionChanged(p())), FileChange::Modified(p()));
+        assert!(matches!(c.change, FileChange::Modified(_)) && c.perms_changed);
+
+        // Renamed away, then recreated: the newcomer is checked and the
+        // rename kept.
+        let renamed = FileChange::Renamed { from: p(), to: moved.clone() };
+        let c = coalesce(Pending::from(renamed), FileChange::Created(p()));
+        assert!(matches!(c.change, FileChange::Created(_)));
+        assert_eq!(c.renamed_to, Some(moved));
+
+        // Both survive further changes in the same window.
+        let c = coalesce(c, FileChange::PermissionChanged(p()));
+        assert!(c.perms_changed && c.renamed_to.is_some());
+    }
+    #[test]
+    fn test_sample_and_hash_streams_whole_file() {
+        let dir = tempfile::tempdir().unwrap();
+        let path = dir.path().join("big.bin");
+        let data: Vec<u8> = (0..200_000u32).map(|i| (i % 251) as u8).collect();
+        fs::write(&path, &data).unwrap();
+
+        let (head, hash, size) = sample_and_hash(&path).unwrap();
+        assert_eq!(head.len() as u64, SUSPICION_SAMPLE);
+        assert_eq!(&head[..], &data[..head.len()]);
+        assert_eq!(hash, blake3::hash(&data).to_hex().to_string());
+        assert_eq!(size, data.len() as u64);
+    }
 }
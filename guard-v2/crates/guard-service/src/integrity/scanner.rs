@@ -7,16 +7,79 @@
 use anyhow::{Context, Result};
 use blake3::Hasher;
 use chrono::{DateTime, Utc};
+use guard_core::backup_store::{blake3_hex, BackupBatch, BackupStore};
 use ed25519_dalek::{Signer, SigningKey, VerifyingKey, Verifier, Signature};
+use parking_lot::Mutex;
 use serde::{Deserialize, Serialize};
 use sha2::{Sha256, Digest};
+use std::cell::RefCell;
 use std::collections::HashMap;
 use std::fs;
-use std::io::Read;
+use std::io::{BufWriter, Read, Write};
 use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::mpsc;
+use std::sync::{Arc, OnceLock};
+use std::thread;
+use std::time::SystemTime;
 use tracing::{info, warn, error, debug};
 use walkdir::WalkDir;
 
+/// Smallest read buffer used when hashing (avoids tiny reads on empty files).
+const HASH_BUF_MIN: usize = 8 * 1024;
+/// Largest read buffer used when hashing.
+const HASH_BUF_MAX: usize = 1024 * 1024;
+/// Largest file a baseline worker reads into memory for hashing and backup.
+/// Anything bigger is streamed through the hasher into the backup store.
+const BACKUP_BUFFER_MAX: u64 = 16 * 1024 * 1024;
+
+thread_local! {
+    /// Read buffer reused by every `hash_file` call on this thread. It only
+    /// grows (up to `HASH_BUF_MAX`), so a worker allocates once per scan and
+    /// long-lived watcher/restore threads allocate once per lifetime.
+    static HASH_BUF: RefCell<Vec<u8>> = const { RefCell::new(Vec::new()) };
+}
+
+/// BLAKE3 hex digest of a file's contents. Shared by the scanner and the
+/// restore engine so every caller goes through the same buffered,
+/// read-ahead hashing path.
+pub(crate) fn hash_file_hex(path: &Path) -> Result<String> {
+    IntegrityScanner::hash_file(path).map(|(hash, _)| hash)
+}
+
+/// Widest SIMD backend BLAKE3 will dispatch to on this CPU. BLAKE3 does its
+/// own CPUID probe and caches it; this mirrors that probe once so the
+/// selection can be reported at service start.
+pub fn hash_backend() -> &'static str {
+    static BACKEND: OnceLock<&'static str> = OnceLock::new();
+    BACKEND.get_or_init(detect_hash_backend)
+}
+
+fn detect_hash_backend() -> &'static str {
+    #[cfg(any(target_arch = "x86", target_arch = "x86_64"))]
+    {
+        if is_x86_feature_detected!("avx512f") && is_x86_feature_detected!("avx512vl") {
+            "avx512"
+        } else if is_x86_feature_detected!("avx2") {
+            "avx2"
+        } else if is_x86_feature_detected!("sse4.1") {
+            "sse4.1"
+        } else if is_x86_feature_detected!("sse2") {
+            "sse2"
+        } else {
+            "portable"
+        }
+    }
+    #[cfg(target_arch = "aarch64")]
+    {
+        "neon"
+    }
+    #[cfg(not(any(target_arch = "x86", target_arch = "x86_64", target_arch = "aarch64")))]
+    {
+        "portable"
+    }
+}
+
 /// A single file entry in the baseline
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct BaselineEntry {
@@ -64,10 +127,63 @@ pub struct ScanError {
     pub error: String,
 }
 
+/// How much work a scan does to establish each file's current hash
+#[derive(Debug, Clone, Copy, PartialEq, Eq)]
+pub enum ScanMode {
+    /// Re-hash every file and rebuild the stamp cache from scratch.
+    Full,
+    /// Re-hash only files whose stat stamp changed since they were last
+    /// hashed by this scanner; the rest reuse the cached hash.
+    Changed,
+}
+
+/// Stat identity of a file taken from the handle it was hashed through,
+/// before any byte was read. A write during or after hashing moves the
+/// stamp, so a matching stamp means the cached hash is still current. On
+/// Unix the inode change time is included, which userspace cannot set.
+#[derive(Debug, Clone, PartialEq, Eq)]
+struct FileStamp {
+    len: u64,
+    modified: Option<SystemTime>,
+    #[cfg(unix)]
+    inode: (u64, u64),
+    #[cfg(unix)]
+    changed: (i64, i64),
+}
+
+impl FileStamp {
+    fn of(metadata: &fs::Metadata) -> Self {
+        #[cfg(unix)]
+        use std::os::unix::fs::MetadataExt;
+
+        Self {
+            len: metadata.len(),
+            modified: metadata.modified().ok(),
+            #[cfg(unix)]
+            inode: (metadata.dev(), metadata.ino()),
+            #[cfg(unix)]
+            changed: (metadata.ctime(), metadata.ctime_nsec()),
+        }
+    }
+}
+
+/// What a baseline worker hands the backup consumer for one file.
+enum BaselineRead {
+    /// Read and hashed by the worker; backed up from the buffer.
+    Buffered(BaselineEntry, FileStamp, Vec<u8>),
+    /// Too large to buffer; hashed and backed up in one streamed pass.
+    Streamed(PathBuf),
+}
+
 #[derive(Clone)]
 pub struct IntegrityScanner {
     protected_paths: Vec<PathBuf>,
     device_id: String,
+    /// Canonical path -> (stamp, hash) for every file this scanner (or a
+    /// clone of it) has hashed. Kept in memory only: the baseline's own
+    /// timestamps are not covered by its signature, so they cannot be
+    /// trusted to skip hashing.
+    stamps: Arc<Mutex<HashMap<String, (FileStamp, String)>>>,
 }
 
 impl IntegrityScanner {
@@ -75,111 +191,291 @@ impl IntegrityScanner {
         Self {
             protected_paths,
             device_id,
+            stamps: Arc::new(Mutex::new(HashMap::new())),
+        }
+    }
+
+    /// Drop `path`'s stamp so the next changed-only scan re-hashes it
+    /// whatever its metadata says. Called for every path the watcher reports.
+    pub fn forget(&self, path: &Path) {
+        self.stamps.lock().remove(&path.display().to_string());
+    }
+
+    /// Hash of `path`'s current contents for a watcher report. If the file's
+    /// stamp still matches the one recorded when it was last hashed, the
+    /// report was spurious and the cached hash is returned without reading
+    /// it; otherwise the file is hashed and its new stamp recorded, so the
+    /// next changed-only scan skips it as well. The cache is only trusted
+    /// where the stamp carries the inode change time: a report is evidence
+    /// of a write, and a writer can set the modification time back.
+    pub fn current_hash(&self, path: &Path) -> Result<String> {
+        let key = path.display().to_string();
+        if cfg!(unix) {
+            if let Ok(metadata) = fs::metadata(path) {
+                if let Some((stamp, hash)) = self.stamps.lock().get(&key) {
+                    if *stamp == FileStamp::of(&metadata) {
+                        return Ok(hash.clone());
+                    }
+                }
+            }
         }
+        let (hash, metadata) = Self::hash_file(path)?;
+        self.stamps.lock().insert(key, (FileStamp::of(&metadata), hash.clone()));
+        Ok(hash)
     }
 
-    /// Hash a single file using BLAKE3
-    fn hash_file(path: &Path) -> Result<(String, u64)> {
+    /// Hash a single file using BLAKE3 in one sequential pass. Returns the
+    /// metadata of the handle that was read so callers never stat it again.
+    fn hash_file(path: &Path) -> Result<(String, fs::Metadata)> {
         let mut file = fs::File::open(path)
             .with_context(|| format!("Failed to open {}", path.display()))?;
         let metadata = file.metadata()?;
-        let size = metadata.len();
 
-        let mut hasher = Hasher::new();
-        let mut buffer = vec![0u8; 64 * 1024]; // 64KB buffer
-        loop {
-            let n = file.read(&mut buffer)?;
-            if n == 0 { break; }
-            hasher.update(&buffer[..n]);
+        #[cfg(target_os = "linux")]
+        {
+            use std::os::unix::io::AsRawFd;
+            // Purely advisory: lets the kernel read ahead aggressively.
+            unsafe {
+                libc::posix_fadvise(file.as_raw_fd(), 0, 0, libc::POSIX_FADV_SEQUENTIAL);
+            }
         }
 
-        Ok((hasher.finalize().to_hex().to_string(), size))
+        // Size the buffer to the file (capped) so small files are consumed in
+        // a single read and large files stream through 1 MiB slices. BLAKE3
+        // picks its SIMD backend (SSE4.1/AVX2/AVX-512/NEON) at runtime.
+        let buf_len = (metadata.len() as usize).clamp(HASH_BUF_MIN, HASH_BUF_MAX);
+        let mut hasher = Hasher::new();
+        HASH_BUF.with(|buf| -> Result<()> {
+            let mut buf = buf.borrow_mut();
+            if buf.len() < buf_len {
+                buf.resize(buf_len, 0);
+            }
+            let buffer = &mut buf[..buf_len];
+            loop {
+                let n = file.read(buffer)?;
+                if n == 0 { break; }
+                hasher.update(&buffer[..n]);
+            }
+            Ok(())
+        })?;
+
+        Ok((hasher.finalize().to_hex().to_string(), metadata))
     }
 
-    /// Walk all protected paths and collect file entries
+    /// Walk all protected paths, hash every file and rebuild the stamp cache
     fn collect_entries(&self) -> (HashMap<String, BaselineEntry>, Vec<ScanError>) {
-        let mut entries = HashMap::new();
-        let mut errors = Vec::new();
-
-        for root in &self.protected_paths {
-            if !root.exists() {
-                warn!("Protected path does not exist: {}", root.display());
-                continue;
-            }
+        let (files, mut errors) = self.walk_files();
+        let (hashed, hash_errors) = Self::hash_files(&files);
+        errors.extend(hash_errors);
+
+        let mut entries = HashMap::with_capacity(hashed.len());
+        let mut stamps = HashMap::with_capacity(hashed.len());
+        for (entry, stamp) in hashed {
+            stamps.insert(entry.path.clone(), (stamp, entry.hash.clone()));
+            entries.insert(entry.path.clone(), entry);
+        }
+        *self.stamps.lock() = stamps;
 
-            let walker = if root.is_file() {
-                WalkDir::new(root).max_depth(0)
-            } else {
-                WalkDir::new(root).follow_links(false)
-            };
+        (entries, errors)
+    }
 
-            for entry in walker.into_iter() {
-                let entry = match entry {
-                    Ok(e) => e,
-                    Err(e) => {
-                        errors.push(ScanError {
-                            path: format!("{}", root.display()),
-                            error: e.to_string(),
-                        });
+    /// Walk all protected paths, stat every file and hash only those whose
+    /// stamp differs from the one recorded when it was last hashed. As in
+    /// [`Self::current_hash`], the stamp is only trusted where it carries the
+    /// inode change time; elsewhere every file is re-hashed.
+    fn collect_changed_entries(&self) -> (HashMap<String, BaselineEntry>, Vec<ScanError>) {
+        let (files, mut errors) = self.walk_files();
+        let mut entries = HashMap::with_capacity(files.len());
+        let mut stale = Vec::new();
+
+        // Each stat is a syscall round trip (a network one on remote mounts),
+        // so they run on the worker pool too; only the lookups are serial.
+        let stats = par_map(&files, |path| (path, fs::metadata(path)));
+        {
+            let stamps = self.stamps.lock();
+            for (path, metadata) in stats {
+                let metadata = match metadata {
+                    Ok(m) => m,
+                    Err(_) => {
+                        // Let the hashing pass report the error.
+                        stale.push(path.clone());
                         continue;
                     }
                 };
+                let key = path.display().to_string();
+                match stamps.get(&key) {
+                    Some((stamp, hash)) if cfg!(unix) && *stamp == FileStamp::of(&metadata) => {
+                        let entry = Self::entry_from(&path, hash.clone(), &metadata);
+                        entries.insert(key, entry);
+                    }
+                    _ => stale.push(path.clone()),
+                }
+            }
+        }
 
-                if !entry.file_type().is_file() {
+        debug!(
+            unchanged = entries.len(),
+            rehash = stale.len(),
+            "integrity scan: stat pass complete"
+        );
+
+        let (hashed, hash_errors) = Self::hash_files(&stale);
+        errors.extend(hash_errors);
+
+        let mut stamps = self.stamps.lock();
+        for (entry, stamp) in hashed {
+            stamps.insert(entry.path.clone(), (stamp, entry.hash.clone()));
+            entries.insert(entry.path.clone(), entry);
+        }
+
+        (entries, errors)
+    }
+
+    /// Walk all protected paths and return the canonical path of every file.
+    /// Roots are walked on the worker pool, so protecting several folders
+    /// (or folders on different mounts) overlaps their directory reads.
+    fn walk_files(&self) -> (Vec<PathBuf>, Vec<ScanError>) {
+        let mut files = Vec::new();
+        let mut errors = Vec::new();
+
+        for (root_files, root_errors) in par_map(&self.protected_paths, |root| Self::walk_root(root)) {
+            files.extend(root_files);
+            errors.extend(root_errors);
+        }
+
+        (files, errors)
+    }
+
+    /// Walk one protected path and return the canonical path of every file
+    fn walk_root(root: &Path) -> (Vec<PathBuf>, Vec<ScanError>) {
+        let mut files = Vec::new();
+        let mut errors = Vec::new();
+
+        // Resolve the root once. The walker never follows links, so every
+        // file it yields beneath a canonical root is already canonical and
+        // needs no per-file realpath.
+        let root = match root.canonicalize() {
+            Ok(r) => r,
+            Err(_) => {
+                warn!("Protected path does not exist: {}", root.display());
+                return (files, errors);
+            }
+        };
+
+        // A file root yields just itself, so files and directories
+        // share one walk without a separate stat to tell them apart.
+        for entry in WalkDir::new(&root).follow_links(false) {
+            let entry = match entry {
+                Ok(e) => e,
+                Err(e) => {
+                    errors.push(ScanError {
+                        path: format!("{}", root.display()),
+                        error: e.to_string(),
+                    });
                     continue;
                 }
+            };
 
-                let path = entry.path();
-                let canonical = match path.canonicalize() {
-                    Ok(c) => c,
-                    Err(e) => {
-                        errors.push(ScanError {
-                            path: path.display().to_string(),
-                            error: e.to_string(),
-                        });
-                        continue;
-                    }
-                };
+            if entry.file_type().is_file() {
+                files.push(entry.into_path());
+            }
+        }
 
-                match Self::hash_file(&canonical) {
-                    Ok((hash, size)) => {
-                        let modified = entry
-                            .metadata()
-                            .ok()
-                            .and_then(|m| m.modified().ok())
-                            .map(DateTime::<Utc>::from)
-                            .unwrap_or_else(Utc::now);
-
-                        #[cfg(unix)]
-                        let permissions = {
-                            use std::os::unix::fs::PermissionsExt;
-                            entry.metadata().map(|m| m.permissions().mode()).unwrap_or(0)
-                        };
-                        #[cfg(not(unix))]
-                        let permissions = 0u32;
-
-                        let key = canonical.display().to_string();
-                        entries.insert(key.clone(), BaselineEntry {
-                            path: key,
-                            hash,
-                            size,
-                            modified,
-                            permissions,
-                        });
-                    }
-                    Err(e) => {
-                        errors.push(ScanError {
-                            path: canonical.display().to_string(),
-                            error: e.to_string(),
-                        });
-                    }
-                }
+        (files, errors)
+    }
+
+    /// Hash `files` on the worker pool
+    fn hash_files(files: &[PathBuf]) -> (Vec<(BaselineEntry, FileStamp)>, Vec<ScanError>) {
+        let mut entries = Vec::with_capacity(files.len());
+        let mut errors = Vec::new();
+
+        for (path, result) in par_map(files, |path| (path, Self::build_entry(path))) {
+            match result {
+                Ok(hashed) => entries.push(hashed),
+                Err(e) => errors.push(ScanError { path: path.display().to_string(), error: e.to_string() }),
             }
         }
 
         (entries, errors)
     }
 
+    /// Hash one file and build its baseline entry and stamp
+    fn build_entry(canonical: &Path) -> Result<(BaselineEntry, FileStamp)> {
+        let (hash, metadata) = Self::hash_file(canonical)?;
+        Ok((Self::entry_from(canonical, hash, &metadata), FileStamp::of(&metadata)))
+    }
+
+    /// Read one file fully, hash the buffer and build its baseline entry and
+    /// stamp. The buffer is returned so it can be backed up without a second
+    /// read. Files over `BACKUP_BUFFER_MAX` are left for [`Self::stream_entry`].
+    fn read_entry(canonical: &Path) -> Result<BaselineRead> {
+        let mut file = fs::File::open(canonical)
+            .with_context(|| format!("Failed to open {}", canonical.display()))?;
+        let metadata = file.metadata()?;
+        if metadata.len() > BACKUP_BUFFER_MAX {
+            return Ok(BaselineRead::Streamed(canonical.to_path_buf()));
+        }
+        let mut data = Vec::with_capacity(metadata.len() as usize);
+        file.read_to_end(&mut data)?;
+        let hash = blake3_hex(&data);
+        Ok(BaselineRead::Buffered(
+            Self::entry_from(canonical, hash, &metadata),
+            FileStamp::of(&metadata),
+            data,
+        ))
+    }
+
+    /// Back up a large file in one streamed pass and build its baseline entry
+    /// from the digest computed on the way. If the backup fails the file is
+    /// hashed on its own, so the baseline still covers it.
+    fn stream_entry(
+        canonical: &Path,
+        batch: &mut BackupBatch<'_>,
+        backup_failures: &mut usize,
+    ) -> Result<(BaselineEntry, FileStamp)> {
+        let mut file = fs::File::open(canonical)
+            .with_context(|| format!("Failed to open {}", canonical.display()))?;
+        let metadata = file.metadata()?;
+        let mut entry = Self::entry_from(canonical, String::new(), &metadata);
+        match batch.add_reader(entry.path.clone(), &mut file, entry.permissions, None) {
+            Ok(backup) => {
+                // Size and hash both describe the bytes that were backed up,
+                // even if the file changed while it was being read.
+                entry.hash = backup.blob_hash;
+                entry.size = backup.original_size;
+                Ok((entry, FileStamp::of(&metadata)))
+            }
+            Err(e) => {
+                debug!(path = %entry.path, error = %e, "backup failed during baseline generation");
+                *backup_failures += 1;
+                Self::build_entry(canonical)
+            }
+        }
+    }
+
+    fn entry_from(canonical: &Path, hash: String, metadata: &fs::Metadata) -> BaselineEntry {
+        let modified = metadata
+            .modified()
+            .map(DateTime::<Utc>::from)
+            .unwrap_or_else(|_| Utc::now());
+
+        #[cfg(unix)]
+        let permissions = {
+            use std::os::unix::fs::PermissionsExt;
+            metadata.permissions().mode()
+        };
+        #[cfg(not(unix))]
+        let permissions = 0u32;
+
+        BaselineEntry {
+            path: canonical.display().to_string(),
+            hash,
+            size: metadata.len(),
+            modified,
+            permissions,
+        }
+    }
+
     /// Create a canonical bytes representation of entries for signing
     fn canonical_bytes(entries: &HashMap<String, BaselineEntry>) -> Vec<u8> {
         let mut keys: Vec<&String> = entries.keys().collect();
@@ -202,11 +498,148 @@ impl IntegrityScanner {
     pub fn generate_baseline(&self, signing_key: &SigningKey) -> Result<Baseline> {
         info!("Generating integrity baseline for {} protected paths", self.protected_paths.len());
         let (entries, errors) = self.collect_entries();
+        Ok(self.finish_baseline(entries, &errors, signing_key))
+    }
 
-        if !errors.is_empty() {
-            warn!("{} errors during baseline generation", errors.len());
-            for err in &errors {
-                warn!("  {} — {}", err.path, err.error);
+    /// Generate a new signed baseline and back up every file in the same
+    /// pass: each file is read once, and that buffer is both hashed for the
+    /// baseline and stored in `backup_store`. Workers read and hash in
+    /// parallel; the bounded channel keeps only a few buffers in flight, and
+    /// files over `BACKUP_BUFFER_MAX` are never buffered at all: the consumer
+    /// streams them through the hasher into the backup store.
+    /// The backups are recorded as one batch, so the manifest is signed and
+    /// journaled once per rebaseline rather than once per file.
+    ///
+    /// A rebaseline only pays for what changed: a file whose stamp still
+    /// matches the one recorded when this scanner last hashed it, and whose
+    /// backup already holds that hash, keeps its entry without being read.
+    /// As in [`Self::current_hash`], the stamp is only trusted where it
+    /// carries the inode change time; elsewhere every file is re-read, so a
+    /// rebaseline never signs a hash the file no longer has.
+    pub fn generate_baseline_with_backups(
+        &self,
+        signing_key: &SigningKey,
+        backup_store: &mut BackupStore,
+    ) -> Result<Baseline> {
+        info!("Generating integrity baseline and backups for {} protected paths", self.protected_paths.len());
+        let (walked, mut errors) = self.walk_files();
+        let mut entries = HashMap::with_capacity(walked.len());
+
+        let mut files = Vec::new();
+        {
+            let stamps = self.stamps.lock();
+            for (path, metadata) in par_map(&walked, |path| (path, fs::metadata(path))) {
+                let key = path.display().to_string();
+                let cached = metadata.ok().filter(|_| cfg!(unix)).and_then(|metadata| {
+                    let (stamp, hash) = stamps.get(&key)?;
+                    let backed_up = backup_store.entry_for(&key)?.blob_hash == *hash;
+                    (backed_up && *stamp == FileStamp::of(&metadata))
+                        .then(|| Self::entry_from(path, hash.clone(), &metadata))
+                });
+                match cached {
+                    Some(entry) => {
+                        entries.insert(key, entry);
+                    }
+                    None => files.push(path.clone()),
+                }
+            }
+        }
+        debug!(
+            unchanged = entries.len(),
+            reread = files.len(),
+            "baseline generation: stat pass complete"
+        );
+
+        let workers = thread::available_parallelism()
+            .map(|n| n.get())
+            .unwrap_or(1)
+            .min(files.len());
+        let next = AtomicUsize::new(0);
+        let mut backup_failures = 0usize;
+        let mut fresh_stamps = Vec::with_capacity(files.len());
+        let mut batch = backup_store.batch();
+
+        thread::scope(|scope| {
+            let (tx, rx) = mpsc::sync_channel(workers);
+            let files = &files;
+            let next = &next;
+            for _ in 0..workers {
+                let tx = tx.clone();
+                scope.spawn(move || {
+                    while let Some(path) = files.get(next.fetch_add(1, Ordering::Relaxed)) {
+                        let item = Self::read_entry(path).map_err(|e| ScanError {
+                            path: path.display().to_string(),
+                            error: e.to_string(),
+                        });
+                        if tx.send(item).is_err() {
+                            break;
+                        }
+                    }
+                });
+            }
+            drop(tx);
+
+            for item in rx {
+                let read = item.and_then(|read| match read {
+                    BaselineRead::Buffered(entry, stamp, data) => {
+                        if let Err(e) = batch.add_hashed_bytes(
+                            entry.path.clone(),
+                            &data,
+                            &entry.hash,
+                            entry.permissions,
+                            None,
+                        ) {
+                            debug!(path = %entry.path, error = %e, "backup failed during baseline generation");
+                            backup_failures += 1;
+                        }
+                        Ok((entry, stamp))
+                    }
+                    BaselineRead::Streamed(path) => {
+                        Self::stream_entry(&path, &mut batch, &mut backup_failures).map_err(|e| ScanError {
+                            path: path.display().to_string(),
+                            error: e.to_string(),
+                        })
+                    }
+                });
+                match read {
+                    Ok((entry, stamp)) => {
+                        fresh_stamps.push((entry.path.clone(), (stamp, entry.hash.clone())));
+                        entries.insert(entry.path.clone(), entry);
+                    }
+                    Err(err) => errors.push(err),
+                }
+            }
+        });
+
+        let batched = batch.len();
+        if let Err(e) = batch.commit() {
+            warn!(error = %e, "failed to record backups during baseline generation");
+            backup_failures += batched;
+        }
+        if backup_failures > 0 {
+            warn!(count = backup_failures, "backups failed during baseline generation");
+        }
+        self.stamps.lock().extend(fresh_stamps);
+        Ok(self.finish_baseline(entries, &errors, signing_key))
+    }
+
+    fn finish_baseline(
+        &self,
+        entries: HashMap<String, BaselineEntry>,
+        errors: &[ScanError],
+        signing_key: &SigningKey,
+    ) -> Baseline {
+        // One summary record at warn level; per-file detail only at debug so
+        // a large unreadable subtree cannot flood the log.
+        if let Some(first) = errors.first() {
+            warn!(
+                count = errors.len(),
+                first_path = %first.path,
+                first_error = %first.error,
+                "errors during baseline generation"
+            );
+            for err in errors {
+                debug!(path = %err.path, error = %err.error, "baseline entry skipped");
             }
         }
 
@@ -215,13 +648,13 @@ impl IntegrityScanner {
 
         info!("Baseline generated: {} files", entries.len());
 
-        Ok(Baseline {
+        Baseline {
             version: 1,
             created_at: Utc::now(),
             device_id: self.device_id.clone(),
             entries,
             signature: hex::encode(signature.to_bytes()),
-        })
+        }
     }
 
     /// Verify a baseline's signature
@@ -239,19 +672,36 @@ impl IntegrityScanner {
         }
     }
 
-    /// Scan current state and compare against a baseline
+    /// Scan current state and compare against a baseline, re-hashing every file
     pub fn scan_against_baseline(&self, baseline: &Baseline) -> ScanResult {
-        info!("Running integrity scan against baseline ({} entries)", baseline.entries.len());
-        let (current_entries, errors) = self.collect_entries();
+        self.scan_against_baseline_with(baseline, ScanMode::Full)
+    }
+
+    /// Scan current state and compare against a baseline. `ScanMode::Changed`
+    /// trusts the stamp cache for files that have not moved since they were
+    /// last hashed; callers should still run periodic `Full` scans.
+    pub fn scan_against_baseline_with(&self, baseline: &Baseline, mode: ScanMode) -> ScanResult {
+        info!(
+            ?mode,
+            "Running integrity scan against baseline ({} entries)",
+            baseline.entries.len()
+        );
+        let (current_entries, errors) = match mode {
+            ScanMode::Full => self.collect_entries(),
+            ScanMode::Changed => self.collect_changed_entries(),
+        };
 
         let mut modified = Vec::new();
         let mut added = Vec::new();
-        let mut removed = Vec::new();
-
-        // Check for modified and removed files
-        for (path, expected) in &baseline.entries {
-            match current_entries.get(path) {
-                Some(actual) => {
+        let mut matched = 0usize;
+
+        // Single pass over the current state: every file is either known
+        // (compare hashes) or added. Removed files are the baseline entries
+        // left unmatched, which only needs a second look when counts differ.
+        for (path, actual) in &current_entries {
+            match baseline.entries.get(path) {
+                Some(expected) => {
+                    matched += 1;
                     if actual.hash != expected.hash {
                         modified.push(ModifiedFile {
                             path: path.clone(),
@@ -262,18 +712,20 @@ impl IntegrityScanner {
                         });
                     }
                 }
-                None => {
-                    removed.push(path.clone());
-                }
+                None => added.push(path.clone()),
             }
         }
 
-        // Check for added files
-        for path in current_entries.keys() {
-            if !baseline.entries.contains_key(path) {
-                added.push(path.clone());
-            }
-        }
+        let removed: Vec<String> = if matched == baseline.entries.len() {
+            Vec::new()
+        } else {
+            baseline
+                .entries
+                .keys()
+                .filter(|path| !current_entries.contains_key(*path))
+                .cloned()
+                .collect()
+        };
 
         let valid = modified.is_empty() && removed.is_empty();
         let total_files = current_entries.len();
@@ -298,10 +750,11 @@ impl IntegrityScanner {
         }
     }
 
-    /// Save baseline to disk as JSON
+    /// Save baseline to disk as compact JSON, streamed straight to the file
     pub fn save_baseline(baseline: &Baseline, path: &Path) -> Result<()> {
-        let json = serde_json::to_string_pretty(baseline)?;
-        fs::write(path, json)?;
+        let mut writer = BufWriter::new(fs::File::create(path)?);
+        serde_json::to_writer(&mut writer, baseline)?;
+        writer.flush()?;
         debug!("Baseline saved to {}", path.display());
         Ok(())
     }
@@ -315,6 +768,40 @@ impl IntegrityScanner {
     }
 }
 
+/// Run `f` over `items` on a bounded pool of scoped worker threads. Workers
+/// pull the next index from a shared counter, so one slow item (a large file,
+/// a stalled mount) never holds up a statically assigned chunk. Results come
+/// back in no particular order.
+fn par_map<'a, T: Sync, R: Send>(items: &'a [T], f: impl Fn(&'a T) -> R + Sync) -> Vec<R> {
+    let workers = thread::available_parallelism()
+        .map(|n| n.get())
+        .unwrap_or(1)
+        .min(items.len());
+    if workers <= 1 {
+        return items.iter().map(f).collect();
+    }
+
+    let next = AtomicUsize::new(0);
+    thread::scope(|scope| {
+        let (next, f) = (&next, &f);
+        let handles: Vec<_> = (0..workers)
+            .map(|_| {
+                scope.spawn(move || {
+                    let mut out = Vec::new();
+                    while let Some(item) = items.get(next.fetch_add(1, Ordering::Relaxed)) {
+                        out.push(f(item));
+                    }
+                    out
+                })
+            })
+            .collect();
+        handles
+            .into_iter()
+            .flat_map(|h| h.join().expect("integrity scan worker panicked"))
+            .collect()
+    })
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -330,11 +817,64 @@ mod tests {
         let file_path = dir.path().join("test.txt");
         File::create(&file_path).unwrap().write_all(b"hello world").unwrap();
 
-        let (hash, size) = IntegrityScanner::hash_file(&file_path).unwrap();
-        assert_eq!(size, 11);
+        let (hash, metadata) = IntegrityScanner::hash_file(&file_path).unwrap();
+        assert_eq!(metadata.len(), 11);
         assert!(!hash.is_empty());
     }
 
+    #[test]
+    fn test_baseline_with_backups() {
+        let dir = tempdir().unwrap();
+        let protected = dir.path().join("protected");
+        fs::create_dir_all(&protected).unwrap();
+        File::create(protected.join("a.txt")).unwrap().write_all(b"aaa").unwrap();
+        File::create(protected.join("b.txt")).unwrap().write_all(b"bbb").unwrap();
+
+        let signing_key = SigningKey::generate(&mut OsRng);
+        let mut store =
+            BackupStore::load_or_create(dir.path().join("backups"), signing_key.clone(), "test-device").unwrap();
+
+        let scanner = IntegrityScanner::new(vec![protected.clone()], "test-device".into());
+        let baseline = scanner.generate_baseline_with_backups(&signing_key, &mut store).unwrap();
+
+        assert_eq!(baseline.entries.len(), 2);
+        assert!(IntegrityScanner::verify_baseline_signature(&baseline, &signing_key.verifying_key()).unwrap());
+        for entry in baseline.entries.values() {
+            assert_eq!(store.entry_for(&entry.path).unwrap().blob_hash, entry.hash);
+        }
+        store.verify_all().unwrap();
+
+        // A rebaseline after one edit re-reads only the edited file.
+        File::create(protected.join("a.txt")).unwrap().write_all(b"changed").unwrap();
+        let rebased = scanner.generate_baseline_with_backups(&signing_key, &mut store).unwrap();
+        let a = fs::canonicalize(protected.join("a.txt")).unwrap().display().to_string();
+        let b = fs::canonicalize(protected.join("b.txt")).unwrap().display().to_string();
+        assert_ne!(rebased.entries[&a].hash, baseline.entries[&a].hash);
+        assert_eq!(rebased.entries[&b].hash, baseline.entries[&b].hash);
+        assert_eq!(store.entry_for(&a).unwrap().blob_hash, rebased.entries[&a].hash);
+        assert!(IntegrityScanner::verify_baseline_signature(&rebased, &signing_key.verifying_key()).unwrap());
+    }
+
+    #[test]
+    fn test_large_files_are_streamed_into_backups() {
+        let dir = tempdir().unwrap();
+        let protected = dir.path().join("protected");
+        fs::create_dir_all(&protected).unwrap();
+        let data: Vec<u8> = (0..BACKUP_BUFFER_MAX + 1).map(|i| (i % 251) as u8).collect();
+        File::create(protected.join("large.bin")).unwrap().write_all(&data).unwrap();
+
+        let signing_key = SigningKey::generate(&mut OsRng);
+        let mut store =
+            BackupStore::load_or_create(dir.path().join("backups"), signing_key.clone(), "test-device").unwrap();
+        let scanner = IntegrityScanner::new(vec![protected.clone()], "test-device".into());
+        let baseline = scanner.generate_baseline_with_backups(&signing_key, &mut store).unwrap();
+
+        let path = fs::canonicalize(protected.join("large.bin")).unwrap().display().to_string();
+        assert_eq!(baseline.entries[&path].hash, blake3_hex(&data));
+        assert_eq!(baseline.entries[&path].size, data.len() as u64);
+        assert_eq!(store.read_blob_verified(&path, &baseline.entries[&path].hash).unwrap(), data);
+    }
+
     #[test]
     fn test_baseline_roundtrip() {
         let dir = tempdir().unwrap();
@@ -363,4 +903,54 @@ mod tests {
         assert!(!result.valid);
         assert_eq!(result.modified.len(), 1);
     }
+
+    #[test]
+    fn test_changed_scan_uses_stamp_cache() {
+        let dir = tempdir().unwrap();
+        File::create(dir.path().join("a.txt")).unwrap().write_all(b"aaa").unwrap();
+        File::create(dir.path().join("b.txt")).unwrap().write_all(b"bbb").unwrap();
+
+        let signing_key = SigningKey::generate(&mut OsRng);
+        let scanner = IntegrityScanner::new(vec![dir.path().to_path_buf()], "test-device".into());
+        let baseline = scanner.generate_baseline(&signing_key).unwrap();
+        assert_eq!(scanner.stamps.lock().len(), 2);
+
+        let result = scanner.scan_against_baseline_with(&baseline, ScanMode::Changed);
+        assert!(result.valid);
+        assert_eq!(result.total_files, 2);
+
+        // A watcher report drops the stamp; the next pass re-hashes and
+        // records it again.
+        scanner.forget(&fs::canonicalize(dir.path().join("b.txt")).unwrap());
+        assert_eq!(scanner.stamps.lock().len(), 1);
+        let result = scanner.scan_against_baseline_with(&baseline, ScanMode::Changed);
+        assert!(result.valid);
+        assert_eq!(scanner.stamps.lock().len(), 2);
+
+        // A rewrite with different length moves the stamp and is re-hashed.
+        File::create(dir.path().join("a.txt")).unwrap().write_all(b"MODIFIED").unwrap();
+        let result = scanner.scan_against_baseline_with(&baseline, ScanMode::Changed);
+        assert_eq!(result.modified.len(), 1);
+
+        fs::remove_file(dir.path().join("b.txt")).unwrap();
+        let result = scanner.scan_against_baseline_with(&baseline, ScanMode::Changed);
+        assert_eq!(result.removed.len(), 1);
+    }
+
+    #[test]
+    fn test_current_hash_records_stamp() {
+        let dir = tempdir().unwrap();
+        let path = dir.path().join("a.txt");
+        File::create(&path).unwrap().write_all(b"aaa").unwrap();
+        let path = fs::canonicalize(&path).unwrap();
+
+        let scanner = IntegrityScanner::new(vec![dir.path().to_path_buf()], "test-device".into());
+        let hash = scanner.current_hash(&path).unwrap();
+        assert_eq!(hash, blake3_hex(b"aaa"));
+        assert_eq!(scanner.stamps.lock().len(), 1);
+        assert_eq!(scanner.current_hash(&path).unwrap(), hash);
+
+        File::create(&path).unwrap().write_all(b"MODIFIED").unwrap();
+        assert_eq!(scanner.current_hash(&path).unwrap(), blake3_hex(b"MODIFIED"));
+    }
 }
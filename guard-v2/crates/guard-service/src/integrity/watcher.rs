@@ -1,16 +1,45 @@
 //! Real-time file system watcher using the `notify` crate.
 //!
-//! Watches protected paths for changes and sends events through a channel
-//! to be processed by the integrity scanner.
+//! Watches protected paths for changes and hands them to the integrity
+//! pipeline over a bounded queue. Events are classified and queued directly
+//! on the notify backend's own thread; a full queue drops the change rather
+//! than stalling that thread, and the audit loop catches whatever was lost.
+//!
+//! Protected directories get one recursive watch each. Protected files are
+//! watched through their parent directory – one watch per directory no matter
+//! how many protected files it holds, and one that survives editors replacing
+//! the file by rename – and events for unprotected siblings are dropped here.
+//!
+//! Changes to files matching the configured ignore patterns are dropped here
+//! too, with one file-name test, before they cost the pipeline a queue slot,
+//! a debounce entry or a hash – unless the file is in the baseline, whose
+//! files are always checked. The restore engine's staging files are dropped
+//! only while the engine is writing them: a file that merely carries the
+//! staging prefix is checked like any other.
+//!
+//! Paths on network or non-NTFS volumes (and every path when
+//! `force_polling` is set) go to a `PollWatcher` instead, because native
+//! notifications there can drop events without reporting an error.
 
+use crate::enforcement::restore::STAGING_PREFIX;
+use crate::integrity::scanner::Baseline;
 use anyhow::Result;
-use notify::{Config, Event, EventKind, RecommendedWatcher, RecursiveMode, Watcher};
-use std::path::PathBuf;
-use std::sync::mpsc;
+use notify::{Config, Event, EventKind, PollWatcher, RecommendedWatcher, RecursiveMode, Watcher};
+use parking_lot::{Mutex, RwLock};
+use std::collections::{HashMap, HashSet};
+use std::path::{Path, PathBuf};
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::Arc;
 use std::time::Duration;
-use tokio::sync::broadcast;
+use tokio::sync::mpsc;
 use tracing::{info, warn, error, debug};
 
+/// How often the polling backend rescans the paths it owns.
+const POLL_INTERVAL: Duration = Duration::from_secs(2);
+
+/// Capacity of the watcher → pipeline queue.
+const CHANGE_QUEUE: usize = 8192;
+
 /// Types of file changes we care about
 #[derive(Debug, Clone)]
 pub enum FileChange {
@@ -21,59 +50,140 @@ pub enum FileChange {
     PermissionChanged(PathBuf),
 }
 
+/// Loads the current baseline, as handed to the pipeline.
+pub type BaselineFn = Arc<dyn Fn() -> Option<Arc<Baseline>> + Send + Sync>;
+
+/// File names whose changes are not worth checking unless the file is in the
+/// baseline, split once into prefix, suffix and exact-name tests.
+#[derive(Default)]
+struct IgnoreRules {
+    prefixes: Vec<String>,
+    suffixes: Vec<String>,
+    names: HashSet<String>,
+}
+
+impl IgnoreRules {
+    /// `*.swp` ignores by suffix, `.#*` by prefix, anything else by exact
+    /// name.
+    fn new(patterns: &[String]) -> Self {
+        let mut rules = Self::default();
+        for pattern in patterns {
+            if let Some(suffix) = pattern.strip_prefix('*') {
+                rules.suffixes.push(suffix.to_string());
+            } else if let Some(prefix) = pattern.strip_suffix('*') {
+                rules.prefixes.push(prefix.to_string());
+            } else {
+                rules.names.insert(pattern.clone());
+            }
+        }
+        rules
+    }
+
+    fn matches(&self, name: &str) -> bool {
+        self.prefixes.iter().any(|p| name.starts_with(p.as_str()))
+            || self.suffixes.iter().any(|s| name.ends_with(s.as_str()))
+            || self.names.contains(name)
+    }
+}
+
+/// Which raw event paths belong to protected paths
+#[derive(Default)]
+struct WatchIndex {
+    /// Protected directories, each watched recursively. A set, so whether a
+    /// path lies under one is a lookup per ancestor of the path rather than
+    /// a prefix compare per root.
+    roots: HashSet<PathBuf>,
+    /// Protected files, watched through their parent directory.
+    files: HashSet<PathBuf>,
+    /// Parent directories watched non-recursively → protected files in them.
+    dirs: HashMap<PathBuf, usize>,
+    ignore: IgnoreRules,
+    /// The current baseline; a baselined file is never ignored.
+    baseline: Option<BaselineFn>,
+    /// The restore engine's in-flight set: the targets it is restoring and
+    /// the staging files it is writing them through.
+    restoring: Arc<Mutex<HashSet<PathBuf>>>,
+}
+
+impl WatchIndex {
+    fn under_root(&self, path: &Path) -> bool {
+        path.ancestors().any(|ancestor| self.roots.contains(ancestor))
+    }
+
+    fn covers(&self, path: &Path) -> bool {
+        self.files.contains(path) || (self.under_root(path) && !self.suppressed(path))
+    }
+
+    /// Whether a path under a protected root is dropped by name. Both tests
+    /// start from the file name, so most paths never touch a lock.
+    fn suppressed(&self, path: &Path) -> bool {
+        let Some(name) = path.file_name().and_then(|n| n.to_str()) else {
+            return false;
+        };
+        if name.starts_with(STAGING_PREFIX) && self.restoring.lock().contains(path) {
+            return true;
+        }
+        self.ignore.matches(name) && !self.baselined(path)
+    }
+
+    fn baselined(&self, path: &Path) -> bool {
+        self.baseline
+            .as_ref()
+            .and_then(|load| load())
+            .is_some_and(|baseline| baseline.entries.contains_key(&path.display().to_string()))
+    }
+}
+
 /// FileWatcher watches protected directories for changes
 pub struct FileWatcher {
     watcher: RecommendedWatcher,
-    change_tx: broadcast::Sender<FileChange>,
+    /// Created on first use; publishes through the same handler as `watcher`.
+    poller: Option<PollWatcher>,
+    force_polling: bool,
+    /// Watch paths handed to `poller` rather than `watcher`.
+    polled: HashSet<PathBuf>,
+    change_tx: mpsc::Sender<FileChange>,
+    /// Changes dropped because the pipeline queue was full.
+    dropped: Arc<AtomicU64>,
+    index: Arc<RwLock<WatchIndex>>,
 }
 
 impl FileWatcher {
-    /// Create a new FileWatcher
-    pub fn new() -> Result<(Self, broadcast::Receiver<FileChange>)> {
-        let (change_tx, change_rx) = broadcast::channel(1024);
-        let tx = change_tx.clone();
-
-        let (sync_tx, sync_rx) = mpsc::channel::<Result<Event, notify::Error>>();
+    /// Create a new FileWatcher. With `force_polling` every path is watched
+    /// by polling; otherwise only paths on volumes where native events are
+    /// unreliable are. Changes to files matching `ignore_patterns` inside
+    /// protected directories are dropped unless `baseline` holds the file,
+    /// and changes to restore staging files only while `restoring` (the
+    /// restore engine's in-flight set) holds them.
+    pub fn new(
+        force_polling: bool,
+        ignore_patterns: &[String],
+        baseline: BaselineFn,
+        restoring: Arc<Mutex<HashSet<PathBuf>>>,
+    ) -> Result<(Self, mpsc::Receiver<FileChange>)> {
+        let (change_tx, change_rx) = mpsc::channel(CHANGE_QUEUE);
+        let dropped = Arc::new(AtomicU64::new(0));
+        let index = Arc::new(RwLock::new(WatchIndex {
+            ignore: IgnoreRules::new(ignore_patterns),
+            baseline: Some(baseline),
+            restoring,
+            ..WatchIndex::default()
+        }));
 
         let watcher = RecommendedWatcher::new(
-            move |res| {
-                let _ = sync_tx.send(res);
-            },
-            Config::default()
-                .with_poll_interval(Duration::from_secs(2)),
+            event_handler(index.clone(), change_tx.clone(), dropped.clone()),
+            Config::default().with_poll_interval(POLL_INTERVAL),
         )?;
 
-        // Spawn thread to bridge sync notify events to async broadcast
-        let tx_clone = tx.clone();
-        std::thread::Builder::new()
-            .name("file-watcher-bridge".into())
-            .spawn(move || {
-                loop {
-                    match sync_rx.recv() {
-                        Ok(Ok(event)) => {
-                            let changes = classify_event(&event);
-                            for change in changes {
-                                if tx_clone.send(change).is_err() {
-                                    debug!("All receivers dropped, stopping watcher bridge");
-                                    return;
-                                }
-                            }
-                        }
-                        Ok(Err(e)) => {
-                            error!("File watcher error: {}", e);
-                        }
-                        Err(_) => {
-                            debug!("Watcher channel closed");
-                            return;
-                        }
-                    }
-                }
-            })?;
-
         Ok((
             Self {
                 watcher,
-                change_tx: tx,
+                poller: None,
+                force_polling,
+                polled: HashSet::new(),
+                change_tx,
+                dropped,
+                index,
             },
             change_rx,
         ))
@@ -81,17 +191,55 @@ impl FileWatcher {
 
     /// Start watching a list of paths
     pub fn watch_paths(&mut self, paths: &[PathBuf]) -> Result<()> {
-        for path in paths {
-            if path.exists() {
-                let mode = if path.is_dir() {
-                    RecursiveMode::Recursive
-                } else {
-                    RecursiveMode::NonRecursive
-                };
-                self.watcher.watch(path, mode)?;
+        // Resolve each path once here. The backends report event paths
+        // beneath the path as it was watched, so with canonical watch paths
+        // every event path already matches the canonical baseline keys and
+        // the pipeline never has to realpath an event.
+        let mut paths: Vec<PathBuf> = paths
+            .iter()
+            .filter_map(|path| match path.canonicalize() {
+                Ok(p) => Some(p),
+                Err(_) => {
+                    warn!("Path does not exist, cannot watch: {}", path.display());
+                    None
+                }
+            })
+            .collect();
+        // Shallowest first, so a directory nested inside another protected
+        // directory is recognised as already covered.
+        paths.sort_by_key(|p| p.components().count());
+
+        // The index lock is never held across a backend call: the backend's
+        // event thread takes the read lock in `event_handler`, and a watch
+        // call may wait on that thread.
+        for path in &paths {
+            if path.is_dir() {
+                {
+                    let mut index = self.index.write();
+                    if index.under_root(path) {
+                        debug!("Already watched via a parent: {}", path.display());
+                        continue;
+                    }
+                    index.roots.insert(path.clone());
+                }
+                self.watch_one(path, RecursiveMode::Recursive)?;
                 info!("Watching: {}", path.display());
             } else {
-                warn!("Path does not exist, cannot watch: {}", path.display());
+                let watch_parent = {
+                    let mut index = self.index.write();
+                    if !index.files.insert(path.clone()) {
+                        continue;
+                    }
+                    let Some(parent) = path.parent() else { continue };
+                    let count = index.dirs.entry(parent.to_path_buf()).or_insert(0);
+                    *count += 1;
+                    (*count == 1 && !index.under_root(path)).then(|| parent.to_path_buf())
+                };
+                if let Some(parent) = watch_parent {
+                    self.watch_one(&parent, RecursiveMode::NonRecursive)?;
+                    debug!("Watching directory: {}", parent.display());
+                }
+                info!("Watching: {}", path.display());
             }
         }
         Ok(())
@@ -99,54 +247,325 @@ impl FileWatcher {
 
     /// Stop watching a path
     pub fn unwatch(&mut self, path: &PathBuf) -> Result<()> {
-        self.watcher.unwatch(path)?;
+        // Watched paths are stored canonical; a path that has since vanished
+        // can only be matched as given.
+        let path = &path.canonicalize().unwrap_or_else(|_| path.clone());
+        let target = {
+            let mut index = self.index.write();
+            if index.roots.remove(path) {
+                Some(path.clone())
+            } else if index.files.remove(path) {
+                let parent = path.parent().map(Path::to_path_buf);
+                match parent.as_ref().and_then(|p| index.dirs.get_mut(p)) {
+                    Some(count) if *count > 1 => {
+                        *count -= 1;
+                        None
+                    }
+                    Some(_) => {
+                        if let Some(p) = &parent {
+                            index.dirs.remove(p);
+                        }
+                        parent.filter(|_| !index.under_root(path))
+                    }
+                    None => None,
+                }
+            } else {
+                None
+            }
+        };
+        if let Some(target) = target {
+            self.unwatch_one(&target)?;
+        }
         Ok(())
     }
 
-    /// Get a new receiver for file changes
-    pub fn subscribe(&self) -> broadcast::Receiver<FileChange> {
-        self.change_tx.subscribe()
+    fn watch_one(&mut self, path: &Path, mode: RecursiveMode) -> Result<()> {
+        if !self.force_polling && !needs_polling(path) {
+            self.watcher.watch(path, mode)?;
+            return Ok(());
+        }
+        let poller = match &mut self.poller {
+            Some(poller) => poller,
+            None => self.poller.insert(PollWatcher::new(
+                event_handler(self.index.clone(), self.change_tx.clone(), self.dropped.clone()),
+                Config::default().with_poll_interval(POLL_INTERVAL),
+            )?),
+        };
+        poller.watch(path, mode)?;
+        self.polled.insert(path.to_path_buf());
+        info!("Polling for changes: {}", path.display());
+        Ok(())
     }
-}
-
-/// Classify a notify event into our FileChange types
-fn classify_event(event: &Event) -> Vec<FileChange> {
-    let mut changes = Vec::new();
 
-    match &event.kind {
-        EventKind::Create(_) => {
-            for path in &event.paths {
-                changes.push(FileChange::Created(path.clone()));
+    fn unwatch_one(&mut self, path: &Path) -> Result<()> {
+        if self.polled.remove(path) {
+            if let Some(poller) = &mut self.poller {
+                poller.unwatch(path)?;
             }
+        } else {
+            self.watcher.unwatch(path)?;
         }
-        EventKind::Modify(modify_kind) => {
-            use notify::event::ModifyKind;
-            match modify_kind {
-                ModifyKind::Name(_) if event.paths.len() >= 2 => {
-                    changes.push(FileChange::Renamed {
-                        from: event.paths[0].clone(),
-                        to: event.paths[1].clone(),
-                    });
-                }
-                ModifyKind::Metadata(_) => {
-                    for path in &event.paths {
-                        changes.push(FileChange::PermissionChanged(path.clone()));
-                    }
-                }
-                _ => {
-                    for path in &event.paths {
-                        changes.push(FileChange::Modified(path.clone()));
-                    }
+        Ok(())
+    }
+}
+
+/// Whether `path` lives on a filesystem whose native change notifications
+/// are unreliable: network mounts, plus non-NTFS/ReFS volumes on Windows.
+#[cfg(target_os = "linux")]
+fn needs_polling(path: &Path) -> bool {
+    use std::mem::MaybeUninit;
+    use std::os::unix::ffi::OsStrExt;
+
+    const NFS_SUPER_MAGIC: u32 = 0x6969;
+    const SMB_SUPER_MAGIC: u32 = 0x517B;
+    const CIFS_MAGIC_NUMBER: u32 = 0xFF53_4D42;
+    const SMB2_MAGIC_NUMBER: u32 = 0xFE53_4D42;
+
+    let Ok(c_path) = std::ffi::CString::new(path.as_os_str().as_bytes()) else {
+        return false;
+    };
+    let mut stat = MaybeUninit::<libc::statfs>::uninit();
+    if unsafe { libc::statfs(c_path.as_ptr(), stat.as_mut_ptr()) } != 0 {
+        return false;
+    }
+    // f_type's width differs between targets; every magic fits in 32 bits.
+    let fs_type = unsafe { stat.assume_init() }.f_type as u32;
+    matches!(
+        fs_type,
+        NFS_SUPER_MAGIC | SMB_SUPER_MAGIC | CIFS_MAGIC_NUMBER | SMB2_MAGIC_NUMBER
+    )
+}
+
+#[cfg(windows)]
+fn needs_polling(path: &Path) -> bool {
+    use std::os::windows::ffi::OsStrExt;
+    use windows_sys::Win32::Storage::FileSystem::{
+        GetDriveTypeW, GetVolumeInformationW, GetVolumePathNameW,
+    };
+
+    const DRIVE_REMOTE: u32 = 4;
+
+    let wide: Vec<u16> = path.as_os_str().encode_wide().chain(Some(0)).collect();
+    let mut root = [0u16; 261];
+    let mut fs_name = [0u16; 32];
+    let ok = unsafe {
+        GetVolumePathNameW(wide.as_ptr(), root.as_mut_ptr(), root.len() as u32) != 0
+    };
+    if !ok {
+        return false;
+    }
+    if unsafe { GetDriveTypeW(root.as_ptr()) } == DRIVE_REMOTE {
+        return true;
+    }
+    let ok = unsafe {
+        GetVolumeInformationW(
+            root.as_ptr(),
+            std::ptr::null_mut(),
+            0,
+            std::ptr::null_mut(),
+            std::ptr::null_mut(),
+            std::ptr::null_mut(),
+            fs_name.as_mut_ptr(),
+            fs_name.len() as u32,
+        ) != 0
+    };
+    if !ok {
+        return false;
+    }
+    let len = fs_name.iter().position(|&c| c == 0).unwrap_or(fs_name.len());
+    let name = String::from_utf16_lossy(&fs_name[..len]);
+    !(name.eq_ignore_ascii_case("NTFS") || name.eq_ignore_ascii_case("ReFS"))
+}
+
+#[cfg(not(any(target_os = "linux", windows)))]
+fn needs_polling(_path: &Path) -> bool {
+    false
+}
+
+/// The notify callback: classify each raw event against the index and queue
+/// the resulting changes. Queuing never blocks; when the pipeline has fallen
+/// a full queue behind the change is counted and dropped, with a warning at
+/// each power of two so a storm cannot flood the log. A closed queue means
+/// the pipeline has shut down and there is nobody to tell.
+fn event_handler(
+    index: Arc<RwLock<WatchIndex>>,
+    tx: mpsc::Sender<FileChange>,
+    dropped: Arc<AtomicU64>,
+) -> impl FnMut(notify::Result<Event>) + Send + 'static {
+    move |res| match res {
+        Ok(event) => classify_event(event, &index.read(), |change| {
+            if let Err(mpsc::error::TrySendError::Full(_)) = tx.try_send(change) {
+                let total = dropped.fetch_add(1, Ordering::Relaxed) + 1;
+                if total.is_power_of_two() {
+                    warn!(dropped = total, "watcher queue full; dropping changes, audit loop will catch up");
                 }
             }
+        }),
+        Err(e) => error!("File watcher error: {}", e),
+    }
+}
+
+/// How each path of a raw event maps to a `FileChange`, chosen once per
+/// event; `None` for kinds we ignore. Paired renames are handled separately.
+fn change_ctor(kind: &EventKind) -> Option<fn(PathBuf) -> FileChange> {
+    use notify::event::{ModifyKind, RenameMode};
+    Some(match kind {
+        // The destination half of an unpaired move is a new file.
+        EventKind::Create(_) | EventKind::Modify(ModifyKind::Name(RenameMode::To)) => {
+            FileChange::Created
         }
-        EventKind::Remove(_) => {
-            for path in &event.paths {
-                changes.push(FileChange::Removed(path.clone()));
-            }
+        // The source half of an unpaired move is gone. When the backend also
+        // pairs the halves, the `Renamed` event lands on the same debounce
+        // key and supersedes the removal.
+        EventKind::Remove(_) | EventKind::Modify(ModifyKind::Name(RenameMode::From)) => {
+            FileChange::Removed
+        }
+        EventKind::Modify(ModifyKind::Metadata(_)) => FileChange::PermissionChanged,
+        EventKind::Modify(_) => FileChange::Modified,
+        _ => return None,
+    })
+}
+
+/// Classify a notify event into our FileChange types and hand each one to
+/// `emit`, dropping paths that are not protected (siblings of protected
+/// files in a watched directory) or that are suppressed by name. A rename
+/// is kept whole when either end is protected. The event is owned, so its
+/// paths move into the changes uncloned and nothing is buffered.
+fn classify_event(event: Event, index: &WatchIndex, mut emit: impl FnMut(FileChange)) {
+    let Event { kind, paths, .. } = event;
+    if matches!(kind, EventKind::Modify(notify::event::ModifyKind::Name(_))) && paths.len() >= 2 {
+        if !paths.iter().any(|p| index.covers(p)) {
+            return;
         }
-        _ => {}
+        let mut paths = paths.into_iter();
+        if let (Some(from), Some(to)) = (paths.next(), paths.next()) {
+            emit(FileChange::Renamed { from, to });
+        }
+        return;
+    }
+
+    if let Some(ctor) = change_ctor(&kind) {
+        for path in paths.into_iter().filter(|p| index.covers(p)) {
+            emit(ctor(path));
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_index_matches_whole_components() {
+        let mut index = WatchIndex::default();
+        index.roots.insert(PathBuf::from("/srv/protected"));
+        index.files.insert(PathBuf::from("/etc/app.conf"));
+
+        assert!(index.covers(Path::new("/srv/protected")));
+        assert!(index.covers(Path::new("/srv/protected/a/b.txt")));
+        assert!(!index.covers(Path::new("/srv/protected-extra/b.txt")));
+        assert!(index.covers(Path::new("/etc/app.conf")));
+        assert!(!index.covers(Path::new("/etc/app.conf.swp")));
+    }
+
+    #[test]
+    fn test_ignore_rules() {
+        let mut index = WatchIndex {
+            ignore: IgnoreRules::new(&["*.swp".into(), ".#*".into(), "4913".into()]),
+            ..WatchIndex::default()
+        };
+        index.roots.insert(PathBuf::from("/srv/protected"));
+        index.files.insert(PathBuf::from("/srv/protected/keep.swp"));
+
+        assert!(!index.covers(Path::new("/srv/protected/.a.txt.swp")));
+        assert!(!index.covers(Path::new("/srv/protected/.#a.txt")));
+        assert!(!index.covers(Path::new("/srv/protected/4913")));
+        assert!(index.covers(Path::new("/srv/protected/a.txt")));
+        // Explicitly protected files are never ignored.
+        assert!(index.covers(Path::new("/srv/protected/keep.swp")));
+    }
+
+    #[test]
+    fn test_baselined_files_are_never_ignored() {
+        use crate::integrity::scanner::BaselineEntry;
+
+        let tracked = "/srv/protected/.config.swp".to_string();
+        let mut entries = HashMap::new();
+        entries.insert(
+            tracked.clone(),
+            BaselineEntry {
+                path: tracked.clone(),
+                hash: String::new(),
+                size: 0,
+                modified: chrono::Utc::now(),
+                permissions: 0,
+            },
+        );
+        let baseline = Arc::new(Baseline {
+            version: 1,
+            created_at: chrono::Utc::now(),
+            device_id: String::new(),
+            entries,
+            signature: String::new(),
+        });
+        let mut index = WatchIndex {
+            ignore: IgnoreRules::new(&["*.swp".into()]),
+            baseline: Some(Arc::new(move || Some(baseline.clone()))),
+            ..WatchIndex::default()
+        };
+        index.roots.insert(PathBuf::from("/srv/protected"));
+
+        assert!(index.covers(Path::new(&tracked)));
+        assert!(!index.covers(Path::new("/srv/protected/.other.swp")));
+    }
+
+    #[test]
+    fn test_staging_names_suppressed_only_while_restoring() {
+        let mut index = WatchIndex::default();
+        index.roots.insert(PathBuf::from("/srv/protected"));
+        let staging = PathBuf::from("/srv/protected/.darklock_restore_0000abcd");
+        let planted = Path::new("/srv/protected/.darklock_restore_shell.php");
+
+        index.restoring.lock().insert(staging.clone());
+        assert!(!index.covers(&staging));
+        // Same prefix, but not a file the restore engine is writing.
+        assert!(index.covers(planted));
+
+        index.restoring.lock().remove(&staging);
+        assert!(index.covers(&staging));
     }
 
-    changes
+    #[test]
+    fn test_classify_event_kinds() {
+        use notify::event::{CreateKind, MetadataKind, ModifyKind, RenameMode};
+
+        let mut index = WatchIndex::default();
+        index.roots.insert(PathBuf::from("/srv/protected"));
+        let a = PathBuf::from("/srv/protected/a.txt");
+        let b = PathBuf::from("/srv/protected/b.txt");
+        let classify = |event: Event| {
+            let mut out = Vec::new();
+            classify_event(event, &index, |c| out.push(c));
+            out
+        };
+
+        let out = classify(Event::new(EventKind::Create(CreateKind::File)).add_path(a.clone()));
+        assert!(matches!(out.as_slice(), [FileChange::Created(p)] if *p == a));
+
+        let out = classify(
+            Event::new(EventKind::Modify(ModifyKind::Name(RenameMode::Both)))
+                .add_path(a.clone())
+                .add_path(b.clone()),
+        );
+        assert!(matches!(out.as_slice(), [FileChange::Renamed { from, to }] if *from == a && *to == b));
+
+        let out = classify(Event::new(EventKind::Modify(ModifyKind::Name(RenameMode::From))).add_path(a.clone()));
+        assert!(matches!(out.as_slice(), [FileChange::Removed(_)]));
+
+        let out = classify(Event::new(EventKind::Modify(ModifyKind::Metadata(MetadataKind::Permissions))).add_path(a.clone()));
+        assert!(matches!(out.as_slice(), [FileChange::PermissionChanged(_)]));
+
+        let out = classify(Event::new(EventKind::Create(CreateKind::File)).add_path(PathBuf::from("/srv/other/x")));
+        assert!(out.is_empty());
+    }
 }
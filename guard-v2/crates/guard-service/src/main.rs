@@ -1,7 +1,6 @@
 use anyhow::{anyhow, Result};
 use chrono::Utc;
 use clap::{Parser, Subcommand};
-use guard_core::backup_store::BackupStore;
 use guard_core::event_log::{EventLog, EventSeverity};
 use guard_core::ipc::{IpcHandler, IpcRequest, IpcResponse, IpcServer};
 use guard_core::paths::{data_dir, ipc_socket_path, log_dir};
@@ -33,7 +32,10 @@ use crate::integrity::audit_loop::{spawn_audit_loop, AuditLoopHandle};
 use crate::integrity::pipeline::spawn_watcher_pipeline;
 use crate::integrity::scanner::{Baseline, IntegrityScanner};
 use crate::integrity::watcher::FileWatcher;
-use crate::service_state::{CrashTracker, ServiceState};
+use crate::service_state::{CrashTracker, LazyBackupStore, ServiceState};
+
+/// Most tamper events the consumer takes off the channel for one blocking task.
+const TAMPER_BATCH_MAX: usize = 256;
 
 #[derive(Parser, Debug)]
 #[command(author, version, about = "Darklock Guard v2 Service", long_about = None)]
@@ -139,12 +141,17 @@ async fn run_command(data_dir_override: Option<PathBuf>) -> Result<()> {
     let baseline_path = data.join("baseline.json");
 
     // ── Initialize Backup Store ─────────────────────────────────────────
-    let backups_root = data.join("backups");
-    let mut backup_store = BackupStore::load_or_create(
-        &backups_root,
+    // Opened on first use, so a service with nothing protected never loads
+    // it. When paths are protected, open it now: a tampered or foreign
+    // manifest must still stop startup.
+    let backup_store = Arc::new(LazyBackupStore::new(
+        data.join("backups"),
         signing_key_clone.clone(),
-        &vault.payload.device_id,
-    )?;
+        vault.payload.device_id.clone(),
+    ));
+    if scanner.is_some() {
+        backup_store.lock()?;
+    }
 
     // ── Initialize Enforcement Engine ───────────────────────────────────
     let quarantine_root = data.join("quarantine");
@@ -159,32 +166,23 @@ async fn run_command(data_dir_override: Option<PathBuf>) -> Result<()> {
         if baseline_path.exists() {
             Some(IntegrityScanner::load_baseline(&baseline_path)?)
         } else {
-            let baseline = scanner.generate_baseline(&signing_key_clone)?;
+            // Hash and back up each file from a single read.
+            let baseline = scanner
+                .generate_baseline_with_backups(&signing_key_clone, &mut backup_store.lock()?)?;
             IntegrityScanner::save_baseline(&baseline, &baseline_path)?;
             event_log.append(
                 "BASELINE_CREATED",
                 EventSeverity::Info,
                 serde_json::json!({"files": baseline.entries.len()}),
             )?;
-            // Populate backup store from initial baseline
-            for (_key, entry) in &baseline.entries {
-                let p = PathBuf::from(&entry.path);
-                if p.exists() {
-                    if let Err(e) = backup_store.ensure_from_disk(
-                        &p,
-                        &entry.hash,
-                        entry.permissions,
-                        None,
-                    ) {
-                        warn!(path = %entry.path, error = %e, "initial backup failed");
-                    }
-                }
-            }
             Some(baseline)
         }
     } else {
         None
     };
+    // Readers clone the `Arc` out of the lock; a rebaseline publishes a new
+    // snapshot without disturbing the ones already handed out.
+    let baseline_snapshot = Arc::new(parking_lot::RwLock::new(initial_baseline.map(Arc::new)));
 
     // ── Start FileWatcher ───────────────────────────────────────────────
     // Clean up orphaned staging files from a previous crash.
@@ -196,7 +194,8 @@ async fn run_command(data_dir_override: Option<PathBuf>) -> Result<()> {
     let mut watcher_pipeline_handle = None;
     let mut tamper_rx_opt = None;
 
-    if !protected_paths.is_empty() && scanner.is_some() {
+    // The scanner exists exactly when there are protected paths.
+    if let Some(ref scanner) = scanner {
         // Check inotify watch limit on Linux before starting watcher.
         #[cfg(target_os = "linux")]
         {
@@ -223,21 +222,26 @@ async fn run_command(data_dir_override: Option<PathBuf>) -> Result<()> {
                 }
             }
         }
-        if let Ok((mut fw, raw_rx)) = FileWatcher::new() {
+        let protection = engine.settings().protection;
+        let baseline_fn = {
+            let b = baseline_snapshot.clone();
+            Arc::new(move || b.read().clone())
+                as Arc<dyn Fn() -> Option<Arc<Baseline>> + Send + Sync>
+        };
+        if let Ok((mut fw, raw_rx)) = FileWatcher::new(
+            protection.force_polling,
+            &protection.ignore_patterns,
+            baseline_fn.clone(),
+            restore_engine.restoring.clone(),
+        ) {
             if let Err(e) = fw.watch_paths(&protected_paths) {
                 warn!(error = %e, "failed to start file watcher");
             }
 
-            let baseline_for_pipeline = initial_baseline.clone();
-            let baseline_arc = Arc::new(parking_lot::Mutex::new(baseline_for_pipeline));
-            let baseline_fn = {
-                let b = baseline_arc.clone();
-                Arc::new(move || b.lock().clone()) as Arc<dyn Fn() -> Option<Baseline> + Send + Sync>
-            };
-
             let (handle, tamper_tx) = spawn_watcher_pipeline(
                 raw_rx,
                 baseline_fn,
+                Arc::new(scanner.clone()),
                 restore_engine.restoring.clone(),
                 shutdown_rx.clone(),
             );
@@ -248,24 +252,29 @@ async fn run_command(data_dir_override: Option<PathBuf>) -> Result<()> {
     }
 
     // ── Start Audit Loop ────────────────────────────────────────────────
-    // Wrap BackupStore in Arc<Mutex<>> so it can be shared with async tasks.
-    let backup_store = Arc::new(parking_lot::Mutex::new(backup_store));
     let mut audit_loop_handle_opt: Option<AuditLoopHandle> = None;
 
     if let Some(ref scanner) = scanner {
         let scanner_arc = Arc::new(scanner.clone());
-        let bl_path = baseline_path.clone();
-        let baseline_loader: Arc<dyn Fn() -> Option<Baseline> + Send + Sync> =
-            Arc::new(move || IntegrityScanner::load_baseline(&bl_path).ok());
+        let bl_for_loader = baseline_snapshot.clone();
+        let baseline_loader: Arc<dyn Fn() -> Option<Arc<Baseline>> + Send + Sync> =
+            Arc::new(move || bl_for_loader.read().clone());
 
         let engine_for_audit = engine.clone();
         let restore_for_audit = restore_engine.clone();
         let event_log_for_audit = event_log.clone();
-        let bl_for_audit = initial_baseline.clone();
+        let bl_for_audit = baseline_snapshot.clone();
         let backup_for_audit = backup_store.clone();
         let on_result = move |result: crate::integrity::scanner::ScanResult| {
-            if let Some(ref baseline) = bl_for_audit {
-                let store_guard = backup_for_audit.lock();
+            let baseline = bl_for_audit.read().clone();
+            if let Some(ref baseline) = baseline {
+                let store_guard = match backup_for_audit.lock() {
+                    Ok(guard) => guard,
+                    Err(e) => {
+                        warn!(error = %e, "backup store unavailable; skipping audit enforcement");
+                        return;
+                    }
+                };
                 engine_for_audit.handle_scan_result(
                     &result,
                     &restore_for_audit,
@@ -279,6 +288,7 @@ async fn run_command(data_dir_override: Option<PathBuf>) -> Result<()> {
         let (_audit_handle, audit_ctl) = spawn_audit_loop(
             scanner_arc,
             Duration::from_secs(300), // 5 minutes
+            engine.settings().protection.always_rehash,
             baseline_loader,
             on_result,
         );
@@ -303,29 +313,63 @@ async fn run_command(data_dir_override: Option<PathBuf>) -> Result<()> {
         let engine_c = engine.clone();
         let restore_c = restore_engine.clone();
         let event_log_c = event_log.clone();
-        let bl = Arc::new(parking_lot::Mutex::new(initial_baseline.clone()));
+        let bl = baseline_snapshot.clone();
         let backup_c = backup_store.clone();
         let handle = tokio::spawn(async move {
+            use tokio::sync::broadcast::error::{RecvError, TryRecvError};
             loop {
-                match tamper_rx.recv().await {
-                    Ok(event) => {
-                        // Route through the orchestrator for mode-aware enforcement.
-                        let baseline_guard = bl.lock();
-                        if let Some(ref baseline) = *baseline_guard {
-                            let store_guard = backup_c.lock();
-                            engine_c.handle_tamper_event(
-                                &event,
-                                &restore_c,
-                                &store_guard,
-                                baseline,
-                                &event_log_c,
-                            );
-                        }
-                    }
-                    Err(tokio::sync::broadcast::error::RecvError::Lagged(n)) => {
+                let first = match tamper_rx.recv().await {
+                    Ok(event) => event,
+                    Err(RecvError::Lagged(n)) => {
                         warn!(missed = n, "tamper consumer lagged");
+                        continue;
+                    }
+                    Err(RecvError::Closed) => break,
+                };
+                // Take whatever else is already queued so a burst is enforced
+                // in one blocking task; each event is still logged as soon as
+                // it is enforced.
+                let mut batch = vec![first];
+                while batch.len() < TAMPER_BATCH_MAX {
+                    match tamper_rx.try_recv() {
+                        Ok(event) => batch.push(event),
+                        Err(TryRecvError::Lagged(n)) => {
+                            warn!(missed = n, "tamper consumer lagged");
+                        }
+                        Err(_) => break,
                     }
-                    Err(tokio::sync::broadcast::error::RecvError::Closed) => break,
+                }
+
+                // Route through the orchestrator for mode-aware enforcement.
+                // Restores retry with sleeps and sync to disk, so the batch
+                // runs on the blocking pool: the watcher pipeline shares this
+                // runtime and keeps classifying (and queueing) meanwhile.
+                // Batches are still enforced one at a time, in order.
+                let Some(baseline) = bl.read().clone() else { continue };
+                let (engine_c, restore_c, event_log_c, backup_c) = (
+                    engine_c.clone(),
+                    restore_c.clone(),
+                    event_log_c.clone(),
+                    backup_c.clone(),
+                );
+                let enforce = tokio::task::spawn_blocking(move || {
+                    let store_guard = match backup_c.lock() {
+                        Ok(guard) => guard,
+                        Err(e) => {
+                            warn!(error = %e, "backup store unavailable; skipping tamper enforcement");
+                            return;
+                        }
+                    };
+                    engine_c.handle_tamper_events(
+                        &batch,
+                        &restore_c,
+                        &store_guard,
+                        &baseline,
+                        &event_log_c,
+                    );
+                });
+                if let Err(e) = enforce.await {
+                    warn!(error = %e, "tamper enforcement task failed");
                 }
             }
         });
@@ -349,6 +393,7 @@ async fn run_command(data_dir_override: Option<PathBuf>) -> Result<()> {
         scanner,
         signing_key: signing_key_clone,
         baseline_path,
+        baseline: baseline_snapshot,
         data_dir: data.clone(),
         backup_store: backup_store.clone(),
         restore_engine: restore_engine.clone(),
@@ -393,10 +438,12 @@ async fn run_command(data_dir_override: Option<PathBuf>) -> Result<()> {
     };
 
     // Log service start
+    let hash_backend = crate::integrity::scanner::hash_backend();
+    info!(hash_backend, "integrity hash backend selected");
     event_log.append(
         "SERVICE_START",
         EventSeverity::Info,
-        serde_json::json!({}),
+        serde_json::json!({ "hash_backend": hash_backend }),
     )?;
 
     info!("service started – all subsystems online");
@@ -529,35 +576,48 @@ impl IpcHandler for ServiceHandler {
                 run_updater(&self.updater_path, &args)?;
                 Ok(IpcResponse::UpdateRolledBack)
             }
-            IpcRequest::GetEvents { since, limit } => {
-                let state = self.state.lock();
+            IpcRequest::GetEvents { since, limit, filter } => {
+                let event_log = self.state.lock().event_log.clone();
                 let since_dt = since.and_then(|s| {
                     chrono::DateTime::parse_from_rfc3339(&s)
                         .ok()
                         .map(|dt| dt.with_timezone(&Utc))
                 });
-                let entries = state.event_log.read_recent(since_dt, limit)
-                    .unwrap_or_default();
-                let events: Vec<serde_json::Value> = entries
-                    .into_iter()
-                    .map(|e| serde_json::to_value(e).unwrap_or_default())
-                    .collect();
+                // Reading the log is file I/O plus parsing. It runs on the
+                // blocking pool without the state lock, so a large read
+                // neither stalls the runtime nor holds up other requests.
+                let events = tokio::task::spawn_blocking(move || {
+                    event_log
+                        .read_matching(&filter, since_dt, limit)
+                        .unwrap_or_default()
+                        .into_iter()
+                        .map(|e| serde_json::to_value(e).unwrap_or_default())
+                        .collect::<Vec<serde_json::Value>>()
+                })
+                .await?;
                 Ok(IpcResponse::Events { events })
             }
             IpcRequest::TriggerScan => {
                 let state = self.state.lock();
                 if let Some(ref scanner) = state.scanner {
-                    let baseline = if state.baseline_path.exists() {
-                        IntegrityScanner::load_baseline(&state.baseline_path)?
-                    } else {
-                        let baseline = scanner.generate_baseline(&state.signing_key)?;
-                        IntegrityScanner::save_baseline(&baseline, &state.baseline_path)?;
-                        state.event_log.append(
-                            "BASELINE_CREATED",
-                            EventSeverity::Info,
-                            serde_json::json!({"files": baseline.entries.len()}),
-                        )?;
-                        baseline
+                    let current = state.baseline.read().clone();
+                    let baseline = match current {
+                        Some(baseline) => baseline,
+                        None => {
+                            let mut store_guard = state.backup_store.lock()?;
+                            let baseline = scanner
+                                .generate_baseline_with_backups(&state.signing_key, &mut store_guard)?;
+                            drop(store_guard);
+                            IntegrityScanner::save_baseline(&baseline, &state.baseline_path)?;
+                            state.event_log.append(
+                                "BASELINE_CREATED",
+                                EventSeverity::Info,
+                                serde_json::json!({"files": baseline.entries.len()}),
+                            )?;
+                            let baseline = Arc::new(baseline);
+                            *state.baseline.write() = Some(baseline.clone());
+                            baseline
+                        }
                     };
                     let result = scanner.scan_against_baseline(&baseline);
                     if !result.valid {
@@ -599,7 +659,7 @@ impl IpcHandler for ServiceHandler {
             IpcRequest::MaintenanceExit { rebaseline } => {
                 let mut state = self.state.lock();
                 let st = &mut *state;
-                let mut store_guard = st.backup_store.lock();
+                let mut store_guard = st.backup_store.lock()?;
                 let new_bl = st.engine.exit_maintenance(
                     rebaseline,
                     st.scanner.as_ref(),
@@ -609,9 +669,11 @@ impl IpcHandler for ServiceHandler {
                     &st.event_log,
                     &st.data_dir,
                 )?;
-                Ok(IpcResponse::MaintenanceExited {
-                    rebaselined: new_bl.is_some(),
-                })
+                let rebaselined = new_bl.is_some();
+                if let Some(baseline) = new_bl {
+                    *st.baseline.write() = Some(Arc::new(baseline));
+                }
+                Ok(IpcResponse::MaintenanceExited { rebaselined })
             }
             IpcRequest::SetProtectedPaths { paths } => {
                 let mut state = self.state.lock();
@@ -627,9 +689,15 @@ impl IpcHandler for ServiceHandler {
                 let mut state = self.state.lock();
                 let st = &mut *state;
                 if let Some(ref scanner) = st.scanner {
-                    let baseline = scanner.generate_baseline(&st.signing_key)?;
+                    // Back up every file in the same read that hashes it, so
+                    // the new baseline can be restored from.
+                    let mut store_guard = st.backup_store.lock()?;
+                    let baseline =
+                        scanner.generate_baseline_with_backups(&st.signing_key, &mut store_guard)?;
+                    drop(store_guard);
                     IntegrityScanner::save_baseline(&baseline, &st.baseline_path)?;
                     let entries = baseline.entries.len();
+                    *st.baseline.write() = Some(Arc::new(baseline));
                     st.event_log.append(
                         "BASELINE_CREATED",
                         EventSeverity::Info,
@@ -672,11 +740,10 @@ impl IpcHandler for ServiceHandler {
             IpcRequest::RestoreNow { path } => {
                 let state = self.state.lock();
                 let target = PathBuf::from(&path);
-                if state.baseline_path.exists() {
-                    let baseline =
-                        IntegrityScanner::load_baseline(&state.baseline_path)?;
+                let current = state.baseline.read().clone();
+                if let Some(baseline) = current {
                     if let Some(entry) = baseline.entries.get(&path) {
-                        let store_guard = state.backup_store.lock();
+                        let store_guard = state.backup_store.lock()?;
                         let outcome =
                             state.restore_engine.restore_file(&target, entry, &store_guard);
                         let outcome_str = format!("{:?}", outcome);
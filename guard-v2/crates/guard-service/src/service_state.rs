@@ -5,7 +5,7 @@ use guard_core::device_state::RemoteActivityStatus;
 use guard_core::event_log::EventLog;
 use guard_core::safe_mode::SafeModeState;
 use guard_core::vault::Vault;
-use parking_lot::Mutex as ParkMutex;
+use parking_lot::{MappedMutexGuard, Mutex as ParkMutex, MutexGuard, RwLock as ParkRwLock};
 use std::path::PathBuf;
 use std::sync::Arc;
 use zeroize::Zeroizing;
@@ -13,7 +13,7 @@ use zeroize::Zeroizing;
 use crate::enforcement::restore::RestoreEngine;
 use crate::engine::Engine;
 use crate::integrity::audit_loop::AuditLoopHandle;
-use crate::integrity::scanner::IntegrityScanner;
+use crate::integrity::scanner::{Baseline, IntegrityScanner};
 
 // All fields are accessed through `Arc<Mutex<ServiceState>>` in the IPC handler
 // and connected module. The dead_code lint cannot see through the Mutex.
@@ -33,12 +33,52 @@ pub(crate) struct ServiceState {
     pub(crate) scanner: Option<IntegrityScanner>,
     pub(crate) signing_key: SigningKey,
     pub(crate) baseline_path: PathBuf,
+    /// Current baseline, shared with the watcher pipeline, the tamper
+    /// consumer and the audit loop.
+    pub(crate) baseline: Arc<ParkRwLock<Option<Arc<Baseline>>>>,
     pub(crate) data_dir: PathBuf,
-    pub(crate) backup_store: Arc<ParkMutex<BackupStore>>,
+    pub(crate) backup_store: Arc<LazyBackupStore>,
     pub(crate) restore_engine: Arc<RestoreEngine>,
     pub(crate) audit_loop_handle: Option<AuditLoopHandle>,
 }
 
+/// Backup store that is opened on first use. With nothing protected,
+/// startup skips reading the manifest, checking its signature, and
+/// replaying the journal.
+pub(crate) struct LazyBackupStore {
+    root: PathBuf,
+    signing_key: SigningKey,
+    device_id: String,
+    store: ParkMutex<Option<BackupStore>>,
+}
+
+impl LazyBackupStore {
+    pub fn new(root: PathBuf, signing_key: SigningKey, device_id: String) -> Self {
+        Self {
+            root,
+            signing_key,
+            device_id,
+            store: ParkMutex::new(None),
+        }
+    }
+
+    /// Lock the store, opening it first if this is the first use. Returns an
+    /// error if the store cannot be loaded. A later call tries again.
+    pub fn lock(&self) -> anyhow::Result<MappedMutexGuard<'_, BackupStore>> {
+        let mut guard = self.store.lock();
+        if guard.is_none() {
+            *guard = Some(BackupStore::load_or_create(
+                &self.root,
+                self.signing_key.clone(),
+                &self.device_id,
+            )?);
+        }
+        Ok(MutexGuard::map(guard, |store| {
+            store.as_mut().expect("backup store opened above")
+        }))
+    }
+}
+
 #[allow(dead_code)]
 #[derive(Debug, Clone)]
 pub(crate) struct RemoteCommandRecord {
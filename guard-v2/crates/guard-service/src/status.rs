@@ -9,6 +9,8 @@ use tokio::task::JoinHandle;
 
 #[cfg(unix)]
 use tokio::{io::AsyncWriteExt, net::UnixListener};
+#[cfg(unix)]
+use tracing::{error, warn};
 
 /// IPC transport: Unix domain socket (local-only). Path is derived from `status_socket_path()`.
 #[cfg(unix)]
@@ -32,26 +34,26 @@ pub fn spawn_status_server(state: Arc<Mutex<ServiceState>>) -> Result<JoinHandle
                     let bytes = match snapshot_state(&state) {
                         Ok(device_state) => {
                             serde_json::to_vec(&device_state).unwrap_or_else(|e| {
-                                eprintln!("status serialize error: {e}");
+                                error!(error = %e, "status serialize failed");
                                 format!(r#"{{"error":"serialization failed: {e}"}}"#, e = e).into_bytes()
                             })
                         }
                         Err(err) => {
                             let error_json = DeviceState::error(&format!("invalid state: {err}"));
                             serde_json::to_vec(&error_json).unwrap_or_else(|e| {
-                                eprintln!("status error serialize failed: {e}");
+                                error!(error = %e, "status error serialize failed");
                                 format!(r#"{{"error":"state error: {}"}}"#, err).into_bytes()
                             })
                         }
                     };
 
                     if let Err(e) = stream.write_all(&bytes).await {
-                        eprintln!("status write error: {e}");
+                        warn!(error = %e, "status write failed");
                     }
                     let _ = stream.shutdown().await;
                 }
                 Err(err) => {
-                    eprintln!("status ipc accept error: {err}");
+                    error!(error = %err, "status ipc accept failed");
                     break;
                 }
             }
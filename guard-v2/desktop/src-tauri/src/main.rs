@@ -5,6 +5,7 @@
 
 use guard_core::{
     device_state::DeviceState,
+    event_log::{event_detail, EventFilter},
     ipc::{IpcRequest, IpcResponse},
     ipc_client::send_request,
     paths::{data_dir, ipc_socket_path},
@@ -14,6 +15,7 @@ use guard_core::{
     vault::{SecurityProfile, Vault},
 };
 use serde::{Deserialize, Serialize};
+use tauri::{Emitter, Manager};
 
 mod status_client;
 
@@ -95,30 +97,55 @@ fn format_safe_mode_reason(reason: &SafeModeReason) -> String {
     .to_string()
 }
 
+/// The IPC secret last resolved, with the device it belongs to. Resolving
+/// it means a keyring call and possibly a vault unlock, so it is done once
+/// per device rather than once per request.
+static IPC_SECRET: std::sync::Mutex<Option<(String, Vec<u8>)>> = std::sync::Mutex::new(None);
+
 async fn ipc_settings_request(request: IpcRequest) -> Result<IpcResponse, String> {
+    // Also the reachability check: a stopped service fails here, before any
+    // secret lookup.
     let state = status_client::fetch_device_state()
         .await
         .map_err(|_| "Guard service unavailable".to_string())?;
     let device_id = state
         .device_id
         .ok_or_else(|| "Device ID unavailable".to_string())?;
-    
-    // Try to get IPC secret from keyring, fallback to loading from vault
-    let secret = match get_ipc_secret(&device_id) {
-        Ok(s) => s,
-        Err(e) => {
-            eprintln!("⚠️  Failed to load IPC secret from keyring: {}. Attempting vault fallback...", e);
-            // Fallback: load secret directly from vault
-            load_ipc_secret_from_vault()?
-        }
-    };
-    
+    let secret = ipc_secret(device_id).await?;
+
     let socket_path = ipc_socket_path().map_err(|e| e.to_string())?;
     send_request(socket_path, &secret, request)
         .await
         .map_err(|e| e.to_string())
 }
 
+async fn ipc_secret(device_id: String) -> Result<Vec<u8>, String> {
+    if let Some((cached_for, secret)) = IPC_SECRET.lock().unwrap().as_ref() {
+        if *cached_for == device_id {
+            return Ok(secret.clone());
+        }
+    }
+
+    // Try to get IPC secret from keyring, fallback to loading from vault.
+    // Both are blocking (the keyring is a platform call, opening the vault
+    // runs its key derivation), so they run off the async workers that serve
+    // the UI's other commands.
+    let lookup_id = device_id.clone();
+    let secret = tokio::task::spawn_blocking(move || match get_ipc_secret(&lookup_id) {
+        Ok(s) => Ok(s),
+        Err(e) => {
+            eprintln!("⚠️  Failed to load IPC secret from keyring: {}. Attempting vault fallback...", e);
+            // Fallback: load secret directly from vault
+            load_ipc_secret_from_vault()
+        }
+    })
+    .await
+    .map_err(|e| format!("IPC secret lookup failed: {}", e))??;
+
+    *IPC_SECRET.lock().unwrap() = Some((device_id, secret.clone()));
+    Ok(secret)
+}
+
 fn load_ipc_secret_from_vault() -> Result<Vec<u8>, String> {
     use std::env;
     let dir = data_dir().map_err(|e| format!("Failed to get data dir: {}", e))?;
@@ -206,60 +233,59 @@ async fn get_capabilities() -> Result<serde_json::Value, String> {
     serde_json::to_value(caps).map_err(|e| e.to_string())
 }
 
+/// How often new service events are collected and pushed to the UI.
+const EVENT_FLUSH_INTERVAL: std::time::Duration = std::time::Duration::from_secs(1);
+
+/// Tauri event carrying each batch of new service events, newest first.
+const GUARD_EVENTS: &str = "guard-events";
+
+/// Most events one `get_events` request returns.
+const EVENT_PAGE: usize = 200;
+
+/// Longest pause, in flush intervals, between forwarder attempts while the
+/// service keeps failing.
+const EVENT_RETRY_MAX_TICKS: u32 = 32;
+
+/// Fetch recent service events (newest first) in the frontend format. The
+/// service applies `filter` while it reads the log.
+async fn fetch_events(
+    since: Option<String>,
+    filter: EventFilter,
+) -> Result<Vec<serde_json::Value>, String> {
+    let request = IpcRequest::GetEvents { since, limit: Some(EVENT_PAGE), filter };
+    match ipc_settings_request(request).await? {
+        IpcResponse::Events { events } => Ok(events.into_iter().map(to_frontend_event).collect()),
+        _ => Ok(Vec::new()),
+    }
+}
+
+/// Transform a backend EventEntry into the frontend-compatible format.
+fn to_frontend_event(e: serde_json::Value) -> serde_json::Value {
+    let event_type = e.get("event_type").and_then(|v| v.as_str()).unwrap_or("UNKNOWN").to_string();
+    let severity = e.get("severity").and_then(|v| v.as_str()).unwrap_or("INFO").to_string();
+    let timestamp = e.get("timestamp").and_then(|v| v.as_str()).unwrap_or("").to_string();
+    let data = e.get("data").cloned().unwrap_or(serde_json::json!({}));
+    let seq = e.get("seq").and_then(|v| v.as_u64()).unwrap_or(0);
+    let hash = e.get("hash").and_then(|v| v.as_str()).unwrap_or("").to_string();
+
+    let detail = event_detail(&data);
+
+    serde_json::json!({
+        "event_type": event_type,
+        "severity": severity,
+        "timestamp": timestamp,
+        "data": data,
+        "detail": detail,
+        "seq": seq,
+        "hash": hash,
+    })
+}
+
 #[tauri::command]
-async fn get_events() -> Result<serde_json::Value, String> {
+async fn get_events(filter: Option<EventFilter>) -> Result<serde_json::Value, String> {
     // Try to read events from the guard service via IPC
-    match ipc_settings_request(IpcRequest::GetEvents { since: None, limit: Some(200) }).await {
-        Ok(IpcResponse::Events { events }) => {
-            // Transform backend EventEntry format to frontend-compatible format
-            let transformed: Vec<serde_json::Value> = events.into_iter().map(|e| {
-                let event_type = e.get("event_type").and_then(|v| v.as_str()).unwrap_or("UNKNOWN").to_string();
-                let severity = e.get("severity").and_then(|v| v.as_str()).unwrap_or("INFO").to_string();
-                let timestamp = e.get("timestamp").and_then(|v| v.as_str()).unwrap_or("").to_string();
-                let data = e.get("data").cloned().unwrap_or(serde_json::json!({}));
-                let seq = e.get("seq").and_then(|v| v.as_u64()).unwrap_or(0);
-                let hash = e.get("hash").and_then(|v| v.as_str()).unwrap_or("").to_string();
-                
-                // Build detail string from data
-                let detail = if let Some(obj) = data.as_object() {
-                    let mut parts = Vec::new();
-                    if let Some(path) = obj.get("path").and_then(|v| v.as_str()) {
-                        parts.push(format!("Path: {}", path));
-                    }
-                    if let Some(kind) = obj.get("kind").and_then(|v| v.as_str()) {
-                        parts.push(format!("Type: {}", kind));
-                    }
-                    if let Some(files) = obj.get("files").and_then(|v| v.as_u64()) {
-                        parts.push(format!("{} files", files));
-                    }
-                    if let Some(expected) = obj.get("expected_hash").and_then(|v| v.as_str()) {
-                        parts.push(format!("Expected: {}…", &expected[..12.min(expected.len())]));
-                    }
-                    if let Some(actual) = obj.get("actual_hash").and_then(|v| v.as_str()) {
-                        parts.push(format!("Actual: {}…", &actual[..12.min(actual.len())]));
-                    }
-                    if parts.is_empty() {
-                        serde_json::to_string(&data).unwrap_or_default()
-                    } else {
-                        parts.join(" | ")
-                    }
-                } else {
-                    String::new()
-                };
-                
-                serde_json::json!({
-                    "event_type": event_type,
-                    "severity": severity,
-                    "timestamp": timestamp,
-                    "data": data,
-                    "detail": detail,
-                    "seq": seq,
-                    "hash": hash,
-                })
-            }).collect();
-            Ok(serde_json::json!({ "events": transformed }))
-        }
-        Ok(_) => Ok(serde_json::json!({ "events": [] })),
+    match fetch_events(None, filter.unwrap_or_default()).await {
+        Ok(events) => Ok(serde_json::json!({ "events": events })),
         Err(e) => {
             eprintln!("Failed to fetch events: {}", e);
             Ok(serde_json::json!({ "events": [] }))
@@ -267,6 +293,92 @@ async fn get_events() -> Result<serde_json::Value, String> {
     }
 }
 
+/// Push new service events to the UI instead of having every view poll for
+/// them. Once per flush interval, everything logged since the last batch is
+/// collected and emitted as one `guard-events` payload; quiet intervals emit
+/// nothing. The first pass only records where the log stands, since the UI
+/// loads existing events itself through `get_events`.
+///
+/// Nothing is polled while no window is open. After a failed pass the
+/// forwarder waits twice as many intervals as before (up to
+/// `EVENT_RETRY_MAX_TICKS`), so a stopped service or an unusable secret is
+/// not retried every second.
+fn spawn_event_forwarder(app: tauri::AppHandle) {
+    tauri::async_runtime::spawn(async move {
+        let mut last_seq: Option<u64> = None;
+        let mut since: Option<String> = None;
+        let mut ticks = tokio::time::interval(EVENT_FLUSH_INTERVAL);
+        ticks.set_missed_tick_behavior(tokio::time::MissedTickBehavior::Delay);
+        let mut backoff: u32 = 1;
+        let mut skip: u32 = 0;
+        loop {
+            ticks.tick().await;
+            if app.webview_windows().is_empty() {
+                continue;
+            }
+            if skip > 0 {
+                skip -= 1;
+                continue;
+            }
+            // Service down: keep the cursor and try again later.
+            let Ok(events) = fetch_new_events(since.clone(), last_seq).await else {
+                skip = backoff;
+                backoff = (backoff * 2).min(EVENT_RETRY_MAX_TICKS);
+                continue;
+            };
+            backoff = 1;
+            let batch: Vec<serde_json::Value> = match last_seq {
+                // `since` is inclusive, so events at the cursor's timestamp
+                // come back again and are dropped by sequence number.
+                Some(seen) => events.into_iter().filter(|e| event_seq(e) > seen).collect(),
+                None => {
+                    last_seq = Some(events.iter().map(event_seq).max().unwrap_or(0));
+                    since = events.first().and_then(|e| e["timestamp"].as_str()).map(String::from);
+                    continue;
+                }
+            };
+            if let Some(newest) = batch.first() {
+                last_seq = Some(batch.iter().map(event_seq).max().unwrap_or(0));
+                since = newest["timestamp"].as_str().map(String::from);
+                if let Err(e) = app.emit(GUARD_EVENTS, &batch) {
+                    eprintln!("Failed to push events to UI: {}", e);
+                }
+            }
+        }
+    });
+}
+
+fn event_seq(event: &serde_json::Value) -> u64 {
+    event.get("seq").and_then(|v| v.as_u64()).unwrap_or(0)
+}
+
+/// Everything logged since the cursor, newest first. One request returns at
+/// most `EVENT_PAGE` events, so while a page comes back full and still
+/// newer than `last_seq` the older ones are fetched page by page with
+/// `before_seq` rather than skipped.
+async fn fetch_new_events(
+    since: Option<String>,
+    last_seq: Option<u64>,
+) -> Result<Vec<serde_json::Value>, String> {
+    let mut events = fetch_events(since.clone(), EventFilter::default()).await?;
+    let Some(seen) = last_seq else { return Ok(events) };
+    let mut page_len = events.len();
+    while page_len == EVENT_PAGE {
+        let oldest = events.iter().map(event_seq).min().unwrap_or(0);
+        if oldest <= seen + 1 {
+            break;
+        }
+        let filter = EventFilter {
+            before_seq: Some(oldest),
+            ..EventFilter::default()
+        };
+        let page = fetch_events(since.clone(), filter).await?;
+        page_len = page.len();
+        events.extend(page);
+    }
+    Ok(events)
+}
+
 #[tauri::command]
 async fn get_device_state() -> Result<serde_json::Value, String> {
     match status_client::fetch_device_state().await {
@@ -554,6 +666,10 @@ fn main() {
     tauri::Builder::default()
         .plugin(tauri_plugin_shell::init())
         .plugin(tauri_plugin_dialog::init())
+        .setup(|app| {
+            spawn_event_forwarder(app.handle().clone());
+            Ok(())
+        })
         .invoke_handler(tauri::generate_handler![
             get_status,
             get_system_metrics,
@@ -1,17 +1,9 @@
-import React, { useEffect, useState } from 'react';
+import React, { Suspense, lazy, useEffect, useState } from 'react';
 import { Routes, Route, Navigate, useLocation } from 'react-router-dom';
 import { invoke } from '@tauri-apps/api/core';
 import { Layout } from './components/Layout';
 import { ServiceProvider } from './state/service';
 import StatusPage from './pages/StatusPage';
-import ProtectionPage from './pages/ProtectionPage';
-import ScansPage from './pages/ScansPage';
-import EventsPage from './pages/EventsPage';
-import DeviceControlPage from './pages/DeviceControlPage';
-import UpdatesPage from './pages/UpdatesPage';
-import SettingsPage from './pages/SettingsPage';
-import SupportPage from './pages/SupportPage';
-import { OnboardingPage } from './onboarding';
 import UnlockPage from './pages/UnlockPage';
 import {
   isStrictModeEnabled,
@@ -20,6 +12,17 @@ import {
   verifyStrictModePassword,
 } from './utils/strictMode';
 
+// The status page is the first thing shown, so it stays in the main bundle.
+// Every other page is only built the first time its route is opened.
+const ProtectionPage = lazy(() => import('./pages/ProtectionPage'));
+const ScansPage = lazy(() => import('./pages/ScansPage'));
+const EventsPage = lazy(() => import('./pages/EventsPage'));
+const DeviceControlPage = lazy(() => import('./pages/DeviceControlPage'));
+const UpdatesPage = lazy(() => import('./pages/UpdatesPage'));
+const SettingsPage = lazy(() => import('./pages/SettingsPage'));
+const SupportPage = lazy(() => import('./pages/SupportPage'));
+const OnboardingPage = lazy(() => import('./onboarding').then((m) => ({ default: m.OnboardingPage })));
+
 /**
  * First-run detection.
  * Checks: 1) localStorage flag, 2) vault existence via Tauri command.
@@ -138,7 +141,7 @@ const App: React.FC = () => {
     <ServiceProvider>
       <OnboardingGate>
         <Routes>
-          <Route path="/setup" element={<OnboardingPage />} />
+          <Route path="/setup" element={<Suspense fallback={<StartupLoader />}><OnboardingPage /></Suspense>} />
           <Route path="/" element={<Layout />}>
             <Route index element={<StatusPage />} />
             <Route path="protection" element={<ProtectionPage />} />
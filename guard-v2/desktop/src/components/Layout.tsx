@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { Suspense } from 'react';
 import { NavLink, Outlet, useLocation } from 'react-router-dom';
 import { Lock, ScanLine, Activity, MonitorSmartphone, Download, Settings, HelpCircle, Wifi, WifiOff, Zap, LogOut } from 'lucide-react';
 import { useService } from '../state/service';
@@ -129,7 +129,10 @@ export const Layout: React.FC = () => {
 
         {/* Page Content */}
         <main className="flex-1 overflow-y-auto scrollbar-thin">
-          <Outlet />
+          {/* Lazily loaded pages suspend here, so the sidebar and header stay painted */}
+          <Suspense fallback={null}>
+            <Outlet />
+          </Suspense>
         </main>
       </div>
     </div>
@@ -2,7 +2,23 @@ import React from 'react';
 import { ServiceStatus } from '../types';
 import { Circle } from 'lucide-react';
 
-export const StatusBadge: React.FC<{ status: ServiceStatus | null; serviceAvailable: boolean }> = ({ status, serviceAvailable }) => {
+type ModeSpec = { label: string; color: string };
+
+// Label and colour per protection mode: one table lookup replaces the two
+// parallel ternary chains that used to pick them.
+const PROTECTED: ModeSpec = { label: 'Protected', color: 'text-accent-primary' };
+const REMOTE_SAFE_MODE: ModeSpec = { label: 'Safe Mode (Remote)', color: 'text-orange-400' };
+const MODE_SPEC: Record<string, ModeSpec> = {
+  zerotrust: { label: 'Zero-Trust Mode', color: 'text-state-zerotrust' },
+  safemode: { label: 'Safe Mode', color: 'text-state-safemode' },
+  disconnected: { label: 'Disconnected', color: 'text-state-disconnected' },
+};
+
+type StatusBadgeProps = { status: ServiceStatus | null; serviceAvailable: boolean };
+
+// Memoized: the header re-renders with every layout change, the badge only
+// needs to when the status itself does.
+export const StatusBadge = React.memo(function StatusBadge({ status, serviceAvailable }: StatusBadgeProps) {
   if (!serviceAvailable) {
     return (
       <div className="flex items-center gap-2 text-text-muted text-sm" title="Service Unavailable">
@@ -19,33 +35,14 @@ export const StatusBadge: React.FC<{ status: ServiceStatus | null; serviceAvaila
     );
   }
 
-  const isRemoteSafeMode = status.mode === 'safemode' && status.safeModeReason === 'REMOTE_COMMAND';
-
-  const modeLabel =
-    status.mode === 'zerotrust'
-      ? 'Zero-Trust Mode'
-      : status.mode === 'safemode'
-      ? isRemoteSafeMode
-        ? 'Safe Mode (Remote)'
-        : 'Safe Mode'
-      : status.mode === 'disconnected'
-      ? 'Disconnected'
-      : 'Protected';
-
-  const color =
-    status.mode === 'zerotrust'
-      ? 'text-state-zerotrust'
-      : status.mode === 'safemode'
-      ? isRemoteSafeMode
-        ? 'text-orange-400'
-        : 'text-state-safemode'
-      : status.mode === 'disconnected'
-      ? 'text-state-disconnected'
-      : 'text-accent-primary';
+  const spec =
+    status.mode === 'safemode' && status.safeModeReason === 'REMOTE_COMMAND'
+      ? REMOTE_SAFE_MODE
+      : MODE_SPEC[status.mode] ?? PROTECTED;
 
   return (
-    <div className={`flex items-center gap-2 text-sm font-medium ${color}`}>
-      <Circle className={color} size={14} /> {modeLabel}
+    <div className={`flex items-center gap-2 text-sm font-medium ${spec.color}`}>
+      <Circle className={spec.color} size={14} /> {spec.label}
     </div>
   );
-};
+});
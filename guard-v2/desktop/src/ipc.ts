@@ -1,5 +1,5 @@
 import { invoke } from '@tauri-apps/api/core';
-import { DeviceState, EventEntry, ServiceStatus, UpdateInfo } from './types';
+import { DeviceState, EventEntry, EventFilter, ServiceStatus, UpdateInfo } from './types';
 
 type StatusResponse = ServiceStatus;
 
@@ -21,8 +21,8 @@ export async function fetchCapabilities(): Promise<CapabilityResponse> {
   return invoke<CapabilityResponse>('get_capabilities');
 }
 
-export async function fetchEvents(): Promise<EventsResponse> {
-  return invoke<EventsResponse>('get_events');
+export async function fetchEvents(filter?: EventFilter): Promise<EventsResponse> {
+  return invoke<EventsResponse>('get_events', { filter });
 }
 
 export async function fetchDeviceState(): Promise<DeviceState | { error: string }> {
@@ -1,105 +1,363 @@
-import React, { useState, useMemo, useEffect } from 'react';
+import React, { useState, useMemo, useEffect, useCallback, useRef } from 'react';
 import { useService } from '../state/service';
+import { fetchEvents } from '../ipc';
+import { EventEntry, EventFilter } from '../types';
 import { Activity, AlertTriangle, Info, XCircle, Shield, Search, Filter, RefreshCw, ChevronDown, ChevronRight, Download, ShieldAlert, FileWarning, Bell } from 'lucide-react';
 
 type SeverityFilter = 'all' | 'critical' | 'warning' | 'info';
 
 const severityOrder: Record<string, number> = { CRITICAL: 0, ERROR: 1, WARN: 2, WARNING: 2, INFO: 3 };
 
+// The service-side filter behind each severity tab.
+const TAB_FILTERS: Record<Exclude<SeverityFilter, 'all'>, EventFilter> = {
+  critical: { severities: ['CRITICAL', 'ERROR'], event_types: ['TAMPER_DETECTED'] },
+  warning: { severities: ['WARN'], event_types: ['RESTORE_SUCCESS', 'RESTORE_FAILURE', 'PERMISSIONS_RESTORED'] },
+  info: { severities: ['INFO'] },
+};
+
+// Client-side twin of the service's kind check, so tab counts agree with what
+// each tab actually fetches.
+function admitsKind(filter: EventFilter, event: EventEntry): boolean {
+  const severities = filter.severities ?? [];
+  const types = filter.event_types ?? [];
+  return (severities.length === 0 && types.length === 0)
+    || severities.includes(event.severity)
+    || types.includes(event.event_type);
+}
+
+// Row styling per displayed severity, built once and shared by every row.
+const SEVERITY_STYLES = {
+  CRITICAL: { icon: <ShieldAlert size={15} className="text-semantic-error" />, color: 'text-semantic-error', bg: 'bg-semantic-error/10', label: 'CRITICAL' },
+  ERROR: { icon: <XCircle size={15} className="text-semantic-error" />, color: 'text-semantic-error', bg: 'bg-semantic-error/10', label: 'ERROR' },
+  WARN: { icon: <AlertTriangle size={15} className="text-semantic-warning" />, color: 'text-semantic-warning', bg: 'bg-semantic-warning/10', label: 'WARN' },
+  INFO: { icon: <Info size={15} className="text-accent-primary" />, color: 'text-accent-primary', bg: 'bg-accent-primary/10', label: 'INFO' },
+};
+
+// Expand/collapse markers, shared by every row like the severity icons.
+const CHEVRON_OPEN = <ChevronDown size={14} className="text-text-muted" />;
+const CHEVRON_CLOSED = <ChevronRight size={14} className="text-text-muted" />;
+
+const getSeverityInfo = (sev: string, evType: string) => {
+  const s = (sev || '').toUpperCase();
+  const t = (evType || '').toUpperCase();
+  if (s === 'CRITICAL' || t.includes('TAMPER')) return SEVERITY_STYLES.CRITICAL;
+  if (s === 'ERROR') return SEVERITY_STYLES.ERROR;
+  if (s === 'WARN' || s === 'WARNING' || t.includes('RESTORE')) return SEVERITY_STYLES.WARN;
+  return SEVERITY_STYLES.INFO;
+};
+
+const formatEventType = (evType: string) => {
+  return (evType || 'UNKNOWN').replace(/_/g, ' ');
+};
+
+const TIME_FORMAT = new Intl.DateTimeFormat('en-US', { hour12: false, hour: '2-digit', minute: '2-digit', second: '2-digit' });
+const DAY_FORMAT = new Intl.DateTimeFormat('en-US', { weekday: 'short', month: 'short', day: 'numeric', year: 'numeric' });
+
+type RowLabels = {
+  time: string;
+  /** Local calendar day, '' when the timestamp is missing or unparseable. */
+  day: string;
+};
+
+// Row labels, formatted once per event. Entries keep their identity across
+// live batches, so only new events are formatted on a re-render.
+const rowLabels = new WeakMap<EventEntry, RowLabels>();
+
+const labelsFor = (event: EventEntry) => {
+  let labels = rowLabels.get(event);
+  if (labels === undefined) {
+    labels = { time: '--:--:--', day: '' };
+    if (event.timestamp) {
+      try {
+        const d = new Date(event.timestamp);
+        labels = { time: TIME_FORMAT.format(d), day: DAY_FORMAT.format(d) };
+      } catch { /* unparseable: keep placeholders */ }
+    }
+    rowLabels.set(event, labels);
+  }
+  return labels;
+};
+
+const formatDate = (ts: string) => {
+  if (!ts) return 'N/A';
+  try { return new Date(ts).toLocaleString(); } catch { return ts; }
+};
+
+/** Pause in typing before the search box queries the service. */
+const SEARCH_DEBOUNCE_MS = 150;
+
+/** Rows mounted per render pass when a list is first shown. */
+const ROW_CHUNK = 50;
+
+/** Events per page, matching the `get_events` limit. */
+const PAGE_SIZE = 200;
+
+const NO_EVENTS: EventEntry[] = [];
+
+type EventRowProps = {
+  event: EventEntry;
+  rowKey: number;
+  expanded: boolean;
+  onToggle: (rowKey: number) => void;
+  onShowFile: (path: string) => void;
+};
+
+// Memoized so a live batch or a keystroke re-renders only rows whose event
+// or expanded state changed. Existing rows keep their DOM and are skipped.
+const EventRow = React.memo(function EventRow({ event, rowKey, expanded, onToggle, onShowFile }: EventRowProps) {
+  const sev = getSeverityInfo(event.severity, event.event_type);
+  const rawPath = event.data?.path;
+  const path = typeof rawPath === 'string' ? rawPath : null;
+  return (
+    <div className="group lazy-row">
+      <button
+        onClick={() => onToggle(rowKey)}
+        className={`w-full flex items-center gap-3 px-4 py-3 text-left hover:bg-bg-secondary/50 transition-colors ${(event.event_type || '').includes('TAMPER') ? 'border-l-2 border-l-semantic-error' : ''}`}
+      >
+        {sev.icon}
+        <span className={`px-1.5 py-0.5 rounded text-[10px] font-bold ${sev.bg} ${sev.color}`}>{sev.label}</span>
+        <span className="font-mono text-xs text-text-muted w-20 shrink-0">{labelsFor(event).time}</span>
+        <span className="text-sm font-medium flex-1 truncate">{formatEventType(event.event_type)}</span>
+        {event.detail && <span className="text-xs text-text-muted truncate max-w-48 hidden sm:block">{event.detail}</span>}
+        {expanded ? CHEVRON_OPEN : CHEVRON_CLOSED}
+      </button>
+      {expanded && (
+        <div className="px-4 pb-3 pl-12">
+          <div className="bg-bg-secondary/50 rounded-lg p-3 text-xs space-y-2">
+            <div className="grid grid-cols-2 gap-2">
+              <div><span className="text-text-muted">Event:</span> <span className="text-text-primary font-semibold">{event.event_type}</span></div>
+              <div><span className="text-text-muted">Severity:</span> <span className={sev.color + ' font-semibold'}>{event.severity}</span></div>
+              <div><span className="text-text-muted">Timestamp:</span> <span className="text-text-primary font-mono">{formatDate(event.timestamp)}</span></div>
+              <div><span className="text-text-muted">Sequence:</span> <span className="text-text-primary font-mono">#{event.seq}</span></div>
+            </div>
+            {event.detail && (
+              <div className="pt-2 border-t border-white/5">
+                <span className="text-text-muted">Detail:</span>
+                <span className="text-text-primary ml-2">{event.detail}</span>
+              </div>
+            )}
+            {path && (
+              <div className="pt-2 border-t border-white/5">
+                <button onClick={() => onShowFile(path)} className="flex items-center gap-1.5 text-accent-primary hover:underline">
+                  <FileWarning size={12} /> Show history for this file
+                </button>
+              </div>
+            )}
+            {event.data && Object.keys(event.data).length > 0 && (
+              <div className="pt-2 border-t border-white/5">
+                <span className="text-text-muted block mb-1">Raw Data:</span>
+                <pre className="text-text-secondary bg-bg-primary/50 rounded p-2 overflow-x-auto whitespace-pre-wrap break-all">
+                  {JSON.stringify(event.data, null, 2)}
+                </pre>
+              </div>
+            )}
+            {event.hash && (
+              <div className="pt-2 border-t border-white/5">
+                <span className="text-text-muted">Chain Hash:</span>
+                <span className="text-text-primary font-mono ml-2 text-[10px]">{event.hash}</span>
+              </div>
+            )}
+          </div>
+        </div>
+      )}
+    </div>
+  );
+});
+
 const EventsPage: React.FC = () => {
   const { events, serviceAvailable, refresh } = useService();
   const [severity, setSeverity] = useState<SeverityFilter>('all');
   const [search, setSearch] = useState('');
+  // The search text the list is filtered by. It follows the search box once
+  // typing pauses, so a query goes out per search rather than per keystroke.
+  // Clearing the box applies at once.
+  const [query, setQuery] = useState('');
+  useEffect(() => {
+    if (search === '') {
+      setQuery('');
+      return;
+    }
+    const timer = setTimeout(() => setQuery(search), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timer);
+  }, [search]);
   const [expanded, setExpanded] = useState<number | null>(null);
   const [refreshing, setRefreshing] = useState(false);
-  const [autoRefresh, setAutoRefresh] = useState(true);
-
-  // Auto-refresh events every 3 seconds
-  useEffect(() => {
-    if (!autoRefresh) return;
-    const iv = setInterval(() => { refresh(); }, 3000);
-    return () => clearInterval(iv);
-  }, [autoRefresh, refresh]);
+  // New events are pushed into the service context as they are logged. While
+  // live view is off the page keeps showing the snapshot taken when it was
+  // paused.
+  const [paused, setPaused] = useState<EventEntry[] | null>(null);
+  const autoRefresh = paused === null;
+  const shown = paused ?? events;
 
+  // Most recent first. The service context already holds events in that
+  // order, so this is normally one pass that returns the list as it is. A
+  // sort, on timestamps parsed once each, only runs if a clock change left
+  // entries out of order.
   const sorted = useMemo(() => {
-    const list = [...(events || [])];
-    // Sort by timestamp descending (most recent first)
-    list.sort((a, b) => {
-      const ta = a.timestamp ? new Date(a.timestamp).getTime() : 0;
-      const tb = b.timestamp ? new Date(b.timestamp).getTime() : 0;
-      return tb - ta;
-    });
+    const list = shown || [];
+    const times = list.map(e => (e.timestamp ? Date.parse(e.timestamp) || 0 : 0));
+    for (let i = 1; i < times.length; i++) {
+      if (times[i] > times[i - 1]) {
+        const order = times.map((_, j) => j).sort((a, b) => times[b] - times[a]);
+        return order.map(j => list[j]);
+      }
+    }
     return list;
-  }, [events]);
+  }, [shown]);
 
-  const filtered = useMemo(() => {
-    let list = sorted;
-    if (severity !== 'all') {
-      list = list.filter(e => {
-        const sev = (e.severity || '').toUpperCase();
-        const evType = (e.event_type || '').toUpperCase();
-        if (severity === 'critical') return sev === 'CRITICAL' || sev === 'ERROR' || evType.includes('TAMPER');
-        if (severity === 'warning') return sev === 'WARN' || sev === 'WARNING' || evType.includes('RESTORE');
-        return sev === 'INFO';
-      });
-    }
-    if (search) {
-      const q = search.toLowerCase();
-      list = list.filter(e =>
-        (e.event_type || '').toLowerCase().includes(q) ||
-        (e.detail || '').toLowerCase().includes(q) ||
-        JSON.stringify(e.data || {}).toLowerCase().includes(q)
-      );
+  // A file's history, opened from an expanded row. Events are narrowed to
+  // that path by the service, so the list reaches back past the newest 200.
+  const [fileFilter, setFileFilter] = useState<string | null>(null);
+
+  // A tab, search or file is answered by the service, which filters while
+  // reading the log, so only matching events cross IPC. It is asked again
+  // whenever a new batch lands. While paused, nothing newer than the
+  // snapshot is shown.
+  const filtering = severity !== 'all' || query !== '' || fileFilter !== null;
+  const activeFilter = useMemo<EventFilter>(() => ({
+    ...(severity === 'all' ? {} : TAB_FILTERS[severity]),
+    search: query || undefined,
+    path: fileFilter ?? undefined,
+  }), [severity, query, fileFilter]);
+  const [matches, setMatches] = useState<EventEntry[] | null>(null);
+  useEffect(() => {
+    if (!filtering) {
+      setMatches(null);
+      return;
     }
-    return list;
-  }, [sorted, severity, search]);
-
-  const getSeverityInfo = (sev: string, evType: string) => {
-    const s = (sev || '').toUpperCase();
-    const t = (evType || '').toUpperCase();
-    if (s === 'CRITICAL' || t.includes('TAMPER')) return { icon: <ShieldAlert size={15} className="text-semantic-error" />, color: 'text-semantic-error', bg: 'bg-semantic-error/10', label: 'CRITICAL' };
-    if (s === 'ERROR') return { icon: <XCircle size={15} className="text-semantic-error" />, color: 'text-semantic-error', bg: 'bg-semantic-error/10', label: 'ERROR' };
-    if (s === 'WARN' || s === 'WARNING' || t.includes('RESTORE')) return { icon: <AlertTriangle size={15} className="text-semantic-warning" />, color: 'text-semantic-warning', bg: 'bg-semantic-warning/10', label: 'WARN' };
-    return { icon: <Info size={15} className="text-accent-primary" />, color: 'text-accent-primary', bg: 'bg-accent-primary/10', label: 'INFO' };
-  };
+    let stale = false;
+    const newestShown = paused ? paused.reduce((max, e) => Math.max(max, e.seq || 0), 0) : Infinity;
+    fetchEvents(activeFilter)
+      .then(res => {
+        if (!stale) setMatches((res.events || []).filter(e => (e.seq || 0) <= newestShown));
+      })
+      .catch(e => console.warn('filtered events fetch failed', e));
+    return () => {
+      stale = true;
+    };
+  }, [filtering, activeFilter, shown, paused]);
 
-  const formatEventType = (evType: string) => {
-    return (evType || 'UNKNOWN').replace(/_/g, ' ');
-  };
+  const head = filtering ? matches ?? NO_EVENTS : sorted;
 
-  const formatTimestamp = (ts: string) => {
-    if (!ts) return '--:--:--';
-    try {
-      const d = new Date(ts);
-      return d.toLocaleTimeString('en-US', { hour12: false, hour: '2-digit', minute: '2-digit', second: '2-digit' });
-    } catch { return '--:--:--'; }
-  };
+  // Older pages are fetched by sequence number when the list is scrolled to
+  // its end. A page load keeps everything already listed, so entries that
+  // later drop out of the live window leave no gap before the older page.
+  const [older, setOlder] = useState<EventEntry[]>(NO_EVENTS);
+  const [olderDone, setOlderDone] = useState(false);
+  const [loadingOlder, setLoadingOlder] = useState(false);
+  const pageKey = useRef(0);
+  useEffect(() => {
+    pageKey.current++;
+    setOlder(NO_EVENTS);
+    setOlderDone(false);
+  }, [activeFilter]);
 
-  const formatDate = (ts: string) => {
-    if (!ts) return 'N/A';
-    try { return new Date(ts).toLocaleString(); } catch { return ts; }
-  };
+  const filtered = useMemo(() => {
+    if (older.length === 0) return head;
+    const inHead = new Set(head.map(e => e.seq));
+    return [...head, ...older.filter(e => !inHead.has(e.seq))];
+  }, [head, older]);
+
+  const loadOlder = useCallback(() => {
+    const oldest = filtered.reduce((min, e) => Math.min(min, e.seq || Infinity), Infinity);
+    if (loadingOlder || olderDone || !Number.isFinite(oldest)) return;
+    const key = pageKey.current;
+    setLoadingOlder(true);
+    fetchEvents({ ...activeFilter, before_seq: oldest })
+      .then(res => {
+        if (key !== pageKey.current) return;
+        const page = res.events || [];
+        setOlder([...filtered, ...page]);
+        if (page.length < PAGE_SIZE) setOlderDone(true);
+      })
+      .catch(e => console.warn('older events fetch failed', e))
+      .finally(() => setLoadingOlder(false));
+  }, [filtered, loadingOlder, olderDone, activeFilter]);
+
+  // A newly selected list mounts its first chunk of rows at once and the
+  // rest a chunk per pass, so the page paints and takes input right away.
+  // Live batches do not reset the count, so a scrolled list stays put.
+  const [rendered, setRendered] = useState(ROW_CHUNK);
+  useEffect(() => setRendered(ROW_CHUNK), [activeFilter]);
+  useEffect(() => {
+    if (rendered >= filtered.length) return;
+    const timer = setTimeout(() => setRendered(n => n + ROW_CHUNK), 0);
+    return () => clearTimeout(timer);
+  }, [rendered, filtered.length]);
+
+  // Once every row is mounted, reaching the end of the list asks for the
+  // next older page.
+  const endOfList = useRef<HTMLDivElement | null>(null);
+  useEffect(() => {
+    const el = endOfList.current;
+    if (!el || olderDone || rendered < filtered.length) return;
+    const observer = new IntersectionObserver(entries => {
+      if (entries.some(e => e.isIntersecting)) loadOlder();
+    });
+    observer.observe(el);
+    return () => observer.disconnect();
+  }, [loadOlder, olderDone, rendered, filtered.length]);
+
+  // Rows are expanded by key, so an expanded event stays open when a live
+  // batch shifts it down the list.
+  const toggleExpanded = useCallback((rowKey: number) => {
+    setExpanded(cur => (cur === rowKey ? null : rowKey));
+  }, []);
+
+  // Mounted rows, with a header wherever the day changes, built in the one
+  // pass that emits them. "Today" and "Yesterday" are worked out once per
+  // render and compared against each header's cached day label.
+  const now = new Date();
+  const today = DAY_FORMAT.format(now);
+  const yesterday = DAY_FORMAT.format(new Date(now.getFullYear(), now.getMonth(), now.getDate() - 1));
+  const rows: React.ReactNode[] = [];
+  let lastDay: string | null = null;
+  filtered.slice(0, rendered).forEach((event, i) => {
+    const { day } = labelsFor(event);
+    if (day !== lastDay) {
+      rows.push(
+        <div key={`day-${day}-${i}`} className="px-4 py-1.5 bg-bg-secondary/30 text-[11px] font-semibold uppercase tracking-wide text-text-muted">
+          {day === today ? 'Today' : day === yesterday ? 'Yesterday' : day || 'Unknown date'}
+        </div>
+      );
+      lastDay = day;
+    }
+    const rowKey = event.seq || i;
+    rows.push(<EventRow key={rowKey} event={event} rowKey={rowKey} expanded={expanded === rowKey} onToggle={toggleExpanded} onShowFile={setFileFilter} />);
+  });
 
   const doRefresh = () => {
     setRefreshing(true);
-    refresh();
-    setTimeout(() => setRefreshing(false), 1000);
+    if (paused) setPaused(events);
+    void refresh().finally(() => setRefreshing(false));
   };
 
+  // Each row goes into the Blob as its own part, so the CSV is never built
+  // up as one string. The object URL is released once the download has
+  // started.
   const exportEvents = () => {
-    const csv = ['Timestamp,Severity,Event,Detail,Data',
-      ...filtered.map(e => `"${e.timestamp}","${e.severity}","${e.event_type}","${e.detail || ''}","${JSON.stringify(e.data || {}).replace(/"/g, '""')}"`)
-    ].join('\n');
-    const blob = new Blob([csv], { type: 'text/csv' });
+    const parts = ['Timestamp,Severity,Event,Detail,Data\n'];
+    for (const e of filtered) {
+      parts.push(`"${e.timestamp}","${e.severity}","${e.event_type}","${e.detail || ''}","${JSON.stringify(e.data || {}).replace(/"/g, '""')}"\n`);
+    }
+    const url = URL.createObjectURL(new Blob(parts, { type: 'text/csv' }));
     const a = document.createElement('a');
-    a.href = URL.createObjectURL(blob);
+    a.href = url;
     a.download = `darklock-events-${Date.now()}.csv`;
     a.click();
+    setTimeout(() => URL.revokeObjectURL(url), 1000);
   };
 
-  const critCount = sorted.filter(e => (e.severity || '').toUpperCase() === 'CRITICAL' || (e.event_type || '').includes('TAMPER')).length;
-  const warnCount = sorted.filter(e => { const s = (e.severity||'').toUpperCase(); return s === 'WARN' || s === 'WARNING'; }).length;
-  const infoCount = sorted.filter(e => (e.severity || '').toUpperCase() === 'INFO').length;
+  // Tab counts in one pass, redone only when the list itself changes.
+  const { critCount, warnCount, infoCount } = useMemo(() => {
+    let crit = 0, warn = 0, info = 0;
+    for (const e of sorted) {
+      if (admitsKind(TAB_FILTERS.critical, e)) crit++;
+      if (admitsKind(TAB_FILTERS.warning, e)) warn++;
+      if (admitsKind(TAB_FILTERS.info, e)) info++;
+    }
+    return { critCount: crit, warnCount: warn, infoCount: info };
+  }, [sorted]);
 
   const tabs: { label: string; value: SeverityFilter; count: number; color?: string }[] = [
     { label: 'All', value: 'all', count: sorted.length },
@@ -124,7 +382,7 @@ const EventsPage: React.FC = () => {
         </div>
         <div className="flex items-center gap-2">
           <button
-            onClick={() => setAutoRefresh(!autoRefresh)}
+            onClick={() => setPaused(autoRefresh ? events : null)}
             className={`flex items-center gap-1.5 px-3 py-1.5 rounded-lg text-xs transition-colors border ${autoRefresh ? 'bg-semantic-success/10 border-semantic-success/30 text-semantic-success' : 'bg-bg-card border-white/5 text-text-muted'}`}
           >
             <Bell size={13} /> Live
@@ -162,6 +420,16 @@ const EventsPage: React.FC = () => {
         </div>
       </div>
 
+      {fileFilter && (
+        <div className="flex items-center gap-2 text-xs">
+          <span className="text-text-muted">History for</span>
+          <span className="font-mono text-text-primary truncate">{fileFilter}</span>
+          <button onClick={() => setFileFilter(null)} className="p-0.5 rounded text-text-muted hover:text-text-secondary" aria-label="Clear file filter">
+            <XCircle size={13} />
+          </button>
+        </div>
+      )}
+
       {!serviceAvailable && (
         <div className="bg-semantic-error/10 border border-semantic-error/30 rounded-xl p-4 flex items-center gap-3">
           <XCircle size={18} className="text-semantic-error" />
@@ -174,65 +442,19 @@ const EventsPage: React.FC = () => {
           <div className="text-center py-12">
             <Activity size={32} className="text-text-muted mx-auto mb-3 opacity-30" />
             <p className="text-sm text-text-muted">No events found</p>
-            <p className="text-xs text-text-muted mt-1">{search ? 'Try adjusting your search or filter' : 'Events will appear here as activity is detected'}</p>
+            <p className="text-xs text-text-muted mt-1">{search || fileFilter ? 'Try adjusting your search or filter' : 'Events will appear here as activity is detected'}</p>
           </div>
         ) : (
           <div className="divide-y divide-white/5">
-            {filtered.map((event, i) => {
-              const sev = getSeverityInfo(event.severity, event.event_type);
-              return (
-                <div key={event.seq || i} className="group">
-                  <button
-                    onClick={() => setExpanded(expanded === i ? null : i)}
-                    className={`w-full flex items-center gap-3 px-4 py-3 text-left hover:bg-bg-secondary/50 transition-colors ${(event.event_type || '').includes('TAMPER') ? 'border-l-2 border-l-semantic-error' : ''}`}
-                  >
-                    {sev.icon}
-                    <span className={`px-1.5 py-0.5 rounded text-[10px] font-bold ${sev.bg} ${sev.color}`}>{sev.label}</span>
-                    <span className="font-mono text-xs text-text-muted w-20 shrink-0">{formatTimestamp(event.timestamp)}</span>
-                    <span className="text-sm font-medium flex-1 truncate">{formatEventType(event.event_type)}</span>
-                    {event.detail && <span className="text-xs text-text-muted truncate max-w-48 hidden sm:block">{event.detail}</span>}
-                    {expanded === i ? <ChevronDown size={14} className="text-text-muted" /> : <ChevronRight size={14} className="text-text-muted" />}
-                  </button>
-                  {expanded === i && (
-                    <div className="px-4 pb-3 pl-12">
-                      <div className="bg-bg-secondary/50 rounded-lg p-3 text-xs space-y-2">
-                        <div className="grid grid-cols-2 gap-2">
-                          <div><span className="text-text-muted">Event:</span> <span className="text-text-primary font-semibold">{event.event_type}</span></div>
-                          <div><span className="text-text-muted">Severity:</span> <span className={sev.color + ' font-semibold'}>{event.severity}</span></div>
-                          <div><span className="text-text-muted">Timestamp:</span> <span className="text-text-primary font-mono">{formatDate(event.timestamp)}</span></div>
-                          <div><span className="text-text-muted">Sequence:</span> <span className="text-text-primary font-mono">#{event.seq}</span></div>
-                        </div>
-                        {event.detail && (
-                          <div className="pt-2 border-t border-white/5">
-                            <span className="text-text-muted">Detail:</span>
-                            <span className="text-text-primary ml-2">{event.detail}</span>
-                          </div>
-                        )}
-                        {event.data && Object.keys(event.data).length > 0 && (
-                          <div className="pt-2 border-t border-white/5">
-                            <span className="text-text-muted block mb-1">Raw Data:</span>
-                            <pre className="text-text-secondary bg-bg-primary/50 rounded p-2 overflow-x-auto whitespace-pre-wrap break-all">
-                              {JSON.stringify(event.data, null, 2)}
-                            </pre>
-                          </div>
-                        )}
-                        {event.hash && (
-                          <div className="pt-2 border-t border-white/5">
-                            <span className="text-text-muted">Chain Hash:</span>
-                            <span className="text-text-primary font-mono ml-2 text-[10px]">{event.hash}</span>
-                          </div>
-                        )}
-                      </div>
-                    </div>
-                  )}
-                </div>
-              );
-            })}
+            {rows}
           </div>
         )}
+        {!olderDone && filtered.length > 0 && <div ref={endOfList} className="h-px" />}
       </div>
 
-      <p className="text-[11px] text-text-muted text-center">{filtered.length} event{filtered.length !== 1 ? 's' : ''} shown</p>
+      <p className="text-[11px] text-text-muted text-center">
+        {filtered.length} event{filtered.length !== 1 ? 's' : ''} shown{(rendered < filtered.length || loadingOlder) && ' · loading more…'}
+      </p>
     </div>
   );
 };
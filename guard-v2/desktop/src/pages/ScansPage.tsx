@@ -14,6 +14,17 @@ type ScanRecord = {
   issues?: number;
 };
 
+type ScanKind = 'quick' | 'full' | 'custom';
+
+// The scan cards are fixed: one static table drives all of them, and the
+// grid shares a single click handler that reads the card's kind back from
+// its data attribute.
+const SCAN_TYPES: { kind: ScanKind; icon: React.ElementType; title: string; desc: string; time: string; color: string; bg: string }[] = [
+  { kind: 'quick', icon: ScanLine, title: 'Quick Scan', desc: 'Scan critical system files and protected directories', time: '~30 seconds', color: 'text-accent-primary', bg: 'bg-accent-primary' },
+  { kind: 'full', icon: FileSearch, title: 'Full Scan', desc: 'Complete integrity check against signed baseline', time: '~2 minutes', color: 'text-accent-secondary', bg: 'bg-accent-secondary' },
+  { kind: 'custom', icon: FolderOpen, title: 'Custom Scan', desc: 'Pick a directory to scan', time: 'Varies', color: 'text-accent-tertiary', bg: 'bg-accent-tertiary' },
+];
+
 const ScansPage: React.FC = () => {
   const { serviceAvailable, capabilities } = useService();
   const [scanHistory, setScanHistory] = useState<ScanRecord[]>([]);
@@ -23,7 +34,7 @@ const ScansPage: React.FC = () => {
 
   const disabled = !serviceAvailable || !capabilities?.scans;
 
-  const startScan = async (kind: 'quick' | 'full' | 'custom') => {
+  const startScan = async (kind: ScanKind) => {
     if (disabled || activeScan) return;
 
     // For custom scans, open directory picker first
@@ -59,11 +70,9 @@ const ScansPage: React.FC = () => {
     }
   };
 
-  const scanTypes = [
-    { kind: 'quick' as const, icon: ScanLine, title: 'Quick Scan', desc: 'Scan critical system files and protected directories', time: '~30 seconds', color: 'text-accent-primary', bg: 'bg-accent-primary' },
-    { kind: 'full' as const, icon: FileSearch, title: 'Full Scan', desc: 'Complete integrity check against signed baseline', time: '~2 minutes', color: 'text-accent-secondary', bg: 'bg-accent-secondary' },
-    { kind: 'custom' as const, icon: FolderOpen, title: 'Custom Scan', desc: customPath ? `Scanning: ${customPath}` : 'Pick a directory to scan', time: 'Varies', color: 'text-accent-tertiary', bg: 'bg-accent-tertiary' },
-  ];
+  const onScanCardClick = (e: React.MouseEvent<HTMLButtonElement>) => {
+    void startScan(e.currentTarget.dataset.kind as ScanKind);
+  };
 
   return (
     <div className="p-6 space-y-6">
@@ -80,10 +89,11 @@ const ScansPage: React.FC = () => {
       )}
 
       <div className="grid grid-cols-1 md:grid-cols-3 gap-4">
-        {scanTypes.map((scan) => (
+        {SCAN_TYPES.map((scan) => (
           <button
             key={scan.kind}
-            onClick={() => startScan(scan.kind)}
+            data-kind={scan.kind}
+            onClick={onScanCardClick}
             disabled={disabled || !!activeScan}
             className={`bg-bg-card border border-white/5 rounded-xl p-5 text-left hover:border-white/10 transition-all duration-200 group ${(disabled || activeScan) ? 'opacity-50 cursor-not-allowed' : ''}`}
           >
@@ -98,7 +108,7 @@ const ScansPage: React.FC = () => {
               <span className="text-[11px] text-text-muted flex items-center gap-1"><Clock size={11} /> {scan.time}</span>
             </div>
             <h3 className="font-semibold text-sm">{scan.title}</h3>
-            <p className="text-xs text-text-muted mt-1">{scan.desc}</p>
+            <p className="text-xs text-text-muted mt-1">{scan.kind === 'custom' && customPath ? `Scanning: ${customPath}` : scan.desc}</p>
             {activeScan === scan.kind && (
               <div className="mt-3 h-1 bg-bg-secondary rounded-full overflow-hidden">
                 <div className={`h-full ${scan.bg} rounded-full animate-pulse`} style={{ width: '60%' }} />
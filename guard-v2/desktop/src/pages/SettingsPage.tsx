@@ -93,7 +93,7 @@ const SettingsPage: React.FC = () => {
           lock_on_idle: false,
           idle_timeout_minutes: 5,
         } : undefined,
-        protection: { realtime_enabled: true, baseline_locked: false, protected_paths: [], quarantine_enabled: true },
+        protection: { realtime_enabled: true, baseline_locked: false, protected_paths: [], quarantine_enabled: true, force_polling: false, always_rehash: false },
         performance: { max_cpu_percent: 30, max_memory_mb: 512 },
         updates: { auto_update: true, channel: 'stable' },
         privacy: { telemetry_enabled: false, crash_reports: true },
@@ -364,6 +364,36 @@ const SettingsPage: React.FC = () => {
             }}
           />
         </Row>
+        <Row label="Force Polling Watcher" desc="Poll for changes instead of OS events (network shares are always polled; applies after restart)">
+          <Toggle 
+            on={!!settings.protection.force_polling} 
+            onChange={async () => {
+              if (settings.security_mode === 'Strict' && settings.strict_settings?.require_password_for_protection_changes) {
+                await patchWithPasswordCheck(
+                  s => { s.protection.force_polling = !s.protection.force_polling; return s; },
+                  'change watcher mode'
+                );
+              } else {
+                patch(s => { s.protection.force_polling = !s.protection.force_polling; return s; });
+              }
+            }}
+          />
+        </Row>
+        <Row label="Always Re-hash on Audit" desc="Hash every file on each periodic audit instead of skipping files whose size and modification time are unchanged (applies after restart)">
+          <Toggle 
+            on={!!settings.protection.always_rehash} 
+            onChange={async () => {
+              if (settings.security_mode === 'Strict' && settings.strict_settings?.require_password_for_protection_changes) {
+                await patchWithPasswordCheck(
+                  s => { s.protection.always_rehash = !s.protection.always_rehash; return s; },
+                  'change audit hashing'
+                );
+              } else {
+                patch(s => { s.protection.always_rehash = !s.protection.always_rehash; return s; });
+              }
+            }}
+          />
+        </Row>
       </Section>
 
       {/* Performance - matches Rust PerformanceSettings */}
@@ -1,8 +1,8 @@
-import React, { useEffect, useState } from 'react';
+import React, { useCallback, useEffect, useState } from 'react';
 import { useService } from '../state/service';
 import { Shield, Activity, Clock, Cpu, HardDrive, Wifi, WifiOff, AlertTriangle, CheckCircle2, XCircle, RefreshCw, Zap } from 'lucide-react';
 import { fetchSystemMetrics } from '../ipc';
-import { SystemMetrics } from '../types';
+import { EventEntry, SystemMetrics } from '../types';
 
 const safeModeReasonLabel = (reason?: string): string => {
   switch (reason) {
@@ -17,39 +17,74 @@ const safeModeReasonLabel = (reason?: string): string => {
   }
 };
 
-const StatCard: React.FC<{
+type StatTone = 'ok' | 'warn' | 'error' | 'info';
+
+// Built once for every card instead of on each render.
+const TONE_CLASSES: Record<StatTone, { text: string; iconBg: string }> = {
+  ok: { text: 'text-semantic-success', iconBg: 'bg-semantic-success/10' },
+  warn: { text: 'text-semantic-warning', iconBg: 'bg-semantic-warning/10' },
+  error: { text: 'text-semantic-error', iconBg: 'bg-semantic-error/10' },
+  info: { text: 'text-accent-primary', iconBg: 'bg-accent-primary/10' },
+};
+
+type StatCardProps = {
   icon: React.ElementType;
   title: string;
   value: string;
   subtitle?: string;
-  tone?: 'ok' | 'warn' | 'error' | 'info';
-}> = ({ icon: Icon, title, value, subtitle, tone = 'ok' }) => {
-  const toneClasses: Record<string, string> = {
-    ok: 'text-semantic-success', warn: 'text-semantic-warning',
-    error: 'text-semantic-error', info: 'text-accent-primary',
-  };
-  const iconBg: Record<string, string> = {
-    ok: 'bg-semantic-success/10', warn: 'bg-semantic-warning/10',
-    error: 'bg-semantic-error/10', info: 'bg-accent-primary/10',
-  };
+  tone?: StatTone;
+};
+
+// One grid box instead of nested flex wrappers: the text stacks in the first
+// column and the icon spans it in the second. Memoized, since the page also
+// re-renders for metrics the cards don't show.
+const StatCard = React.memo(function StatCard({ icon: Icon, title, value, subtitle, tone = 'ok' }: StatCardProps) {
+  const { text, iconBg } = TONE_CLASSES[tone];
   return (
-    <div className="bg-bg-card border border-white/5 rounded-xl p-5 hover:border-white/10 transition-all duration-200">
-      <div className="flex items-start justify-between">
-        <div>
-          <p className="text-xs text-text-muted uppercase tracking-wider font-medium">{title}</p>
-          <p className={`text-2xl font-bold mt-1 ${toneClasses[tone!]}`}>{value}</p>
-          {subtitle && <p className="text-xs text-text-muted mt-1">{subtitle}</p>}
-        </div>
-        <div className={`p-2.5 rounded-lg ${iconBg[tone!]}`}>
-          <Icon size={20} className={toneClasses[tone!]} />
-        </div>
+    <div className="contain-panel grid grid-cols-[1fr_auto] items-start gap-x-3 bg-bg-card border border-white/5 rounded-xl p-5 hover:border-white/10 transition-all duration-200">
+      <p className="text-xs text-text-muted uppercase tracking-wider font-medium">{title}</p>
+      <div className={`row-span-3 p-2.5 rounded-lg ${iconBg}`}>
+        <Icon size={20} className={text} />
       </div>
+      <p className={`text-2xl font-bold mt-1 ${text}`}>{value}</p>
+      {subtitle && <p className="text-xs text-text-muted mt-1">{subtitle}</p>}
     </div>
   );
+});
+
+// Dot colour per severity. The service sends severities upper-case, so the
+// old lower-case 'error'/'warning' comparisons never matched.
+const SEVERITY_DOT: Record<string, string> = {
+  CRITICAL: 'bg-semantic-error',
+  ERROR: 'bg-semantic-error',
+  WARN: 'bg-semantic-warning',
+  WARNING: 'bg-semantic-warning',
 };
+const DEFAULT_DOT = 'bg-accent-primary';
+
+const EVENT_TIME_FORMAT = new Intl.DateTimeFormat(undefined, { dateStyle: 'short', timeStyle: 'medium' });
+
+const eventTime = (ts: string) => {
+  const d = new Date(ts);
+  return Number.isNaN(d.getTime()) ? ts : EVENT_TIME_FORMAT.format(d);
+};
+
+// Keyed by seq below, so when a new event arrives the existing rows are
+// moved down and kept rather than every row being torn down and rebuilt.
+const RecentEventRow = React.memo(function RecentEventRow({ evt }: { evt: EventEntry }) {
+  return (
+    <div className="flex items-start gap-2.5">
+      <div className={`w-1.5 h-1.5 rounded-full mt-1.5 shrink-0 ${SEVERITY_DOT[(evt.severity || '').toUpperCase()] ?? DEFAULT_DOT}`} />
+      <div className="min-w-0">
+        <p className="text-sm text-text-primary truncate">{evt.detail || (evt.event_type || 'UNKNOWN').replace(/_/g, ' ')}</p>
+        <p className="text-[11px] text-text-muted font-mono">{eventTime(evt.timestamp)}</p>
+      </div>
+    </div>
+  );
+});
 
 const StatusPage: React.FC = () => {
-  const { status, serviceAvailable, events, refresh } = useService();
+  const { status, serviceAvailable, events, eventCounts, refresh } = useService();
   const [uptime, setUptime] = useState('0m');
   const [refreshing, setRefreshing] = useState(false);
   const [metrics, setMetrics] = useState<SystemMetrics | null>(null);
@@ -80,11 +115,15 @@ const StatusPage: React.FC = () => {
     return () => clearInterval(interval);
   }, []);
 
-  const handleRefresh = async () => {
+  // The spinner runs for exactly as long as the refresh does.
+  const handleRefresh = useCallback(async () => {
     setRefreshing(true);
-    await refresh();
-    setTimeout(() => setRefreshing(false), 600);
-  };
+    try {
+      await refresh();
+    } finally {
+      setRefreshing(false);
+    }
+  }, [refresh]);
 
   if (!serviceAvailable) {
     return (
@@ -106,8 +145,7 @@ const StatusPage: React.FC = () => {
   const isSafeMode = status?.mode === 'safemode';
   const isRemoteSafeMode = isSafeMode && status?.safeModeReason === 'REMOTE_COMMAND';
   const recentEvents = events.slice(0, 5);
-  const errorCount = events.filter(e => e.severity === 'error').length;
-  const warningCount = events.filter(e => e.severity === 'warning').length;
+  const { errors: errorCount, warnings: warningCount } = eventCounts;
 
   return (
     <div className="p-6 space-y-6">
@@ -141,7 +179,7 @@ const StatusPage: React.FC = () => {
       </div>
 
       <div className="grid grid-cols-1 lg:grid-cols-3 gap-4">
-        <div className="lg:col-span-2 bg-bg-card border border-white/5 rounded-xl p-5">
+        <div className="contain-panel lg:col-span-2 bg-bg-card border border-white/5 rounded-xl p-5">
           <div className="flex items-center justify-between mb-4">
             <h2 className="text-sm font-semibold uppercase tracking-wider text-text-muted">System Health</h2>
             <Zap size={16} className="text-accent-primary" />
@@ -205,20 +243,14 @@ const StatusPage: React.FC = () => {
           </div>
         </div>
 
-        <div className="bg-bg-card border border-white/5 rounded-xl p-5">
+        <div className="contain-panel bg-bg-card border border-white/5 rounded-xl p-5">
           <h2 className="text-sm font-semibold uppercase tracking-wider text-text-muted mb-4">Recent Events</h2>
           <div className="space-y-3">
             {recentEvents.length === 0 ? (
               <p className="text-sm text-text-muted">No events recorded yet.</p>
             ) : (
               recentEvents.map((evt, idx) => (
-                <div key={`${evt.timestamp}-${idx}`} className="flex items-start gap-2.5">
-                  <div className={`w-1.5 h-1.5 rounded-full mt-1.5 shrink-0 ${evt.severity === 'error' ? 'bg-semantic-error' : evt.severity === 'warning' ? 'bg-semantic-warning' : 'bg-accent-primary'}`} />
-                  <div className="min-w-0">
-                    <p className="text-sm text-text-primary truncate">{evt.message}</p>
-                    <p className="text-[11px] text-text-muted font-mono">{evt.timestamp}</p>
-                  </div>
-                </div>
+                <RecentEventRow key={evt.seq ?? `${evt.timestamp}-${idx}`} evt={evt} />
               ))
             )}
           </div>
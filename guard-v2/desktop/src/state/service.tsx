@@ -1,11 +1,18 @@
-import React, { createContext, useContext, useEffect, useMemo, useRef, useState } from 'react';
+import React, { createContext, useCallback, useContext, useEffect, useMemo, useRef, useState } from 'react';
+import { listen } from '@tauri-apps/api/event';
 import { fetchCapabilities, fetchEvents, fetchStatus } from '../ipc';
 import { CapabilityMap, EventEntry, ServiceStatus } from '../types';
 
+export type EventCounts = {
+  errors: number;
+  warnings: number;
+};
+
 export type ServiceContextState = {
   status: ServiceStatus | null;
   capabilities: CapabilityMap;
   events: EventEntry[];
+  eventCounts: EventCounts;
   serviceAvailable: boolean;
   loading: boolean;
   refresh: () => Promise<void>;
@@ -19,6 +26,67 @@ const defaultCapabilities: CapabilityMap = {
   connectedMode: false,
 };
 
+/** Most events kept in memory, matching what `get_events` returns. */
+const MAX_EVENTS = 200;
+
+// One pass over the list; severities arrive upper-case from the service.
+const countEvents = (events: EventEntry[]): EventCounts => {
+  const counts: EventCounts = { errors: 0, warnings: 0 };
+  for (const e of events) {
+    const sev = (e.severity || '').toUpperCase();
+    if (sev === 'ERROR' || sev === 'CRITICAL') counts.errors++;
+    else if (sev === 'WARN' || sev === 'WARNING') counts.warnings++;
+  }
+  return counts;
+};
+
+// Key-by-key identity comparison of two flat records.
+const sameFields = (a: object, b: object): boolean => {
+  const keys = Object.keys(a);
+  if (keys.length !== Object.keys(b).length) return false;
+  return keys.every(k => (a as Record<string, unknown>)[k] === (b as Record<string, unknown>)[k]);
+};
+
+const sameCapabilities = (a: CapabilityMap, b: CapabilityMap) => sameFields(a, b);
+
+// Whether a fresh status reply says nothing new; `capabilities` is the only
+// nested field.
+const sameStatus = (a: ServiceStatus | null, b: ServiceStatus): boolean =>
+  a !== null &&
+  sameFields({ ...a, capabilities: null }, { ...b, capabilities: null }) &&
+  (a.capabilities === b.capabilities ||
+    (!!a.capabilities && !!b.capabilities && sameCapabilities(a.capabilities, b.capabilities)));
+
+/** Most notifications a single batch of events raises one by one. */
+const NOTIFY_PER_EVENT_MAX = 3;
+
+type EventNotification = {
+  title: string;
+  body: string;
+  urgency: 'critical' | 'warning' | 'info';
+};
+
+// The desktop notification an event warrants, if any.
+const notificationFor = (evt: EventEntry): EventNotification | null => {
+  const evType = (evt.event_type || '').toUpperCase();
+  const path = (evt.data as any)?.path || 'Unknown file';
+
+  if (evType.includes('TAMPER')) {
+    const kind = (evt.data as any)?.kind || 'unknown';
+    return { title: '\u26a0\ufe0f TAMPER DETECTED', body: `File ${kind}: ${path}`, urgency: 'critical' };
+  }
+  if (evType.includes('UNAUTHORIZED') || evType.includes('INTRUSION')) {
+    return { title: '\ud83d\udea8 UNAUTHORIZED FILE', body: `Suspicious file detected: ${path}`, urgency: 'critical' };
+  }
+  if (evType.includes('RESTORE_SUCCESS')) {
+    return { title: '\u2705 File Restored', body: `Successfully restored: ${path}`, urgency: 'warning' };
+  }
+  if (evType.includes('QUARANTINE')) {
+    return { title: '\ud83d\udd12 File Quarantined', body: `Suspicious file quarantined: ${path}`, urgency: 'warning' };
+  }
+  return null;
+};
+
 const ServiceContext = createContext<ServiceContextState | undefined>(undefined);
 
 export const ServiceProvider: React.FC<{ children: React.ReactNode }> = ({ children }) => {
@@ -30,6 +98,13 @@ export const ServiceProvider: React.FC<{ children: React.ReactNode }> = ({ child
   const [error, setError] = useState<string | null>(null);
   const lastEventSeqRef = useRef<number>(0);
   const notificationsRequested = useRef(false);
+  // Last status error logged, so a service that stays down is reported once
+  // rather than on every poll.
+  const lastLoggedErrorRef = useRef<string | null>(null);
+  // The status fetch in progress, and whether another was asked for while it
+  // ran; see `refresh`.
+  const refreshInFlightRef = useRef<Promise<void> | null>(null);
+  const refreshAgainRef = useRef(false);
 
   // Request notification permission on mount
   useEffect(() => {
@@ -61,131 +136,181 @@ export const ServiceProvider: React.FC<{ children: React.ReactNode }> = ({ child
     }
   };
 
-  console.log('🔵 ServiceProvider: Initializing');
-
-  const refresh = async () => {
-    console.log('🔵 ServiceProvider: Refreshing status');
+  const loadStatus = async () => {
     try {
       const st = await fetchStatus();
-      console.log('✅ ServiceProvider: Got status and capabilities', { st });
-      setStatus(st);
+      // The poll returns a new object every second even when nothing changed;
+      // keeping the previous one leaves the context value, and every consumer
+      // of it, untouched.
+      setStatus(prev => (sameStatus(prev, st) ? prev : st));
       // capabilities live inside the status response — no separate call needed
       if (st.capabilities) {
-        setCapabilities(st.capabilities);
+        setCapabilities(prev => (sameCapabilities(prev, st.capabilities) ? prev : st.capabilities));
       }
       setServiceAvailable(true);
       setError(null);
+      lastLoggedErrorRef.current = null;
     } catch (e) {
-      console.error('❌ ServiceProvider: Error fetching status', e);
+      const message = e instanceof Error ? e.message : String(e);
+      if (message !== lastLoggedErrorRef.current) {
+        lastLoggedErrorRef.current = message;
+        console.error('ServiceProvider: error fetching status', e);
+      }
       setServiceAvailable(false);
       setStatus(null);
       setCapabilities(defaultCapabilities);
-      setError(e instanceof Error ? e.message : String(e));
+      setError(message);
     }
     setLoading(false);
   };
 
+  // Stable across renders: it only touches state setters and refs, so the
+  // context and the pages' handlers built on it keep one identity.
+  //
+  // Calls made while a fetch is running don't start their own: they share it
+  // and queue a single follow-up, so a burst of refreshes (a button press
+  // landing on a poll, several actions in a row) costs at most two round trips
+  // and every caller still sees a status fetched after it asked.
+  const refresh = useCallback(() => {
+    if (refreshInFlightRef.current) {
+      refreshAgainRef.current = true;
+      return refreshInFlightRef.current;
+    }
+    const run = async () => {
+      do {
+        refreshAgainRef.current = false;
+        await loadStatus();
+      } while (refreshAgainRef.current);
+      refreshInFlightRef.current = null;
+    };
+    refreshInFlightRef.current = run();
+    return refreshInFlightRef.current;
+  }, []);
+
   useEffect(() => {
     void refresh();
+    // poll every 1s per requirement; a tick that lands on a slow fetch is
+    // dropped rather than queued behind it
     const interval = setInterval(() => {
-      void refresh();
-    }, 1000); // poll every 1s per requirement
+      if (!refreshInFlightRef.current) void refresh();
+    }, 1000);
     return () => clearInterval(interval);
   }, []);
 
+  // A small batch notifies per event. A burst, such as many files changed
+  // at once, gets one summary per kind instead of a popup per file.
+  const notifyBatch = (batch: EventEntry[]) => {
+    const notes = batch.map(notificationFor).filter((n): n is EventNotification => n !== null);
+    if (notes.length <= NOTIFY_PER_EVENT_MAX) {
+      for (const n of notes) sendNotification(n.title, n.body, n.urgency);
+      return;
+    }
+    const byTitle = new Map<string, EventNotification[]>();
+    for (const n of notes) {
+      const group = byTitle.get(n.title);
+      if (group) group.push(n);
+      else byTitle.set(n.title, [n]);
+    }
+    // Batches arrive newest first, so each group leads with its latest event.
+    for (const [title, group] of byTitle) {
+      const latest = group[0];
+      const body = group.length === 1 ? latest.body : `${group.length} events. Latest: ${latest.body}`;
+      sendNotification(title, body, latest.urgency);
+    }
+  };
+
+  // Merge a newest-first batch into the list, skipping events already held.
+  const mergeEvents = (incoming: EventEntry[]) => {
+    if (incoming.length === 0) return;
+    setEvents(prev => {
+      // A live batch is normally entirely newer than the list, which is held
+      // newest first: then nothing in it can be a duplicate and the list
+      // needn't be scanned.
+      const newest = prev.length > 0 ? prev[0].seq : undefined;
+      if (prev.length === 0 || (newest !== undefined && incoming.every(e => e.seq !== undefined && e.seq > newest))) {
+        return [...incoming, ...prev].slice(0, MAX_EVENTS);
+      }
+      const known = new Set(prev.map(e => e.seq));
+      const fresh = incoming.filter(e => !known.has(e.seq));
+      return fresh.length === 0 ? prev : [...fresh, ...prev].slice(0, MAX_EVENTS);
+    });
+  };
+
+  // The desktop backend pushes new events in one batch per flush interval, so
+  // nothing here polls: the current log is loaded once, then batches are
+  // merged in as they arrive and notified once each.
   useEffect(() => {
     if (!serviceAvailable) return;
-    const loadEvents = async () => {
-      try {
-        const res = await fetchEvents();
-        if (res && res.events) {
-          // Check for new critical events since last check
-          const newEvents = res.events.filter(
-            (e: EventEntry) => (e.seq || 0) > lastEventSeqRef.current
-          );
-          
-          for (const evt of newEvents) {
-            const evType = (evt.event_type || '').toUpperCase();
-            const sev = (evt.severity || '').toUpperCase();
-            
-            if (evType.includes('TAMPER')) {
-              const path = (evt.data as any)?.path || 'Unknown file';
-              const kind = (evt.data as any)?.kind || 'unknown';
-              sendNotification(
-                '\u26a0\ufe0f TAMPER DETECTED',
-                `File ${kind}: ${path}`,
-                'critical'
-              );
-            } else if (evType.includes('UNAUTHORIZED') || evType.includes('INTRUSION')) {
-              const path = (evt.data as any)?.path || 'Unknown file';
-              sendNotification(
-                '\ud83d\udea8 UNAUTHORIZED FILE',
-                `Suspicious file detected: ${path}`,
-                'critical'
-              );
-            } else if (evType.includes('RESTORE_SUCCESS')) {
-              const path = (evt.data as any)?.path || 'Unknown file';
-              sendNotification(
-                '\u2705 File Restored',
-                `Successfully restored: ${path}`,
-                'warning'
-              );
-            } else if (evType.includes('QUARANTINE')) {
-              const path = (evt.data as any)?.path || 'Unknown file';
-              sendNotification(
-                '\ud83d\udd12 File Quarantined',
-                `Suspicious file quarantined: ${path}`,
-                'warning'
-              );
-            }
-          }
-          
-          // Update last seen seq
-          const maxSeq = res.events.reduce((max: number, e: EventEntry) => Math.max(max, e.seq || 0), 0);
-          if (maxSeq > lastEventSeqRef.current) {
-            lastEventSeqRef.current = maxSeq;
-          }
-          
-          setEvents(res.events);
-        }
-      } catch (e) {
-        console.warn('events fetch failed', e);
+    let disposed = false;
+    let unlisten: (() => void) | undefined;
+
+    listen<EventEntry[]>('guard-events', ({ payload }) => {
+      const fresh = payload.filter(e => (e.seq || 0) > lastEventSeqRef.current);
+      notifyBatch(fresh);
+      const maxSeq = payload.reduce((max, e) => Math.max(max, e.seq || 0), 0);
+      if (maxSeq > lastEventSeqRef.current) {
+        lastEventSeqRef.current = maxSeq;
       }
+      mergeEvents(payload);
+    }).then(fn => {
+      if (disposed) fn();
+      else unlisten = fn;
+    });
+
+    // Subscribe before loading so nothing logged in between is missed; the
+    // merge drops anything that arrives both ways.
+    fetchEvents()
+      .then(res => {
+        if (disposed || !res || !res.events) return;
+        const maxSeq = res.events.reduce((max: number, e: EventEntry) => Math.max(max, e.seq || 0), 0);
+        if (maxSeq > lastEventSeqRef.current) {
+          lastEventSeqRef.current = maxSeq;
+        }
+        mergeEvents(res.events);
+      })
+      .catch(e => console.warn('events fetch failed', e));
+
+    return () => {
+      disposed = true;
+      unlisten?.();
     };
-    void loadEvents();
-    // Poll events every 3 seconds
-    const iv = setInterval(() => void loadEvents(), 3000);
-    return () => clearInterval(iv);
   }, [serviceAvailable]);
 
+  // Recounted only when a batch of events lands, not on every status poll.
+  const eventCounts = useMemo(() => countEvents(events), [events]);
+
   const value = useMemo<ServiceContextState>(() => ({
     status,
     capabilities: capabilities || defaultCapabilities,
     events,
+    eventCounts,
     serviceAvailable,
     loading,
     refresh,
-  }), [status, capabilities, events, serviceAvailable, loading]);
-
-  if (loading) {
-    return (
-      <div className="flex items-center justify-center h-screen bg-bg-app text-text-primary">
-        <div className="text-center space-y-4">
-          <div className="text-4xl">🔐</div>
-          <div className="text-xl font-semibold">Darklock Guard</div>
-          <div className="text-text-muted">Connecting to service...</div>
-          {error && (
-            <div className="mt-4 p-4 bg-red-900/20 border border-red-500 rounded text-red-400 text-sm max-w-md">
-              <div className="font-semibold">Error:</div>
-              <div className="mt-1">{error}</div>
-            </div>
-          )}
-        </div>
-      </div>
-    );
-  }
+  }), [status, capabilities, events, eventCounts, serviceAvailable, loading, refresh]);
 
-  return <ServiceContext.Provider value={value}>{children}</ServiceContext.Provider>;
+  // The app shell paints immediately; until the first status reply arrives a
+  // "connecting" overlay sits on top of it instead of replacing the whole tree.
+  return (
+    <ServiceContext.Provider value={value}>
+      {children}
+      {loading && (
+        <div className="fixed inset-0 z-50 flex items-center justify-center bg-bg-primary/90 text-text-primary">
+          <div className="text-center space-y-4">
+            <div className="text-4xl">🔐</div>
+            <div className="text-xl font-semibold">Darklock Guard</div>
+            <div className="text-text-muted">Connecting to service...</div>
+            {error && (
+              <div className="mt-4 p-4 bg-red-900/20 border border-red-500 rounded text-red-400 text-sm max-w-md">
+                <div className="font-semibold">Error:</div>
+                <div className="mt-1">{error}</div>
+              </div>
+            )}
+          </div>
+        </div>
+      )}
+    </ServiceContext.Provider>
+  );
 };
 
 export const useService = (): ServiceContextState => {
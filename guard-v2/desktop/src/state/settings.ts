@@ -16,6 +16,9 @@ export interface GuardSettings {
     baseline_locked: boolean;
     protected_paths: string[];
     quarantine_enabled: boolean;
+    force_polling?: boolean;
+    ignore_patterns?: string[];
+    always_rehash?: boolean;
   };
   performance: {
     max_cpu_percent: number;
@@ -29,6 +29,15 @@ export type EventEntry = {
   hash?: string;
 };
 
+/** Service-side event filter; see `EventFilter` in guard-core's event log. */
+export type EventFilter = {
+  severities?: string[];
+  event_types?: string[];
+  search?: string;
+  path?: string;
+  before_seq?: number;
+};
+
 export type UpdateInfo = {
   available: boolean;
   version?: string;